@@ -1,10 +1,356 @@
 import cv2
 import mediapipe as mp
 import time
-import math # Diperlukan untuk kalkulasi jarak
+import numpy as np
+from frame_buffers import FrameBufferPool
+from landmark_trace import TraceWriter, HANDEDNESS_CODES
+
+NUM_LANDMARKS = 21
+# Bobot bit status jari: bit 0 = jempol, bit 1 = telunjuk, ..., bit 4 = kelingking
+FINGER_BITS = np.array([1, 2, 4, 8, 16], dtype=np.int32)
+
+def codeToFingers(code):
+    """Ubah kode 5-bit dari fingerState() kembali menjadi list 5 status jari."""
+    return [(code >> i) & 1 for i in range(5)]
+
+class HandLandmarks:
+    """
+    Wadah landmark satu tangan yang dialokasikan sekali lalu dipakai ulang tiap frame.
+
+    px   : array (21, 3) float32 berisi koordinat piksel (x, y, z). z diskalakan dengan
+           lebar gambar, sama seperti konvensi MediaPipe untuk x.
+    norm : array (21, 3) float32 berisi koordinat ternormalisasi langsung dari MediaPipe.
+    """
+
+    def __init__(self):
+        self.px = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self.norm = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._scale = np.ones(3, dtype=np.float32)
+        self.handedness = ""   # 'Left' atau 'Right' menurut MediaPipe
+        self.score = 0.0       # Skor kepercayaan handedness
+        self.width = 0
+        self.height = 0
+        self.valid = False
+
+    def update(self, hand_landmarks, width, height, handedness=None):
+        """Isi ulang array dari hasil MediaPipe (atau TraceHand) tanpa membuat list baru."""
+        norm = self.norm
+        if isinstance(hand_landmarks, TraceHand):
+            np.copyto(norm, hand_landmarks.norm)
+        else:
+            for i, lm in enumerate(hand_landmarks.landmark):
+                norm[i, 0] = lm.x
+                norm[i, 1] = lm.y
+                norm[i, 2] = lm.z
+        if width != self.width or height != self.height:
+            self.width, self.height = width, height
+            self._scale[:] = (width, height, width)
+        np.multiply(norm, self._scale, out=self.px)
+        if handedness is not None:
+            self.handedness = handedness.classification[0].label
+            self.score = handedness.classification[0].score
+        self.valid = True
+
+    def syncPixels(self):
+        """Hitung ulang px dari norm (misalnya setelah norm dihaluskan in-place)."""
+        np.multiply(self.norm, self._scale, out=self.px)
+
+    def clear(self):
+        self.valid = False
+
+    def copy_into(self, other):
+        """Salin isi ke wadah lain yang sudah dialokasikan (untuk diserahkan ke thread lain)."""
+        np.copyto(other.px, self.px)
+        np.copyto(other.norm, self.norm)
+        np.copyto(other._scale, self._scale)
+        other.handedness = self.handedness
+        other.score = self.score
+        other.width, other.height = self.width, self.height
+        other.valid = self.valid
+        return other
+
+    def distances(self, p1_ids, p2_ids):
+        """Jarak piksel antara pasangan landmark (bisa skalar atau array indeks)."""
+        d = self.px[p2_ids, :2] - self.px[p1_ids, :2]
+        return np.hypot(d[..., 0], d[..., 1])
+
+    def angles(self, a_ids, b_ids, c_ids):
+        """Sudut (derajat) di titik b untuk segitiga a-b-c, dihitung sekaligus untuk banyak titik."""
+        ba = self.px[a_ids, :2] - self.px[b_ids, :2]
+        bc = self.px[c_ids, :2] - self.px[b_ids, :2]
+        cross = ba[..., 0] * bc[..., 1] - ba[..., 1] * bc[..., 0]
+        dot = ba[..., 0] * bc[..., 0] + ba[..., 1] * bc[..., 1]
+        return np.degrees(np.abs(np.arctan2(cross, dot)))
+
+
+class LandmarkListView:
+    """
+    Tampilan kompatibel untuk API lama: lmList[id] -> [id, cx, cy].
+    Tidak menyimpan data sendiri, semuanya dibaca dari HandLandmarks.
+    """
+
+    def __init__(self, landmarks):
+        self.landmarks = landmarks
+
+    def __len__(self):
+        return NUM_LANDMARKS if self.landmarks.valid else 0
+
+    def __bool__(self):
+        return self.landmarks.valid
+
+    def __getitem__(self, idx):
+        if not self.landmarks.valid:
+            raise IndexError("Tidak ada tangan terdeteksi")
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += NUM_LANDMARKS
+        px = self.landmarks.px
+        return [idx, int(px[idx, 0]), int(px[idx, 1])]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+class FingerAngleClassifier:
+    """
+    Klasifikasi status jari dari sudut sendi, bukan dari perbandingan koordinat x/y mentah.
+
+    Sudut dihitung dalam 3D (x, y, z piksel) sehingga tidak berubah oleh rotasi, skala
+    maupun mirror gambar. Jari (telunjuk..kelingking) dianggap lurus jika rata-rata sudut
+    di sendi PIP dan DIP >= fingerAngle. Jempol dianggap terangkat jika sendi IP lurus
+    (>= thumbAngle) DAN ujungnya berada di sisi luar pangkal telunjuk pada sumbu lateral
+    kerangka lokal tangan (arah pangkal kelingking -> pangkal telunjuk).
+
+    Handedness MediaPipe dipakai untuk mengorientasikan normal telapak tangan
+    (palmFacing: True jika telapak menghadap kamera); status jari sendiri tidak
+    bergantung pada handedness, jadi label yang salah tidak membuat hasil terbalik.
+    Semua buffer dialokasikan sekali.
+    """
+
+    # Triplet (a, b, c) untuk sudut di b, dua sendi per jari: jempol, telunjuk, tengah, manis, kelingking
+    JOINT_A = np.array([1, 2, 5, 6, 9, 10, 13, 14, 17, 18])
+    JOINT_B = np.array([2, 3, 6, 7, 10, 11, 14, 15, 18, 19])
+    JOINT_C = np.array([3, 4, 7, 8, 11, 12, 15, 16, 19, 20])
+
+    def __init__(self, fingerAngle=155.0, thumbAngle=150.0, thumbLateral=0.0):
+        self.fingerAngle = fingerAngle
+        self.thumbAngle = thumbAngle
+        self.thumbLateral = thumbLateral   # jarak lateral minimal ujung jempol dari pangkal telunjuk (x lebar telapak)
+        n = len(self.JOINT_B)
+        self._a = np.zeros((n, 3), dtype=np.float32)
+        self._b = np.zeros((n, 3), dtype=np.float32)
+        self._c = np.zeros((n, 3), dtype=np.float32)
+        self._cos = np.zeros(n, dtype=np.float32)
+        self._norm = np.zeros(n, dtype=np.float32)
+        self.angles = np.zeros((5, 2), dtype=np.float32)   # derajat, [jari, sendi]
+        self.straightness = np.zeros(5, dtype=np.float32)
+        self.fingers = np.zeros(5, dtype=np.uint8)
+        self.confidence = np.zeros(5, dtype=np.float32)
+        self._thresholds = np.array([thumbAngle] + [fingerAngle] * 4, dtype=np.float32)
+        self.lateral = 0.0
+        self.palmFacing = None
+
+    def classify(self, landmarks):
+        """Isi dan kembalikan array uint8 (5,) status jari untuk HandLandmarks `landmarks`."""
+        px = landmarks.px
+        a, b, c = self._a, self._b, self._c
+        np.take(px, self.JOINT_A, axis=0, out=a)
+        np.take(px, self.JOINT_B, axis=0, out=b)
+        np.take(px, self.JOINT_C, axis=0, out=c)
+        a -= b   # vektor b->a
+        c -= b   # vektor b->c
+        np.einsum('ij,ij->i', a, c, out=self._cos)
+        np.multiply(np.linalg.norm(a, axis=1), np.linalg.norm(c, axis=1), out=self._norm)
+        np.maximum(self._norm, 1e-6, out=self._norm)
+        self._cos /= self._norm
+        np.clip(self._cos, -1.0, 1.0, out=self._cos)
+        np.degrees(np.arccos(self._cos, out=self._cos), out=self.angles.reshape(-1))
+
+        # Jari: rata-rata sudut PIP dan DIP; jempol: sudut IP saja (MCP jempol memang sering menekuk)
+        np.mean(self.angles, axis=1, out=self.straightness)
+        self.straightness[0] = self.angles[0, 1]
+        thresholds = self._thresholds
+        np.greater_equal(self.straightness, thresholds, out=self.fingers, casting='unsafe')
+        np.subtract(self.straightness, thresholds, out=self.confidence)
+        np.abs(self.confidence, out=self.confidence)
+        self.confidence *= 1.0 / 30.0
+        np.minimum(self.confidence, 1.0, out=self.confidence)
+
+        # Kerangka lokal tangan: lateral = pangkal kelingking (17) -> pangkal telunjuk (5)
+        lateral = px[5] - px[17]
+        palmWidth = float(np.linalg.norm(lateral))
+        if palmWidth > 1e-6:
+            lateral /= palmWidth
+            self.lateral = float((px[4] - px[5]) @ lateral) / palmWidth
+            if self.lateral < self.thumbLateral:
+                self.fingers[0] = 0
+            # Normal telapak (pergelangan->pangkal jari tengah x lateral); tandanya bergantung handedness
+            up = px[9] - px[0]
+            normalZ = up[0] * lateral[1] - up[1] * lateral[0]
+            side = {'Right': 1.0, 'Left': -1.0}.get(landmarks.handedness)
+            self.palmFacing = None if side is None else bool(normalZ * side > 0)
+        return self.fingers
+
+
+class MotionDetector:
+    """
+    Deteksi gerakan murah: frame diperkecil ke grayscale kecil lalu dibandingkan dengan
+    frame sebelumnya. score() mengembalikan fraksi piksel (0..1) yang berubah.
+    """
+
+    def __init__(self, size=(80, 60), pixelThreshold=18):
+        self.size = size
+        self.pixelThreshold = pixelThreshold
+        w, h = size
+        self._small = np.zeros((h, w, 3), dtype=np.uint8)
+        self._gray = np.zeros((h, w), dtype=np.uint8)
+        self._prev = np.zeros((h, w), dtype=np.uint8)
+        self._diff = np.zeros((h, w), dtype=np.uint8)
+        self._hasPrev = False
+        self.lastScore = 0.0
+
+    def score(self, img, isRGB=False):
+        cv2.resize(img, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_RGB2GRAY if isRGB else cv2.COLOR_BGR2GRAY, dst=self._gray)
+        if not self._hasPrev:
+            self._hasPrev = True
+            np.copyto(self._prev, self._gray)
+            self.lastScore = 1.0 # Frame pertama dianggap ada gerakan
+            return self.lastScore
+        cv2.absdiff(self._gray, self._prev, dst=self._diff)
+        np.copyto(self._prev, self._gray)
+        cv2.threshold(self._diff, self.pixelThreshold, 255, cv2.THRESH_BINARY, dst=self._diff)
+        self.lastScore = cv2.countNonZero(self._diff) / self._diff.size
+        return self.lastScore
+
+    def reset(self):
+        self._hasPrev = False
+
+
+class HandPrefilter:
+    """
+    Pre-filter opsional sebelum MediaPipe. MediaPipe hanya dijalankan jika ada gerakan
+    yang cukup DAN sebagian piksel yang bergerak berwarna kulit. Jika tidak, frame
+    dianggap "tidak ada tangan" tanpa memanggil Hands.process.
+
+    sensitivity (0..1): makin tinggi makin sering MediaPipe dijalankan (recall lebih aman).
+    maxSkip: setelah sekian frame berturut-turut dilewati, MediaPipe dipaksa jalan sekali
+    supaya tangan yang diam tetap bisa terdeteksi.
+    """
+
+    # Rentang warna kulit di ruang YCrCb (umum dipakai, cukup toleran terhadap warna kulit berbeda)
+    SKIN_LOWER = np.array([0, 133, 77], dtype=np.uint8)
+    SKIN_UPPER = np.array([255, 173, 127], dtype=np.uint8)
+
+    def __init__(self, sensitivity=0.5, useSkin=True, maxSkip=15, size=(80, 60)):
+        self.motion = MotionDetector(size)
+        self.useSkin = useSkin
+        self.maxSkip = maxSkip
+        w, h = size
+        self._ycrcb = np.zeros((h, w, 3), dtype=np.uint8)
+        self._skin = np.zeros((h, w), dtype=np.uint8)
+        self._skipStreak = 0
+        self.processed = 0
+        self.skipped = 0
+        self.setSensitivity(sensitivity)
+
+    def setSensitivity(self, sensitivity):
+        self.sensitivity = min(max(sensitivity, 0.0), 1.0)
+        # Ambang turun linear saat sensitivitas naik
+        self.motionThreshold = 0.001 + 0.03 * (1.0 - self.sensitivity)
+        self.skinThreshold = 0.0005 + 0.01 * (1.0 - self.sensitivity)
+
+    def shouldRun(self, img, isRGB=False, handPresent=False):
+        """True jika MediaPipe perlu dijalankan untuk frame ini."""
+        motion = self.motion.score(img, isRGB)
+        run = (handPresent                      # Tangan sedang dilacak, jangan diputus
+               or self._skipStreak >= self.maxSkip
+               or (motion >= self.motionThreshold and self._movingSkin(isRGB) >= self.skinThreshold))
+        if run:
+            self._skipStreak = 0
+            self.processed += 1
+        else:
+            self._skipStreak += 1
+            self.skipped += 1
+        return run
+
+    def _movingSkin(self, isRGB):
+        """Fraksi piksel yang bergerak sekaligus berwarna kulit (memakai frame kecil MotionDetector)."""
+        if not self.useSkin:
+            return 1.0
+        cv2.cvtColor(self.motion._small, cv2.COLOR_RGB2YCrCb if isRGB else cv2.COLOR_BGR2YCrCb, dst=self._ycrcb)
+        cv2.inRange(self._ycrcb, self.SKIN_LOWER, self.SKIN_UPPER, dst=self._skin)
+        cv2.bitwise_and(self._skin, self.motion._diff, dst=self._skin)
+        return cv2.countNonZero(self._skin) / self._skin.size
+
+    def stats(self):
+        total = self.processed + self.skipped
+        return {
+            'processed': self.processed,
+            'skipped': self.skipped,
+            'skip_ratio': self.skipped / total if total else 0.0,
+        }
+
+
+class _NoHands:
+    """Pengganti hasil MediaPipe saat pre-filter memutuskan tidak ada tangan."""
+    multi_hand_landmarks = None
+    multi_handedness = None
+
+NO_HANDS = _NoHands()
+
+
+class TraceHand:
+    """Pengganti NormalizedLandmarkList MediaPipe untuk landmark rekaman (array (21, 3) ternormalisasi)."""
+    __slots__ = ('norm',)
+
+    def __init__(self, norm):
+        self.norm = norm
+
+
+class _Category:
+    __slots__ = ('label', 'score')
+
+    def __init__(self, label, score):
+        self.label = label
+        self.score = score
+
+
+class _TraceHandedness:
+    __slots__ = ('classification',)
+
+    def __init__(self, label, score):
+        self.classification = [_Category(label, score)]
+
+
+class TraceResults:
+    """
+    Hasil 'deteksi' dari rekaman landmark dengan atribut yang sama seperti hasil MediaPipe.
+    Semua tangan di record.hands ikut diputar ulang, dengan urutan seperti saat direkam.
+    """
+    HANDEDNESS_LABELS = ('Left', 'Right')
+
+    def __init__(self, record):
+        if record is None or not record.hands:
+            self.multi_hand_landmarks = None
+            self.multi_handedness = None
+        else:
+            self.multi_hand_landmarks = [TraceHand(norm) for norm, _, _ in record.hands]
+            self.multi_handedness = [_TraceHandedness(self.HANDEDNESS_LABELS[code] if code >= 0 else 'Unknown', score)
+                                     for _, code, score in record.hands]
+
 
 class handDetector():
-    def __init__(self, mode=False, maxHands=1, modelComplexity=1, detectionCon=0.5, trackCon=0.5): # maxHands diubah ke 1 untuk konsistensi
+    def __init__(self, mode=False, maxHands=1, modelComplexity=1, detectionCon=0.5, trackCon=0.5, # maxHands diubah ke 1 untuk konsistensi
+                 roi=False, roiSize=192, roiPad=0.3, roiRedetect=30, prefilter=None, record=None,
+                 fingerMethod='position'):
         self.mode = mode
         self.maxHands = maxHands
         self.modelComplex = modelComplexity
@@ -20,12 +366,84 @@ class handDetector():
             min_tracking_confidence=self.trackCon)
         self.mpDraw = mp.solutions.drawing_utils
 
+        # --- Mode ROI (Region of Interest) ---
+        # Setelah tangan ditemukan, frame berikutnya cukup di-crop di sekitar tangan,
+        # di-resize ke roiSize x roiSize, lalu diproses oleh instance Hands kedua.
+        # Deteksi full-frame hanya dijalankan saat tracking hilang atau setiap roiRedetect frame.
+        self.roi = roi
+        self.roiSize = roiSize
+        self.roiPad = roiPad
+        self.roiRedetect = roiRedetect
+        self.roiHands = None
+        self._roiBox = None          # (x0, y0, x1, y1) dalam piksel full-frame
+        self._roiStreak = 0          # jumlah frame ROI berturut-turut sejak deteksi full-frame
+        self.roiFrames = 0
+        self.fullFrames = 0
+
+        # Pre-filter opsional (HandPrefilter) untuk melewati MediaPipe pada frame tanpa tangan
+        self.prefilter = prefilter
+        self._handPresent = False
+
         self.tipIds = [4, 8, 12, 16, 20]
-        self.lmList = []
+        self.landmarks = HandLandmarks()
+        self.lmList = LandmarkListView(self.landmarks)
+        # Wadah untuk semua tangan (findAllPositions), satu per maxHands
+        self.allLandmarks = [HandLandmarks() for _ in range(maxHands)]
+        self.handCount = 0
+        self._fingers = np.zeros(5, dtype=np.uint8)
+        self._fingerMargin = np.zeros(5, dtype=np.float32)
+        self._fingerConf = np.zeros(5, dtype=np.float32)
+        # Metode status jari: 'position' (perbandingan x/y, cepat, hanya untuk tangan tegak)
+        # atau 'angle' (FingerAngleClassifier, tahan rotasi/mirror/tangan kiri)
+        if fingerMethod not in ('position', 'angle'):
+            raise ValueError(f"fingerMethod tidak dikenal: {fingerMethod}")
+        self.fingerMethod = fingerMethod
+        self.angleClassifier = FingerAngleClassifier()
+        # Buffer konversi warna/ROI dipakai ulang antar frame
+        self.buffers = FrameBufferPool()
 
-    def findHands(self, img, draw=True):
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(imgRGB)
+        # Perekaman landmark opsional ke file .lmtrace (lihat landmark_trace.py)
+        self.frameCount = 0
+        self.recorder = None
+        self._recLandmarks = HandLandmarks()
+        if record:
+            self.startRecording(record)
+
+    def findHands(self, img, draw=True, isRGB=False):
+        """
+        Jalankan MediaPipe pada img. Jika isRGB=True, img dianggap sudah RGB dan langsung
+        diproses tanpa konversi warna (pemanggil bisa memakai buffer yang sama untuk tampilan).
+        Catatan: gambar landmark (draw=True) memakai warna BGR bawaan MediaPipe.
+        """
+        self.frameCount += 1
+        if self.prefilter is not None and not self.prefilter.shouldRun(img, isRGB, self._handPresent):
+            self.results = NO_HANDS
+            self._roiBox = None
+            self._recordFrame()
+            return img
+
+        self.results = None
+        if self.roi and self._roiBox is not None and self._roiStreak < self.roiRedetect:
+            self.results = self._processRoi(img, isRGB)
+            if self.results.multi_hand_landmarks:
+                self._roiStreak += 1
+                self.roiFrames += 1
+            else:
+                self.results = None # Tracking hilang, ulangi dengan full-frame pada frame yang sama
+
+        if self.results is None:
+            if isRGB:
+                imgRGB = img
+            else:
+                imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=self.buffers.get('rgb', img.shape))
+            self.results = self.hands.process(imgRGB)
+            self._roiStreak = 0
+            self.fullFrames += 1
+
+        self._handPresent = bool(self.results.multi_hand_landmarks)
+        if self.roi:
+            self._updateRoiBox(img.shape)
+        self._recordFrame()
 
         if self.results.multi_hand_landmarks:
             for handLms in self.results.multi_hand_landmarks:
@@ -33,55 +451,212 @@ class handDetector():
                     self.mpDraw.draw_landmarks(img, handLms, self.mpHands.HAND_CONNECTIONS)
         return img
 
+    def _processRoi(self, img, isRGB=False):
+        """Jalankan MediaPipe pada crop ROI lalu petakan landmark kembali ke koordinat full-frame."""
+        if self.roiHands is None:
+            self.roiHands = self.mpHands.Hands(
+                static_image_mode=self.mode,
+                max_num_hands=self.maxHands,
+                model_complexity=self.modelComplex,
+                min_detection_confidence=self.detectionCon,
+                min_tracking_confidence=self.trackCon)
+
+        x0, y0, x1, y1 = self._roiBox
+        roi_shape = (self.roiSize, self.roiSize, 3)
+        roiRGB = self.buffers.get('roi_rgb', roi_shape)
+        if isRGB:
+            cv2.resize(img[y0:y1, x0:x1], (self.roiSize, self.roiSize), dst=roiRGB, interpolation=cv2.INTER_AREA)
+        else:
+            roiBGR = self.buffers.get('roi_bgr', roi_shape)
+            cv2.resize(img[y0:y1, x0:x1], (self.roiSize, self.roiSize), dst=roiBGR, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(roiBGR, cv2.COLOR_BGR2RGB, dst=roiRGB)
+        results = self.roiHands.process(roiRGB)
+
+        if results.multi_hand_landmarks:
+            h, w = img.shape[:2]
+            sx, sy = (x1 - x0) / w, (y1 - y0) / h
+            ox, oy = x0 / w, y0 / h
+            for handLms in results.multi_hand_landmarks:
+                for lm in handLms.landmark:
+                    lm.x = ox + lm.x * sx
+                    lm.y = oy + lm.y * sy
+                    lm.z = lm.z * sx # z mengikuti skala x (konvensi MediaPipe)
+        return results
+
+    def _updateRoiBox(self, shape):
+        """Hitung kotak ROI persegi (dengan padding) di sekitar semua tangan yang terdeteksi."""
+        if not self.results.multi_hand_landmarks:
+            self._roiBox = None
+            return
+        h, w = shape[:2]
+        min_x = min_y = 1.0
+        max_x = max_y = 0.0
+        for handLms in self.results.multi_hand_landmarks:
+            for lm in handLms.landmark:
+                min_x, max_x = min(min_x, lm.x), max(max_x, lm.x)
+                min_y, max_y = min(min_y, lm.y), max(max_y, lm.y)
+
+        cx, cy = (min_x + max_x) * 0.5 * w, (min_y + max_y) * 0.5 * h
+        size = max((max_x - min_x) * w, (max_y - min_y) * h) * (1 + 2 * self.roiPad)
+        size = max(size, self.roiSize * 0.5) # Hindari crop yang terlalu kecil
+        # Kotak digeser masuk ke dalam frame (bukan dipotong) agar tetap persegi dan
+        # resize ke roiSize x roiSize tidak mengubah rasio aspek tangan
+        side = min(int(size), w, h)
+        if side < 16:
+            self._roiBox = None
+            return
+        x0 = min(max(0, int(cx - side * 0.5)), w - side)
+        y0 = min(max(0, int(cy - side * 0.5)), h - side)
+        self._roiBox = (x0, y0, x0 + side, y0 + side)
+
+    def findHandsFromTrace(self, img, record, draw=True):
+        """
+        Pengganti findHands() untuk sumber LandmarkTraceSource: landmark diambil dari
+        rekaman, MediaPipe tidak dijalankan. findPosition() dan seterusnya bekerja seperti biasa.
+        """
+        self.frameCount += 1
+        self.results = TraceResults(record)
+        self._handPresent = bool(self.results.multi_hand_landmarks)
+        self._recordFrame()
+        if draw and self._handPresent:
+            h, w = img.shape[:2]
+            for handLms in self.results.multi_hand_landmarks:
+                pts = (handLms.norm[:, :2] * (w, h)).astype(np.int32)
+                for a, b in self.mpHands.HAND_CONNECTIONS:
+                    cv2.line(img, tuple(pts[a]), tuple(pts[b]), (224, 224, 224), 2)
+                for p in pts:
+                    cv2.circle(img, tuple(p), 4, (0, 0, 255), cv2.FILLED)
+        return img
+
+    # --- Perekaman landmark ---
+    def startRecording(self, path, label=-1):
+        """Mulai merekam setiap frame (timestamp, handedness, skor, 21x3 landmark) ke file .lmtrace."""
+        self.stopRecording()
+        self.recorder = TraceWriter(path, label)
+
+    def setRecordingLabel(self, label):
+        """Label gestur untuk record berikutnya (untuk mengumpulkan data latih), -1 = tanpa label."""
+        if self.recorder is not None:
+            self.recorder.label = label
+
+    def stopRecording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def _recordFrame(self):
+        if self.recorder is None:
+            return
+        now = time.time()
+        if not self.results.multi_hand_landmarks:
+            self.recorder.write(now, self.frameCount)
+            return
+        handedness = self.results.multi_handedness or ()
+        for i, handLms in enumerate(self.results.multi_hand_landmarks):
+            hand = handedness[i] if i < len(handedness) else None
+            self._recLandmarks.update(handLms, 1, 1, hand)
+            code = HANDEDNESS_CODES.get(self._recLandmarks.handedness, -1) if hand is not None else -1
+            self.recorder.write(now, self.frameCount, self._recLandmarks.norm, code,
+                                self._recLandmarks.score if hand is not None else 0.0, hand=i)
+
     def findPosition(self, img, handNo=0, draw=True):
-        self.lmList = []
+        self.landmarks.clear()
         if self.results.multi_hand_landmarks:
             myHand = self.results.multi_hand_landmarks[handNo]
-            for id, lm in enumerate(myHand.landmark):
-                h, w, c = img.shape
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                self.lmList.append([id, cx, cy])
-                if draw:
-                    cv2.circle(img, (cx, cy), 7, (255, 0, 0), cv2.FILLED)
+            handedness = self.results.multi_handedness[handNo] if self.results.multi_handedness else None
+            h, w, c = img.shape
+            self.landmarks.update(myHand, w, h, handedness)
+            if draw:
+                for cx, cy in self.landmarks.px[:, :2].astype(np.int32):
+                    cv2.circle(img, (int(cx), int(cy)), 7, (255, 0, 0), cv2.FILLED)
         return self.lmList
 
+    def findAllPositions(self, img, draw=False):
+        """
+        Isi allLandmarks untuk semua tangan yang terdeteksi (maksimal maxHands) dan
+        kembalikan jumlahnya. Tangan pertama juga tersedia di self.landmarks/lmList.
+        """
+        self.findPosition(img, 0, draw)
+        self.handCount = 0
+        if self.landmarks.valid:
+            self.landmarks.copy_into(self.allLandmarks[0])
+            self.handCount = 1
+            h, w = img.shape[:2]
+            handedness = self.results.multi_handedness
+            for i, handLms in enumerate(self.results.multi_hand_landmarks[1:self.maxHands], 1):
+                self.allLandmarks[i].update(handLms, w, h, handedness[i] if handedness else None)
+                if draw:
+                    for cx, cy in self.allLandmarks[i].px[:, :2].astype(np.int32):
+                        cv2.circle(img, (int(cx), int(cy)), 7, (255, 0, 0), cv2.FILLED)
+                self.handCount += 1
+        for hand in self.allLandmarks[self.handCount:]:
+            hand.clear()
+        return self.handCount
+
+    def fingerState(self, withConfidence=False, landmarks=None):
+        """
+        Status 5 jari sebagai satu integer 5-bit (bit 0 = jempol ... bit 4 = kelingking),
+        misalnya telapak terbuka = 0b11111 = 31 dan kepalan = 0. Mengembalikan None jika
+        tidak ada tangan. `landmarks` (HandLandmarks) bisa diisi untuk tangan selain
+        self.landmarks, misalnya salah satu dari allLandmarks.
+
+        Dengan withConfidence=True mengembalikan (kode, conf), conf adalah array float32 (5,)
+        bernilai 0..1 yang menunjukkan seberapa jauh tiap jari dari ambang naik/turun
+        (dinormalisasi dengan ukuran tangan). Array conf dipakai ulang tiap frame.
+        """
+        landmarks = self.landmarks if landmarks is None else landmarks
+        if not landmarks.valid:
+            return (None, None) if withConfidence else None
+        if self.fingerMethod == 'angle':
+            code = int(self.angleClassifier.classify(landmarks) @ FINGER_BITS)
+            return (code, self.angleClassifier.confidence) if withConfidence else code
+        code = int(self.fingersUpArray(landmarks) @ FINGER_BITS)
+        if not withConfidence:
+            return code
+        px = landmarks.px
+        margin = self._fingerMargin
+        margin[0] = px[3, 0] - px[4, 0]
+        np.subtract(px[6:19:4, 1], px[8::4, 1], out=margin[1:])
+        # Ukuran tangan: jarak pergelangan (0) ke pangkal jari tengah (9)
+        handSize = max(float(landmarks.distances(0, 9)), 1.0)
+        np.abs(margin, out=self._fingerConf)
+        self._fingerConf *= 4.0 / handSize
+        np.minimum(self._fingerConf, 1.0, out=self._fingerConf)
+        return code, self._fingerConf
+
     # --- FUNGSI fingersUp() YANG SUDAH DIPERBAIKI ---
     def fingersUp(self):
         """
         Mengecek jari mana saja yang terangkat menggunakan logika yang lebih andal.
         Memperhitungkan gambar yang di-flip oleh skrip utama.
+        Mengembalikan list 5 elemen agar kompatibel dengan kode lama; kode baru
+        sebaiknya memakai fingerState().
         """
-        fingers = []
-        if not self.lmList:
+        if not self.landmarks.valid:
             return []
+        return self.fingersUpArray().tolist()
+
+    def fingersUpArray(self, landmarks=None):
+        """Versi vektor dari fingersUp(): array uint8 (5,) yang dipakai ulang tiap frame."""
+        px = (self.landmarks if landmarks is None else landmarks).px
 
         # 1. Jempol (Thumb)
-        # Logika untuk jempol yang terentang. Ini hanya langkah pertama.
-        # Skrip utama akan memeriksa posisi Y untuk membedakan atas/bawah.
         # Untuk tangan kanan di depan kamera (yang tampak seperti tangan kiri setelah di-flip),
         # ujung jempol akan memiliki koordinat X lebih KECIL dari sendi di bawahnya.
-        if self.lmList[self.tipIds[0]][1] < self.lmList[self.tipIds[0] - 1][1]:
-            fingers.append(1)
-        else:
-            fingers.append(0)
-
-        # 2. Empat Jari Lainnya (Telunjuk, Tengah, Manis, Kelingking)
-        # Logika ini sudah andal: cek apakah ujung jari berada di atas sendi di bawahnya.
-        # Di OpenCV, "di atas" berarti nilai Y lebih kecil.
-        for id in range(1, 5):
-            if self.lmList[self.tipIds[id]][2] < self.lmList[self.tipIds[id] - 2][2]:
-                fingers.append(1)
-            else:
-                fingers.append(0)
+        # Skrip utama akan memeriksa posisi Y untuk membedakan atas/bawah.
+        self._fingers[0] = px[4, 0] < px[3, 0]
 
-        return fingers
+        # 2. Empat Jari Lainnya: ujung jari (8, 12, 16, 20) di atas sendi PIP (6, 10, 14, 18).
+        # Di OpenCV, "di atas" berarti nilai Y lebih kecil. Slicing berlangkah tidak menyalin data.
+        np.less(px[8::4, 1], px[6:19:4, 1], out=self._fingers[1:])
+        return self._fingers
 
     def findDistance(self, p1_id, p2_id, img, draw=True, r=10, t=2):
         length = 0
         info = []
-        if self.lmList:
-            x1, y1 = self.lmList[p1_id][1], self.lmList[p1_id][2]
-            x2, y2 = self.lmList[p2_id][1], self.lmList[p2_id][2]
+        if self.landmarks.valid:
+            x1, y1 = self.lmList[p1_id][1:]
+            x2, y2 = self.lmList[p2_id][1:]
             cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
 
             if draw:
@@ -90,31 +665,62 @@ class handDetector():
                 cv2.circle(img, (x2, y2), r, (255, 0, 255), cv2.FILLED)
                 cv2.circle(img, (cx, cy), r, (0, 0, 255), cv2.FILLED)
 
-            length = math.hypot(x2 - x1, y2 - y1)
+            length = float(self.landmarks.distances(p1_id, p2_id))
             info = [x1, y1, x2, y2, cx, cy]
         
         return length, img, info
 
+    def findAngle(self, p1_id, p2_id, p3_id):
+        """Sudut (derajat) di landmark p2 antara p1 dan p3. Menerima indeks tunggal atau array indeks."""
+        if not self.landmarks.valid:
+            return 0
+        return self.landmarks.angles(p1_id, p2_id, p3_id)
+
 # Fungsi main untuk testing modul secara mandiri
 def main():
+    import argparse
+    from frame_sources import open_source
+
+    parser = argparse.ArgumentParser(description="Tes HandTrackingModule")
+    parser.add_argument('--source', default='0', help="Indeks kamera, file video, direktori gambar, atau rekaman landmark")
+    parser.add_argument('--fast', action='store_true', help="Putar file secepat mungkin (tanpa pacing realtime)")
+    parser.add_argument('--headless', action='store_true', help="Tanpa jendela, cetak ringkasan throughput di akhir")
+    parser.add_argument('--record', help="Rekam landmark setiap frame ke file .lmtrace")
+    parser.add_argument('--label', type=int, default=-1, help="Label gestur untuk record (data latih)")
+    args = parser.parse_args()
+
     pTime = 0
-    cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+    cap = open_source(args.source, realtime=not args.fast)
     detector = handDetector(detectionCon=0.7)
+    if args.record:
+        detector.startRecording(args.record, args.label)
+    frames, hands, tStart = 0, 0, time.perf_counter()
 
     while True:
         success, img = cap.read()
-        if not success: break
-        
-        img = cv2.flip(img, 1) # Tambahkan flip di sini agar sama dengan skrip utama
-        img = detector.findHands(img)
+        if not success:
+            if not cap.isOpened(): break
+            continue # Belum ada frame baru dari kamera
+
+        if getattr(cap, 'provides_landmarks', False):
+            img = detector.findHandsFromTrace(img.copy(), cap.record, draw=not args.headless)
+        else:
+            img = cv2.flip(img, 1) # Tambahkan flip di sini agar sama dengan skrip utama
+            img = detector.findHands(img, draw=not args.headless)
         lmList = detector.findPosition(img, draw=False)
+        frames += 1
 
         if lmList:
+            hands += 1
             fingers = detector.fingersUp()
-            print(f"Fingers Up: {fingers}") # Sekarang hasil print akan akurat
+            if not args.headless:
+                print(f"Fingers Up: {fingers}") # Sekarang hasil print akan akurat
+
+        if args.headless:
+            continue
 
         cTime = time.time()
-        fps = 1 / (cTime - pTime)
+        fps = 1 / max(cTime - pTime, 1e-6)
         pTime = cTime
         cv2.putText(img, f'FPS: {int(fps)}', (10, 70), cv2.FONT_HERSHEY_PLAIN, 3, (255, 0, 255), 3)
 
@@ -122,6 +728,9 @@ def main():
         if cv2.waitKey(1) & 0xFF == ord('q'):
             break
 
+    elapsed = time.perf_counter() - tStart
+    print(f"{frames} frame dalam {elapsed:.2f} s ({frames / max(elapsed, 1e-6):.1f} fps), tangan terdeteksi di {hands} frame")
+    detector.stopRecording()
     cap.release()
     cv2.destroyAllWindows()
 
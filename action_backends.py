@@ -0,0 +1,282 @@
+# File: action_backends.py
+
+import time
+import numpy as np
+import gesture_engine as ge
+
+
+class VolumeLimiter:
+    """
+    Penulis volume yang menggabungkan permintaan: hanya target terakhir yang dikirim,
+    paling banyak `max_rate` kali per detik, dan hanya jika selisihnya dari nilai yang
+    terakhir dikirim >= `deadband` persen (kecuali untuk mencapai 0 atau 100).
+    Target yang tertunda dikirim oleh flush() berikutnya (dipanggil lewat tick()).
+    """
+
+    def __init__(self, write, read=None, max_rate=10.0, deadband=2.0, resync=2.0):
+        self.write = write
+        self.read = read
+        self.min_interval = 1.0 / max_rate
+        self.deadband = deadband
+        self.resync = resync    # detik tanpa permintaan sebelum level dibaca ulang dari perangkat
+        self.target = None
+        self.sent = None
+        self.last_write = 0.0
+        self.last_request = 0.0
+        self.requests = 0
+        self.writes = 0
+
+    def level(self, now=None):
+        """Level volume terkini. Memakai target lokal selama masih ada perubahan yang baru."""
+        now = time.time() if now is None else now
+        if self.target is not None and (self.target != self.sent or now - self.last_request < self.resync):
+            return self.target
+        if self.read is None:
+            return self.target or 0
+        return self.read()
+
+    def request(self, level, now=None):
+        now = time.time() if now is None else now
+        self.target = float(np.clip(level, 0, 100))
+        self.last_request = now
+        self.requests += 1
+        self.flush(now)
+
+    def flush(self, now=None):
+        target = self.target
+        if target is None or target == self.sent:
+            return False
+        now = time.time() if now is None else now
+        if now - self.last_write < self.min_interval:
+            return False
+        at_limit = target in (0.0, 100.0)
+        if self.sent is not None and abs(target - self.sent) < self.deadband and not at_limit:
+            return False
+        self.write(target)
+        self.sent = target
+        self.last_write = now
+        self.writes += 1
+        return True
+
+    def stats(self):
+        return {'requests': self.requests, 'writes': self.writes}
+
+
+class MediaKeyBackend:
+    """
+    Backend untuk pemutar musik apa pun di Windows: tombol media lewat pyautogui dan
+    volume master lewat pycaw (jika tersedia). Status play/pause hanya diasumsikan
+    karena tombol media tidak memberi tahu status pemutar. Seek, like dan shuffle tidak
+    punya tombol media sehingga diabaikan.
+    """
+
+    KEYS = {
+        ge.PLAY: 'playpause',
+        ge.PAUSE: 'playpause',
+        ge.NEXT_TRACK: 'nexttrack',
+        ge.PREV_TRACK: 'prevtrack',
+    }
+
+    def __init__(self, assume_playing=False, max_rate=20.0, deadband=1.0, read_interval=0.5):
+        import pyautogui
+        self._pyautogui = pyautogui
+        self.is_assumed_playing = assume_playing
+        self.level = 0.0    # Volume terakhir yang diketahui (%), aman dibaca dari thread UI
+        self.read_interval = read_interval
+        self._last_read = 0.0
+        self._init_volume()
+        if self.volume_control_enabled:
+            self.level = self.get_volume()
+        self.volume_limiter = VolumeLimiter(self.set_volume, self.get_volume, max_rate, deadband)
+
+    def _init_volume(self):
+        self.volume_control_enabled = False
+        try:
+            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+            from ctypes import cast, POINTER
+            from comtypes import CLSCTX_ALL
+            devices = AudioUtilities.GetSpeakers()
+            interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+            self.volume = cast(interface, POINTER(IAudioEndpointVolume))
+            self.minVol, self.maxVol = self.volume.GetVolumeRange()[:2]
+            self.volume_control_enabled = True
+        except Exception as e:
+            print(f"Gagal menginisialisasi Pycaw: {e}")
+
+    def thread_init(self):
+        """
+        Dipanggil ActionDispatcher di thread-nya sebelum aksi pertama: objek COM pycaw
+        dibuat ulang di thread itu agar semua panggilan volume berjalan di satu apartment.
+        """
+        try:
+            import comtypes
+            comtypes.CoInitialize()
+        except Exception:
+            return
+        self._init_volume()
+
+    def handle(self, event):
+        key = self.KEYS.get(event.kind)
+        if key:
+            presses = event.value if event.kind in (ge.NEXT_TRACK, ge.PREV_TRACK) and event.value else 1
+            self._pyautogui.press(key, presses=presses)
+            if event.kind == ge.PLAY:
+                self.is_assumed_playing = True
+            elif event.kind == ge.PAUSE:
+                self.is_assumed_playing = False
+        elif event.kind == ge.VOLUME_UP:
+            limiter = self.volume_limiter
+            limiter.request(limiter.level(event.timestamp) + event.value, event.timestamp)
+        elif event.kind == ge.VOLUME_DOWN:
+            limiter = self.volume_limiter
+            limiter.request(limiter.level(event.timestamp) - event.value, event.timestamp)
+        elif event.kind == ge.VOLUME_SET:
+            self.volume_limiter.request(event.value, event.timestamp)
+
+    def tick(self, now):
+        self.volume_limiter.flush(now)
+        # Volume bisa diubah dari luar (keyboard, mixer Windows), baca ulang sesekali
+        if self.volume_control_enabled and now - self._last_read >= self.read_interval:
+            self._last_read = now
+            self.level = self.get_volume()
+
+    def is_playing(self):
+        return self.is_assumed_playing
+
+    def get_volume(self):
+        if not self.volume_control_enabled: return 0
+        current_level = self.volume.GetMasterVolumeLevel()
+        return np.interp(current_level, [self.minVol, self.maxVol], [0, 100])
+
+    def set_volume(self, percentage):
+        if not self.volume_control_enabled: return
+        percentage = np.clip(percentage, 0, 100)
+        level = np.interp(percentage, [0, 100], [self.minVol, self.maxVol])
+        self.volume.SetMasterVolumeLevel(level, None)
+        self.level = float(percentage)
+
+
+class SpotifyBackend:
+    """
+    Backend Spotify Web API lewat SpotifyController (perintah dikirim ke thread worker-nya).
+    Perubahan volume dibatasi lebih ketat daripada pycaw karena setiap perubahan adalah
+    satu request HTTP.
+    """
+
+    def __init__(self, controller, max_rate=3.0, deadband=3.0):
+        self.controller = controller
+        self.volume_limiter = VolumeLimiter(controller.set_volume, controller.get_volume, max_rate, deadband)
+
+    def handle(self, event):
+        kind = event.kind
+        if kind == ge.PLAY or kind == ge.PAUSE:
+            self.controller.play_pause()
+        elif kind == ge.NEXT_TRACK:
+            for _ in range(event.value or 1):
+                self.controller.next_track()
+        elif kind == ge.PREV_TRACK:
+            for _ in range(event.value or 1):
+                self.controller.previous_track()
+        elif kind == ge.VOLUME_UP:
+            limiter = self.volume_limiter
+            limiter.request(limiter.level(event.timestamp) + event.value, event.timestamp)
+        elif kind == ge.VOLUME_DOWN:
+            limiter = self.volume_limiter
+            limiter.request(limiter.level(event.timestamp) - event.value, event.timestamp)
+        elif kind == ge.VOLUME_SET:
+            self.volume_limiter.request(event.value, event.timestamp)
+        elif kind == ge.SEEK_FORWARD:
+            self.controller.seek(event.value * 1000)
+        elif kind == ge.SEEK_BACKWARD:
+            self.controller.seek(-event.value * 1000)
+        elif kind == ge.LIKE:
+            self.controller.like_current()
+        elif kind == ge.SHUFFLE:
+            self.controller.toggle_shuffle()
+
+    def tick(self, now):
+        self.volume_limiter.flush(now)
+
+    def is_playing(self):
+        return self.controller.is_playing
+
+    def get_volume(self):
+        return self.volume_limiter.level()
+
+
+class SoundFeedbackBackend:
+    """Memutar efek suara sebagai umpan balik untuk setiap aksi."""
+
+    def __init__(self, sound_dir="Sounds"):
+        import pygame
+        pygame.mixer.init()
+        try:
+            sound_volume = pygame.mixer.Sound(f"{sound_dir}/sfx-1.wav")
+            sound_play_pause = pygame.mixer.Sound(f"{sound_dir}/sfx-2.wav")
+            sound_next_prev = pygame.mixer.Sound(f"{sound_dir}/sfx-3.wav")
+        except pygame.error as e:
+            print(f"Error loading sound files: {e}")
+            sound_volume = sound_play_pause = sound_next_prev = None
+        self.sounds = {
+            ge.VOLUME_MODE_ON: sound_volume,
+            ge.VOLUME_UP: sound_volume,
+            ge.VOLUME_DOWN: sound_volume,
+            ge.PLAY: sound_play_pause,
+            ge.PAUSE: sound_play_pause,
+            ge.NEXT_TRACK: sound_next_prev,
+            ge.PREV_TRACK: sound_next_prev,
+            ge.SEEK_FORWARD: sound_next_prev,
+            ge.SEEK_BACKWARD: sound_next_prev,
+            ge.LIKE: sound_play_pause,
+            ge.SHUFFLE: sound_play_pause,
+        }
+
+    def handle(self, event):
+        sound = self.sounds.get(event.kind)
+        if sound is not None:
+            sound.play()
+
+    def close(self):
+        import pygame
+        pygame.mixer.quit()
+
+
+class LogBackend:
+    """Backend tanpa perangkat keluaran yang mencetak setiap event (mode headless uji coba)."""
+
+    def __init__(self, playing=False):
+        self.playing = playing
+
+    def handle(self, event):
+        print(f"[{time.strftime('%H:%M:%S')}] {event.text}")
+        if event.kind == ge.PLAY:
+            self.playing = True
+        elif event.kind == ge.PAUSE:
+            self.playing = False
+
+    def is_playing(self):
+        return self.playing
+
+
+class RecordingBackend:
+    """
+    Backend tanpa efek samping yang hanya mencatat event (untuk benchmark dan replay headless).
+    `delay` (detik) mensimulasikan aksi yang lambat, misalnya pyautogui.press dengan PAUSE-nya.
+    """
+
+    def __init__(self, playing=False, delay=0.0):
+        self.events = []
+        self.playing = playing
+        self.delay = delay
+
+    def handle(self, event):
+        if self.delay:
+            time.sleep(self.delay)
+        self.events.append(event)
+        if event.kind == ge.PLAY:
+            self.playing = True
+        elif event.kind == ge.PAUSE:
+            self.playing = False
+
+    def is_playing(self):
+        return self.playing
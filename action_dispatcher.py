@@ -0,0 +1,197 @@
+# File: action_dispatcher.py
+
+import threading
+import time
+from collections import deque
+
+import gesture_engine as ge
+from gesture_pipeline import StageTimer
+
+
+class ActionDispatcher:
+    """
+    Menjalankan aksi backend (tombol media pyautogui, volume pycaw, efek suara, Spotify)
+    di thread sendiri, sehingga loop frame tidak pernah ikut menunggu. pyautogui misalnya
+    menahan PAUSE (0.1 detik) setelah setiap tombol.
+
+    Bagi GestureEngine, dispatcher adalah satu backend biasa: handle(event) hanya
+    memasukkan event ke antrian terbatas (`max_queue`) lalu kembali. Event yang jenisnya
+    masih menunggu di antrian digabung (deduplikasi per aksi):
+    - NEXT/PREV_TRACK dan VOLUME_UP/DOWN: nilainya dijumlahkan (jumlah lagu/langkah).
+      NEXT/PREV yang berlawanan arah menjadi batas: NEXT, PREV, NEXT tetap tiga event
+      berurutan, seperti next/previous di SpotifyController._coalesce
+    - VOLUME_SET: hanya level terakhir
+    - PLAY/PAUSE: event yang berlawanan dengan PLAY/PAUSE yang masih menunggu saling
+      membatalkan (tombol media dan Spotify sama-sama toggle), yang sama dibuang
+    - SHUFFLE (toggle): dua event yang menunggu saling membatalkan
+    - aksi lain (LIKE, mode volume, ...): duplikat dibuang
+    Jika antrian penuh, event baru dibuang dan dihitung di stats().
+
+    tick() backend (flush volume yang di-rate-limit) juga dijalankan di thread dispatcher
+    setiap `tick_interval` detik. Backend boleh punya thread_init() yang dipanggil sekali
+    di thread dispatcher sebelum aksi pertama (misalnya inisialisasi COM untuk pycaw).
+
+    Durasi setiap aksi dicatat per jenis event, bersama waktu tunggu di antrian dan total
+    waktu sejak event dikirim sampai semua backend selesai ('complete').
+    """
+
+    MERGE_SUM = (ge.NEXT_TRACK, ge.PREV_TRACK, ge.VOLUME_UP, ge.VOLUME_DOWN)
+    MERGE_LATEST = (ge.VOLUME_SET,)
+    PLAY_STATE = (ge.PLAY, ge.PAUSE)
+    OPPOSITE_TRACK = {ge.NEXT_TRACK: ge.PREV_TRACK, ge.PREV_TRACK: ge.NEXT_TRACK}
+
+    def __init__(self, backends=(), max_queue=16, tick_interval=0.05):
+        self.backends = list(backends)
+        self._tickers = [backend for backend in self.backends if hasattr(backend, 'tick')]
+        self.max_queue = max_queue
+        self.tick_interval = tick_interval
+        self._queue = deque()
+        self._pending = {}          # kunci aksi -> event yang masih di antrian (PLAY/PAUSE berbagi kunci)
+        self._cond = threading.Condition()
+        self._play_outstanding = 0  # PLAY/PAUSE yang menunggu atau sedang dijalankan
+        self._play_expected = False # Status play setelah semuanya selesai
+        self.timer = StageTimer()
+        self.enqueued = 0
+        self.dispatched = 0
+        self.deduplicated = 0
+        self.cancelled = 0
+        self.dropped = 0
+        self.errors = 0
+        self.is_running = False
+        self._thread = None
+
+    def start(self):
+        if self.is_running:
+            return self
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self, timeout=2.0):
+        """Jalankan sisa antrian lalu hentikan thread dispatcher."""
+        with self._cond:
+            self.is_running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _key(self, kind):
+        return ge.PLAY if kind in self.PLAY_STATE else kind
+
+    def _position(self, event):
+        return next(i for i, item in enumerate(self._queue) if item[0] is event)
+
+    # --- Dipanggil dari thread frame (lewat GestureEngine) ---
+    def handle(self, event):
+        kind = event.kind
+        key = self._key(kind)
+        with self._cond:
+            pending = self._pending.get(key)
+            if pending is not None and (pending.kind != kind or kind == ge.SHUFFLE):
+                # Toggle yang berlawanan: keduanya batal, status kembali seperti sebelum event yang menunggu
+                self._queue.remove(next(item for item in self._queue if item[0] is pending))
+                del self._pending[key]
+                if key == ge.PLAY:
+                    self._play_outstanding -= 1
+                    self._play_expected = kind == ge.PLAY
+                self.cancelled += 2
+                return
+            if pending is not None and kind in self.OPPOSITE_TRACK:
+                opposite = self._pending.get(self.OPPOSITE_TRACK[kind])
+                if opposite is not None and self._position(opposite) > self._position(pending):
+                    pending = None  # Ada pindah lagu berlawanan arah setelahnya: antrikan sebagai event baru
+            if pending is not None:
+                if kind in self.MERGE_SUM:
+                    pending.value = (pending.value or 1) + (event.value or 1)
+                elif kind in self.MERGE_LATEST:
+                    pending.value = event.value
+                    pending.timestamp = event.timestamp
+                self.deduplicated += 1
+                return
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                return
+            if key == ge.PLAY:
+                self._play_outstanding += 1
+                self._play_expected = kind == ge.PLAY
+            self._queue.append((event, time.perf_counter()))
+            self._pending[key] = event
+            self.enqueued += 1
+            self._cond.notify()
+
+    def is_playing(self):
+        """Status pemutaran, memperhitungkan PLAY/PAUSE yang belum selesai dijalankan."""
+        with self._cond:
+            if self._play_outstanding:
+                return self._play_expected
+        for backend in self.backends:
+            if hasattr(backend, 'is_playing'):
+                return backend.is_playing()
+        return False
+
+    # --- Thread dispatcher ---
+    def _run(self):
+        for backend in self.backends:
+            if hasattr(backend, 'thread_init'):
+                backend.thread_init()
+        while True:
+            with self._cond:
+                if not self._queue and self.is_running:
+                    self._cond.wait(timeout=self.tick_interval if self._tickers else None)
+                if not self._queue and not self.is_running:
+                    break
+                item = self._queue.popleft() if self._queue else None
+                if item is not None:
+                    key = self._key(item[0].kind)
+                    if self._pending.get(key) is item[0]:
+                        del self._pending[key]
+            if item is not None:
+                self._dispatch(*item)
+            now = time.time()
+            for backend in self._tickers:
+                try:
+                    backend.tick(now)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Error pada tick {type(backend).__name__}: {e}")
+
+    def _dispatch(self, event, queued_at):
+        t0 = time.perf_counter()
+        self.timer.add('queue_wait', t0 - queued_at)
+        for backend in self.backends:
+            try:
+                backend.handle(event)
+            except Exception as e:
+                # Satu backend yang gagal tidak boleh menghentikan backend lain atau thread ini
+                self.errors += 1
+                print(f"Error pada {type(backend).__name__} untuk aksi {event.kind}: {e}")
+        t1 = time.perf_counter()
+        self.timer.add(event.kind, t1 - t0)
+        self.timer.add('complete', t1 - queued_at)
+        self.dispatched += 1
+        if event.kind in self.PLAY_STATE:
+            with self._cond:
+                self._play_outstanding -= 1    # 0: backend sudah tahu status terbarunya
+
+    def stats(self):
+        with self._cond:
+            depth = len(self._queue)
+        return {
+            'enqueued': self.enqueued,
+            'dispatched': self.dispatched,
+            'deduplicated': self.deduplicated,
+            'cancelled': self.cancelled,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'queue_depth': depth,
+            'timing': self.timer.snapshot(),
+        }
+
+    def report(self):
+        """String ringkas untuk dicetak ke konsol bersama statistik pipeline."""
+        complete = self.timer.snapshot().get('complete')
+        latency = f"{complete['avg_ms']:.0f}ms (maks {complete['max_ms']:.0f}ms)" if complete else "-"
+        return (f"aksi {self.dispatched} {latency} digabung {self.deduplicated} batal {self.cancelled}"
+                f" dibuang {self.dropped} antri {len(self._queue)}")
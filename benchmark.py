@@ -0,0 +1,526 @@
+# File: benchmark.py
+#
+# Benchmark headless untuk detector, logika gestur, konversi tampilan dan pipeline end-to-end.
+# Contoh:
+#   python benchmark.py --frames 200 --output hasil.json
+#   python benchmark.py --video rekaman.mp4 --trace sesi.lmtrace --model-complexity 0 1 --resolution 640x480 320x240
+#   python benchmark.py --spotify 500 --spotify-only   (SpotifyController terhadap mock_spotify_server)
+#   python benchmark.py --actions 60 --actions-only    (aksi langsung vs lewat ActionDispatcher)
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+import cv2
+import numpy as np
+
+import HandTrackingModule as htm
+from frame_sources import open_source, LandmarkTraceSource
+from gesture_pipeline import GesturePipeline
+import gesture_engine as ge
+from gesture_engine import GestureEngine, GestureEvent
+from landmark_filter import LandmarkFilter
+from dynamic_gestures import DynamicGestureRecognizer
+from action_backends import RecordingBackend
+from action_dispatcher import ActionDispatcher
+
+
+def summarize(samples, total_time=None):
+    """Ringkasan latensi (ms) dengan persentil p50/p95/p99."""
+    if not samples:
+        return {'count': 0}
+    ms = np.asarray(samples, dtype=np.float64) * 1000.0
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    summary = {
+        'count': len(ms),
+        'mean_ms': float(ms.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(ms.max()),
+    }
+    total = total_time if total_time is not None else ms.sum() / 1000.0
+    summary['throughput_fps'] = len(ms) / total if total > 0 else 0.0
+    return summary
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+# --- Sumber input ---
+def synthetic_frames(width, height, count, seed=0):
+    """Frame noise (tanpa tangan): mengukur biaya deteksi telapak tangan MediaPipe."""
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(min(count, 8))]
+
+
+def synthetic_landmarks(count, seed=0):
+    """Landmark acak yang masuk akal (di sekitar pusat gambar) untuk mengukur logika Python/NumPy."""
+    rng = np.random.default_rng(seed)
+    base = rng.random((21, 3)).astype(np.float32) * 0.3 + 0.35
+    jitter = rng.normal(0, 0.02, (count, 21, 3)).astype(np.float32)
+    return base + jitter
+
+
+class _Record:
+    __slots__ = ('timestamp', 'norm', 'handedness', 'score', 'label')
+
+    def __init__(self, norm):
+        self.timestamp = 0.0
+        self.norm = norm
+        self.handedness = 1
+        self.score = 1.0
+        self.label = -1
+
+
+def video_frames(path, width, height, limit):
+    source = open_source(path, width, height, realtime=False)
+    frames = []
+    while len(frames) < limit:
+        success, frame = source.read()
+        if not success:
+            break
+        if frame.shape[:2] != (height, width):
+            frame = cv2.resize(frame, (width, height))
+        frames.append(frame.copy())
+    source.release()
+    return frames
+
+
+def trace_records(path, limit):
+    source = LandmarkTraceSource(path, realtime=False)
+    records = []
+    while len(records) < limit:
+        success, _ = source.read()
+        if not success:
+            break
+        records.append(source.record)
+    source.release()
+    return records
+
+
+# --- Logika gestur lama (rantai if/elif sebelum GestureEngine), sebagai pembanding ---
+def legacy_gesture_decision(fingers, lmList):
+    if not lmList:
+        return None
+    thumbs_up = fingers == [1, 0, 0, 0, 0] and lmList[4][2] < lmList[2][2]
+    thumbs_down = fingers == [1, 0, 0, 0, 0] and lmList[4][2] > lmList[2][2]
+    if fingers == [0, 1, 1, 1, 0]:
+        return 'volume_mode'
+    if fingers == [1, 1, 1, 1, 1]:
+        return 'play'
+    if thumbs_down:
+        return 'pause'
+    if thumbs_up:
+        return 'volume_up'
+    if fingers == [0, 1, 1, 0, 0]:
+        return 'swipe'
+    return None
+
+
+# --- Benchmark ---
+def bench_detector(frames, model_complexity, iterations):
+    detector = htm.handDetector(modelComplexity=model_complexity, detectionCon=0.75)
+    samples_hands, samples_pos = [], []
+    hands_found = 0
+    for i in range(iterations):
+        img = frames[i % len(frames)]
+        t0 = time.perf_counter()
+        detector.findHands(img, draw=False)
+        t1 = time.perf_counter()
+        lmList = detector.findPosition(img, draw=False)
+        t2 = time.perf_counter()
+        samples_hands.append(t1 - t0)
+        samples_pos.append(t2 - t1)
+        hands_found += bool(lmList)
+    return {
+        'findHands': summarize(samples_hands),
+        'findPosition': summarize(samples_pos),
+        'hand_rate': hands_found / iterations,
+    }
+
+
+def bench_landmark_logic(records, width, height, iterations):
+    """findPosition/fingersUp/fingerState/filter/gestur dinamis/keputusan gestur di atas landmark rekaman (tanpa MediaPipe)."""
+    detector = htm.handDetector()
+    blank = np.zeros((height, width, 3), dtype=np.uint8)
+    engine = GestureEngine(backends=[RecordingBackend()])
+    landmark_filter = LandmarkFilter()
+    samples_pos, samples_fingers, samples_state, samples_gesture, samples_legacy = [], [], [], [], []
+    samples_filter, samples_dynamic = [], []
+    # Gestur dinamis diukur di setiap frame (bukan hanya saat pose telunjuk) sebagai batas atas biaya
+    dynamic = DynamicGestureRecognizer()
+    for i in range(iterations):
+        detector.findHandsFromTrace(blank, records[i % len(records)], draw=False)
+        t0 = time.perf_counter()
+        lmList = detector.findPosition(blank, draw=False)
+        t1 = time.perf_counter()
+        fingers = detector.fingersUp()
+        t2 = time.perf_counter()
+        finger_code = detector.fingerState()
+        t3 = time.perf_counter()
+        engine.update(finger_code, detector.landmarks, i / 30.0)
+        t4 = time.perf_counter()
+        legacy_gesture_decision(fingers, lmList)
+        t5 = time.perf_counter()
+        landmark_filter.apply(detector, i / 30.0)
+        t6 = time.perf_counter()
+        dynamic.update(detector.landmarks, i / 30.0)
+        t7 = time.perf_counter()
+        samples_pos.append(t1 - t0)
+        samples_fingers.append(t2 - t1)
+        samples_state.append(t3 - t2)
+        samples_gesture.append(t4 - t3)
+        samples_legacy.append(t5 - t4)
+        samples_filter.append(t6 - t5)
+        samples_dynamic.append(t7 - t6)
+    return {
+        'findPosition': summarize(samples_pos),
+        'fingersUp': summarize(samples_fingers),
+        'fingerState': summarize(samples_state),
+        'landmark_filter': summarize(samples_filter),
+        'dynamic_gestures': dict(summarize(samples_dynamic), **dynamic.stats()),
+        'gesture_decision': summarize(samples_gesture),
+        'gesture_decision_legacy': summarize(samples_legacy),
+        'events_emitted': engine.events_emitted,
+    }
+
+
+def _transform_px(src, dst, center, degrees, mirror):
+    """Rotasi (dan mirror) landmark piksel di sekitar `center`, hasil ditulis ke dst."""
+    t = np.radians(degrees)
+    rot = np.array([[np.cos(t), -np.sin(t)], [np.sin(t), np.cos(t)]], dtype=np.float32)
+    np.copyto(dst, src)
+    dst[:, :2] = (src[:, :2] - center) @ rot.T
+    if mirror:
+        dst[:, 0] *= -1
+    dst[:, :2] += center
+
+
+FINGER_TRANSFORMS = [(deg, mirror) for deg in (-60, -30, 30, 60) for mirror in (False, True)] + [(0, True)]
+
+
+def bench_finger_methods(records, width, height, iterations):
+    """
+    Metode status jari 'position' (fingersUpArray) vs 'angle' (FingerAngleClassifier):
+    - kecepatan per frame
+    - konsistensi: fraksi frame yang kodenya tetap sama setelah tangan dirotasi +/-30/60
+      derajat dan/atau di-mirror (idealnya 1.0)
+    - akurasi terhadap label jika rekaman direkam dengan --label <kode jari 0..31>
+    """
+    detector = htm.handDetector()
+    classifier = detector.angleClassifier
+    landmarks = htm.HandLandmarks()
+    moved = htm.HandLandmarks()
+    methods = {
+        'position': lambda lm: int(detector.fingersUpArray(lm) @ htm.FINGER_BITS),
+        'angle': lambda lm: int(classifier.classify(lm) @ htm.FINGER_BITS),
+    }
+    results = {}
+    hands = [r for r in records if r.handedness >= 0] or records
+    for name, method in methods.items():
+        samples, consistent, checked, correct, labelled = [], 0, 0, 0, 0
+        for i in range(iterations):
+            record = hands[i % len(hands)]
+            landmarks.update(htm.TraceHand(record.norm), width, height)
+            landmarks.handedness = htm.TraceResults.HANDEDNESS_LABELS[record.handedness] if record.handedness >= 0 else ""
+            t0 = time.perf_counter()
+            code = method(landmarks)
+            samples.append(time.perf_counter() - t0)
+            if 0 <= record.label < 32:
+                labelled += 1
+                correct += code == record.label
+            if i < len(hands):
+                moved.handedness = landmarks.handedness
+                center = landmarks.px[0, :2]
+                for degrees, mirror in FINGER_TRANSFORMS:
+                    _transform_px(landmarks.px, moved.px, center, degrees, mirror)
+                    consistent += method(moved) == code
+                    checked += 1
+        results[name] = {
+            'time': summarize(samples),
+            'consistency': consistent / checked if checked else None,
+            'accuracy': correct / labelled if labelled else None,
+        }
+    return results
+
+
+def bench_display(width, height, iterations):
+    """Biaya konversi tampilan: jalur lama (cvtColor+fromarray+PhotoImage baru) vs jalur bersama."""
+    from PIL import Image
+    bgr = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    rgb = np.empty_like(bgr)
+    results = {
+        'cvtColor': summarize(timed(lambda: cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB), iterations)),
+        'cvtColor_flip_inplace': summarize(timed(
+            lambda: (cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=rgb), cv2.flip(rgb, 1, dst=rgb)), iterations)),
+        'fromarray': summarize(timed(lambda: Image.fromarray(rgb), iterations)),
+        'frombuffer': summarize(timed(lambda: Image.frombuffer("RGB", (width, height), rgb, "raw", "RGB", 0, 1), iterations)),
+    }
+    try:
+        import tkinter as tk
+        from PIL import ImageTk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception as e:
+        results['PhotoImage'] = {'skipped': f"Tk tidak tersedia: {e}"}
+        return results
+
+    img = Image.frombuffer("RGB", (width, height), rgb, "raw", "RGB", 0, 1)
+    photo = ImageTk.PhotoImage(image=img)
+    results['PhotoImage_new'] = summarize(timed(lambda: ImageTk.PhotoImage(image=Image.fromarray(
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB))), iterations))
+    results['PhotoImage_paste'] = summarize(timed(lambda: photo.paste(img), iterations))
+    root.destroy()
+    return results
+
+
+class _SyntheticSource:
+    """Sumber frame sintetis dengan pacing fps, untuk mengukur latensi end-to-end pipeline."""
+    provides_landmarks = False
+
+    def __init__(self, frames, fps, count):
+        self.frames = frames
+        self.period = 1.0 / fps
+        self.count = count
+        self.frames_read = 0
+        self._next = time.perf_counter()
+
+    def read(self, timeout=None):
+        if self.frames_read >= self.count:
+            return False, None
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self._next += self.period
+        frame = self.frames[self.frames_read % len(self.frames)]
+        self.frames_read += 1
+        return True, frame
+
+    def isOpened(self):
+        return self.frames_read < self.count
+
+    def stats(self):
+        return {'captured': self.frames_read, 'dropped': 0, 'consumed': self.frames_read}
+
+    def release(self):
+        pass
+
+
+def bench_end_to_end(frames, model_complexity, fps, count):
+    """Latensi dari frame tersedia sampai keputusan gestur selesai di thread konsumen."""
+    source = _SyntheticSource(frames, fps, count)
+    detector = htm.handDetector(modelComplexity=model_complexity, detectionCon=0.75)
+    pipeline = GesturePipeline(source, detector).start()
+    engine = GestureEngine(backends=[RecordingBackend()])
+    latencies = []
+    t_start = time.perf_counter()
+    while True:
+        result = pipeline.poll()
+        if result is None:
+            if pipeline.finished: # Hasil terakhir selalu dipublikasikan sebelum worker berhenti
+                break
+            time.sleep(0.001)
+            continue
+        engine.update(result.finger_code, result.lmList.landmarks, result.stamp)
+        latencies.append(time.time() - result.capture_time)
+    elapsed = time.perf_counter() - t_start
+    pipeline.stop()
+    summary = summarize(latencies, elapsed)
+    summary['frames_offered'] = count
+    summary['results_dropped'] = pipeline.results_dropped
+    summary['stages'] = pipeline.timer.snapshot()
+    return summary
+
+
+def _wait_drained(controller, timeout):
+    """Tunggu sampai semua perintah yang diterima controller selesai dieksekusi/digabung/ditolak."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        done = controller.commands_executed + controller.commands_coalesced + controller.commands_rejected
+        if done >= controller.commands_received:
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def bench_spotify(commands, latency_ms):
+    """
+    Throughput, penggabungan perintah dan backoff SpotifyController terhadap
+    mock_spotify_server lokal (tanpa kredensial/internet). Pola perintah meniru
+    pinch volume yang terus bergerak (~200 perintah/detik) diselingi play/pause dan next
+    (jauh lebih rapat daripada gestur sungguhan, untuk menguji penggabungan perintah).
+    """
+    from mock_spotify_server import MockSpotifyServer
+    from spotify_controller import SpotifyController
+    scenarios = {
+        'baseline': {'latency_ms': latency_ms, 'jitter_ms': latency_ms / 2},
+        'rate_limited': {'latency_ms': latency_ms, 'rate_limit': 5.0, 'burst': 5, 'retry_after': 1},
+        'errors': {'latency_ms': latency_ms, 'error_rate': 0.3},
+    }
+    results = {}
+    for name, options in scenarios.items():
+        server = MockSpotifyServer(**options).start()
+        controller = SpotifyController(api_base=server.url, access_token='bench')
+        if not controller.start():
+            results[name] = {'skipped': "Controller gagal terhubung ke mock server"}
+            server.stop()
+            continue
+        server.reset_stats()
+        t0 = time.perf_counter()
+        for i in range(commands):
+            if i % 50 == 49:
+                controller.next_track()
+            elif i % 25 == 0:
+                controller.play_pause()
+            else:
+                controller.set_volume(i % 101)
+            time.sleep(0.005)
+        drained = _wait_drained(controller, timeout=60.0)
+        elapsed = time.perf_counter() - t0
+        controller.stop()
+        server.stop()
+        results[name] = {
+            'mock': options,
+            'drained': drained,
+            'seconds': elapsed,
+            'commands_per_s': commands / elapsed,
+            'controller': controller.stats(),
+            'server': server.stats(),
+        }
+    return results
+
+
+def bench_actions(count, delay, fps=30.0):
+    """
+    Berapa lama thread frame tertahan oleh aksi: backend dipanggil langsung vs lewat
+    ActionDispatcher. RecordingBackend dengan `delay` meniru pyautogui.press (PAUSE 0.1
+    detik). Pola event: deretan VOLUME_UP seperti mode volume, diselingi play/pause dan next.
+    """
+    results = {}
+    for name in ('direct', 'dispatched'):
+        backend = RecordingBackend(delay=delay)
+        dispatcher = ActionDispatcher([backend]).start() if name == 'dispatched' else None
+        target = dispatcher or backend
+        samples = []
+        t0 = time.perf_counter()
+        for i in range(count):
+            if i % 20 == 19:
+                event = GestureEvent(ge.NEXT_TRACK, 1, time.time())
+            elif i % 10 == 0:
+                event = GestureEvent(ge.PAUSE if i % 20 else ge.PLAY, None, time.time())
+            else:
+                event = GestureEvent(ge.VOLUME_UP, 2, time.time())
+            t_event = time.perf_counter()
+            target.handle(event)
+            samples.append(time.perf_counter() - t_event)
+            time.sleep(1.0 / fps)
+        if dispatcher is not None:
+            dispatcher.close(timeout=count * delay + 1.0)
+        results[name] = {
+            'frame_blocking': summarize(samples),
+            'seconds': time.perf_counter() - t0,
+            'backend_calls': len(backend.events),
+        }
+        if dispatcher is not None:
+            results[name]['dispatcher'] = dispatcher.stats()
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless Music Gesture Controller")
+    parser.add_argument('--frames', type=int, default=200, help="Jumlah iterasi per benchmark")
+    parser.add_argument('--resolution', nargs='+', default=['640x480'], help="Satu atau lebih resolusi WxH")
+    parser.add_argument('--model-complexity', nargs='+', type=int, default=[1], help="Nilai modelComplexity MediaPipe")
+    parser.add_argument('--video', help="File video/direktori gambar rekaman (default: frame sintetis)")
+    parser.add_argument('--trace', help="Rekaman landmark .lmtrace/.npz (default: landmark sintetis)")
+    parser.add_argument('--fps', type=float, default=30.0, help="Kecepatan sumber untuk benchmark end-to-end")
+    parser.add_argument('--skip-e2e', action='store_true', help="Lewati benchmark end-to-end")
+    parser.add_argument('--spotify', type=int, default=0, metavar='N',
+                        help="Kirim N perintah ke SpotifyController lewat mock server (0 = lewati)")
+    parser.add_argument('--spotify-latency', type=float, default=50.0, help="Latensi mock server (ms)")
+    parser.add_argument('--spotify-only', action='store_true', help="Hanya jalankan benchmark Spotify")
+    parser.add_argument('--actions', type=int, default=0, metavar='N',
+                        help="Benchmark N aksi langsung vs lewat ActionDispatcher")
+    parser.add_argument('--actions-delay', type=float, default=0.1, help="Durasi tiruan satu aksi (detik)")
+    parser.add_argument('--actions-only', action='store_true', help="Hanya jalankan benchmark aksi")
+    parser.add_argument('--output', help="Tulis hasil ke file JSON (default: cetak ke stdout)")
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'git': git_revision(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'opencv': cv2.__version__,
+            'frames': args.frames,
+            'input': args.video or 'synthetic',
+            'trace': args.trace or 'synthetic',
+        },
+        'runs': [],
+    }
+    if args.spotify:
+        print(f"Benchmark SpotifyController ({args.spotify} perintah, mock {args.spotify_latency:.0f}ms) ...")
+        report['spotify'] = bench_spotify(args.spotify, args.spotify_latency)
+    if args.actions:
+        print(f"Benchmark aksi ({args.actions} event, {args.actions_delay * 1000:.0f}ms per aksi) ...")
+        report['actions'] = bench_actions(args.actions, args.actions_delay)
+
+    if args.trace:
+        records = trace_records(args.trace, args.frames)
+    else:
+        records = [_Record(norm) for norm in synthetic_landmarks(args.frames)]
+
+    for resolution in ([] if args.spotify_only or args.actions_only else args.resolution):
+        width, height = (int(v) for v in resolution.lower().split('x'))
+        if args.video:
+            frames = video_frames(args.video, width, height, args.frames)
+        else:
+            frames = synthetic_frames(width, height, args.frames)
+        if not frames:
+            raise SystemExit(f"Tidak ada frame dari {args.video}")
+
+        logic = bench_landmark_logic(records, width, height, args.frames) if records else {}
+        if records:
+            logic['finger_methods'] = bench_finger_methods(records, width, height, args.frames)
+        display = bench_display(width, height, args.frames)
+        for complexity in args.model_complexity:
+            print(f"Benchmark {width}x{height}, modelComplexity={complexity} ...")
+            run = {
+                'resolution': [width, height],
+                'model_complexity': complexity,
+                'detector': bench_detector(frames, complexity, args.frames),
+                'landmark_logic': logic,
+                'display': display,
+            }
+            if not args.skip_e2e:
+                run['end_to_end'] = bench_end_to_end(frames, complexity, args.fps, args.frames)
+            report['runs'].append(run)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+        print(f"Hasil benchmark disimpan ke {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
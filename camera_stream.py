@@ -0,0 +1,140 @@
+# File: camera_stream.py
+
+import threading
+import time
+import cv2
+import numpy as np
+
+
+class CameraStream:
+    """
+    Membaca frame dari cv2.VideoCapture di thread terpisah ke dalam ring buffer
+    berukuran tetap. Konsumen selalu mendapat frame TERBARU; frame lama yang
+    belum sempat dibaca akan ditimpa dan dihitung sebagai 'dropped'.
+
+    Antarmuka read()/isOpened()/release() sengaja dibuat mirip cv2.VideoCapture
+    supaya bisa langsung menggantikan self.cap di GUI dan skrip.
+    """
+
+    def __init__(self, src=0, width=640, height=480, backend=cv2.CAP_DSHOW, slots=3):
+        if slots < 3:
+            # Minimal 3 slot: satu sedang ditulis, satu frame terbaru, satu dipegang konsumen
+            raise ValueError("CameraStream membutuhkan minimal 3 slot")
+        self.src = src
+        self.width = width
+        self.height = height
+        self.cap = cv2.VideoCapture(src, backend)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # Jangan biarkan driver menumpuk frame, kita sudah punya ring buffer sendiri
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        # Ring buffer dialokasikan sekali di awal
+        self.slots = slots
+        self._buffers = np.zeros((slots, height, width, 3), dtype=np.uint8)
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+        self._latest = -1       # slot berisi frame terbaru
+        self._reading = -1      # slot yang sedang dipegang konsumen
+        self._latest_id = 0     # nomor urut frame terbaru
+        self._consumed_id = 0   # nomor urut frame terakhir yang dibaca konsumen
+
+        # Statistik
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.last_capture_time = 0.0
+
+        self.is_running = False
+        self._thread = None
+
+    def start(self):
+        """Memulai thread capture. Mengembalikan self agar bisa dirangkai."""
+        if self.is_running or not self.cap.isOpened():
+            return self
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _next_write_slot(self):
+        """Pilih slot yang bukan frame terbaru dan bukan yang sedang dibaca konsumen."""
+        for offset in range(1, self.slots + 1):
+            idx = (self._latest + offset) % self.slots
+            if idx != self._latest and idx != self._reading:
+                return idx
+        return 0
+
+    def _run(self):
+        """Loop capture yang berjalan di thread terpisah."""
+        while self.is_running:
+            with self._lock:
+                idx = self._next_write_slot()
+            slot = self._buffers[idx]
+
+            success, frame = self.cap.read(slot)
+            if not success:
+                time.sleep(0.005)
+                continue
+            if frame is not slot:
+                # Resolusi kamera berbeda dari yang diminta, sesuaikan ring buffer
+                if frame.shape != slot.shape:
+                    self._resize_buffers(frame.shape)
+                    continue
+                np.copyto(slot, frame)
+
+            with self._lock:
+                if self._latest_id > self._consumed_id:
+                    # Frame terbaru sebelumnya belum sempat dibaca, dianggap dibuang
+                    self.frames_dropped += 1
+                self._latest = idx
+                self._latest_id += 1
+                self.frames_captured += 1
+                self.last_capture_time = time.time()
+                self._new_frame.notify_all()
+
+    def _resize_buffers(self, shape):
+        with self._lock:
+            self.height, self.width = shape[0], shape[1]
+            self._buffers = np.zeros((self.slots,) + tuple(shape), dtype=np.uint8)
+            self._latest = -1
+            self._reading = -1
+
+    def read(self, timeout=0.1):
+        """
+        Mengambil frame terbaru. Menunggu maksimal `timeout` detik jika belum ada
+        frame baru sejak pembacaan terakhir (timeout=0 berarti tidak menunggu).
+
+        Frame yang dikembalikan adalah view ke ring buffer dan tetap valid sampai
+        read() berikutnya dipanggil. Gunakan .copy() jika perlu menyimpannya lebih lama.
+        """
+        with self._lock:
+            if self._latest_id == self._consumed_id and timeout:
+                self._new_frame.wait_for(
+                    lambda: self._latest_id > self._consumed_id or not self.is_running,
+                    timeout)
+            if self._latest_id == self._consumed_id or self._latest < 0:
+                return False, None
+            self._reading = self._latest
+            self._consumed_id = self._latest_id
+            return True, self._buffers[self._reading]
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def stats(self):
+        """Statistik capture untuk ditampilkan/di-log."""
+        return {
+            'captured': self.frames_captured,
+            'dropped': self.frames_dropped,
+            'consumed': self._consumed_id,
+        }
+
+    def release(self):
+        """Menghentikan thread capture dan melepaskan kamera."""
+        self.is_running = False
+        with self._lock:
+            self._new_frame.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.cap.release()
@@ -0,0 +1,280 @@
+# File: dynamic_gestures.py
+
+import math
+import numpy as np
+
+
+# Nama template bawaan
+CIRCLE_CW = 'circle_cw'
+CIRCLE_CCW = 'circle_ccw'
+PUSH = 'push'
+PULL = 'pull'
+DOUBLE_TAP = 'double_tap'
+
+# Fitur per frame: x, y ujung telunjuk (ternormalisasi) dan ukuran tangan (proksi jarak ke kamera)
+NUM_CHANNELS = 3
+
+
+def normalize_sequence(seq, out):
+    """
+    Normalisasi urutan fitur (L, 3) [x, y, ukuran] in-place ke `out`: posisi dikurangi
+    rata-ratanya lalu dibagi ukuran tangan rata-rata (satuan 'panjang tangan'), ukuran
+    diubah menjadi perubahan relatif terhadap rata-ratanya. Hasilnya tidak bergantung
+    pada posisi tangan di gambar maupun jarak tangan ke kamera.
+    """
+    size = max(float(seq[:, 2].mean()), 1e-6)
+    np.subtract(seq[:, :2], seq[:, :2].mean(axis=0), out=out[:, :2])
+    out[:, :2] /= size
+    np.divide(seq[:, 2], size, out=out[:, 2])
+    out[:, 2] -= 1.0
+    return out
+
+
+def _raw_template(name, length):
+    """Template bawaan dalam fitur mentah [x, y, ukuran] dengan ukuran tangan 1."""
+    t = np.linspace(0.0, 1.0, length)
+    raw = np.zeros((length, NUM_CHANNELS), dtype=np.float32)
+    raw[:, 2] = 1.0
+    if name in (CIRCLE_CW, CIRCLE_CCW):
+        # Y gambar bertambah ke bawah, jadi (cos, sin) tampak searah jarum jam di layar
+        angle = 2.0 * math.pi * t
+        raw[:, 0] = 0.5 * np.cos(angle)
+        raw[:, 1] = 0.5 * np.sin(angle) * (1 if name == CIRCLE_CW else -1)
+    elif name == PUSH:
+        raw[:, 2] = 0.8 + 0.4 * t      # tangan mendekat -> terlihat membesar
+    elif name == PULL:
+        raw[:, 2] = 1.2 - 0.4 * t
+    elif name == DOUBLE_TAP:
+        raw[:, 2] = 1.0 + 0.3 * np.maximum(np.sin(4.0 * math.pi * t), 0.0)
+    else:
+        raise ValueError(f"Template tidak dikenal: {name}")
+    return raw
+
+
+DEFAULT_TEMPLATES = (CIRCLE_CW, CIRCLE_CCW, PUSH, PULL, DOUBLE_TAP)
+
+
+class DynamicGestureRecognizer:
+    """
+    Pengenal gestur temporal (lingkaran, dorong/tarik, ketuk dua kali) dari urutan landmark.
+
+    - Riwayat langsung di-resample saat frame masuk: setiap titik grid (jarak
+      `duration` / (`length` - 1) detik) yang terlewati diinterpolasi dari dua frame
+      terakhir ke ring buffer `length` titik yang dialokasikan sekali. Jendela
+      `duration` detik terakhir selalu siap dipakai tanpa interpolasi ulang, dan
+      hasilnya sama di fps berapa pun.
+    - Setiap `stride` titik grid baru (bukan per frame, jadi biayanya tidak ikut naik
+      di fps tinggi) jendela dinormalisasi dan dicocokkan.
+    - Lower bound LB_Keogh dihitung untuk SEMUA template sekaligus dengan satu operasi
+      vektor terhadap envelope yang dihitung sekali. DTW (dengan pita Sakoe-Chiba `band`)
+      hanya dijalankan untuk template yang lower bound-nya masih di bawah ambang dan
+      jarak terbaik sejauh ini, dan dihentikan lebih awal (early abandoning) begitu
+      seluruh baris melewati batas. Menambah template hanya menambah satu baris di
+      perhitungan lower bound yang murah.
+
+    Template cocok jika jarak DTW rata-rata per titik < `ratio` x energi template
+    (tangan diam tidak cocok dengan template mana pun). Seperti SPRING, kecocokan baru
+    dilaporkan setelah jarak terbaiknya tidak membaik selama `settle` detik, sehingga
+    gerakan yang baru setengah jalan tidak memicu aksi lebih awal lalu memicu lagi.
+    """
+
+    def __init__(self, templates=DEFAULT_TEMPLATES, duration=1.0, length=24, band=3, stride=2,
+                 ratio=0.35, settle=0.15, refractory=0.8):
+        self.duration = duration
+        self.length = length
+        self.band = band
+        self.stride = stride
+        self.ratio = ratio
+        self.settle = settle
+        self.refractory = refractory
+        self.step = duration / (length - 1)
+
+        self._ring = np.zeros((length, NUM_CHANNELS), dtype=np.float32)
+        self._pos = 0                   # slot ring berikutnya (= titik tertua)
+        self._active = False
+        self._start = 0.0               # waktu frame pertama sejak reset
+        self._next_tick = 0.0
+        self._new_points = 0
+        self._last_t = 0.0
+        self._last_f = [0.0] * NUM_CHANNELS
+        self._blocked_until = 0.0
+        self._pending = None            # kandidat cocok yang jaraknya masih bisa mengecil
+        self._pending_distance = 0.0
+        self._pending_time = 0.0
+        self._raw = np.zeros((length, NUM_CHANNELS), dtype=np.float32)
+        self.query = np.zeros((length, NUM_CHANNELS), dtype=np.float32)
+        # Buffer DTW: matriks biaya dan dua baris yang dipakai bergantian
+        self._cost = np.zeros((length, length), dtype=np.float32)
+        self._query_sq = np.zeros(length, dtype=np.float32)
+        self._inf_row = [math.inf] * (length + 1)
+        self._rows = ([math.inf] * (length + 1), [math.inf] * (length + 1))
+
+        self.names = []
+        self.templates = np.zeros((0, length, NUM_CHANNELS), dtype=np.float32)
+        self._templates_t = np.zeros((0, NUM_CHANNELS, length), dtype=np.float32)
+        self._templates_sq = np.zeros((0, length), dtype=np.float32)
+        self._upper = self.templates
+        self._lower = self.templates
+        self._limits = np.zeros(0, dtype=np.float32)
+        for name in templates:
+            self.add_template(name, _raw_template(name, length))
+
+        self.last_match = None
+        self.last_distance = None
+        self.evaluations = 0
+        self.dtw_runs = 0
+
+    def add_template(self, name, raw):
+        """Tambah template dari fitur mentah (N, 3) [x, y, ukuran]; di-resample ke `length` titik."""
+        raw = np.asarray(raw, dtype=np.float32)
+        if len(raw) != self.length:
+            src = np.linspace(0.0, 1.0, len(raw))
+            dst = np.linspace(0.0, 1.0, self.length)
+            raw = np.stack([np.interp(dst, src, raw[:, c]) for c in range(NUM_CHANNELS)], axis=1)
+        tpl = normalize_sequence(raw, np.zeros((self.length, NUM_CHANNELS), dtype=np.float32))
+        # Envelope LB_Keogh: min/max template di dalam pita +/- band
+        upper = np.empty_like(tpl)
+        lower = np.empty_like(tpl)
+        for i in range(self.length):
+            lo, hi = max(0, i - self.band), min(self.length, i + self.band + 1)
+            upper[i] = tpl[lo:hi].max(axis=0)
+            lower[i] = tpl[lo:hi].min(axis=0)
+        energy = float((tpl ** 2).sum(axis=1).mean())
+        self.names.append(name)
+        self.templates = np.concatenate([self.templates, tpl[None]])
+        self._templates_t = np.concatenate([self._templates_t, tpl.T[None]])
+        self._templates_sq = np.concatenate([self._templates_sq, (tpl ** 2).sum(axis=1)[None]])
+        self._upper = np.concatenate([self._upper, upper[None]])
+        self._lower = np.concatenate([self._lower, lower[None]])
+        # Batas jarak total (jumlah atas `length` titik) agar template dianggap cocok
+        self._limits = np.append(self._limits, np.float32(self.ratio * energy * self.length))
+
+    def reset(self):
+        self._active = False
+        self._pending = None
+
+    def update(self, landmarks, now):
+        """
+        Tambahkan satu frame (HandLandmarks) dan kembalikan nama template yang cocok
+        atau None. Panggil dengan landmarks tidak valid (atau reset()) saat tangan hilang.
+        """
+        if landmarks is None or not landmarks.valid:
+            self.reset()
+            return None
+        norm = landmarks.norm
+        f = (float(norm[8, 0]), float(norm[8, 1]),
+             math.hypot(norm[9, 0] - norm[0, 0], norm[9, 1] - norm[0, 1]))
+        if not self._active:
+            # Sebelum frame pertama jendela berisi nilai frame pertama (seperti np.interp)
+            self._ring[:] = f
+            self._active = True
+            self._start = self._next_tick = now
+            self._new_points = 0
+        elif now - self._next_tick > self.duration:
+            self._next_tick = now - self.duration   # Jeda panjang: titik yang lebih tua tidak terpakai
+        self._advance(now, f)
+
+        if now < self._blocked_until or self._new_points < self.stride:
+            return None
+        self._new_points = 0
+        name = self._evaluate(now)
+        if name is not None and (self._pending is None or self.last_distance < self._pending_distance):
+            # Kandidat baru atau lebih baik: tunggu sampai jaraknya berhenti mengecil
+            self._pending, self._pending_distance, self._pending_time = name, self.last_distance, now
+            return None
+        if self._pending is None or now - self._pending_time < self.settle:
+            return None
+        match = self._pending
+        self.reset()
+        self._blocked_until = now + self.refractory
+        return match
+
+    def _advance(self, now, f):
+        """Tulis setiap titik grid sampai `now` ke ring, diinterpolasi dari frame sebelumnya."""
+        last_t, last_f = self._last_t, self._last_f
+        span = now - last_t
+        ring = self._ring
+        while self._next_tick <= now:
+            a = (self._next_tick - last_t) / span if span > 0 else 1.0
+            ring[self._pos] = (last_f[0] + a * (f[0] - last_f[0]),
+                               last_f[1] + a * (f[1] - last_f[1]),
+                               last_f[2] + a * (f[2] - last_f[2]))
+            self._pos = (self._pos + 1) % self.length
+            self._next_tick += self.step
+            self._new_points += 1
+        self._last_t = now
+        self._last_f = f
+
+    def _evaluate(self, now):
+        if now - self._start < 0.8 * self.duration:
+            return None   # Riwayat belum cukup panjang
+        # Urutan kronologis isi ring: dua potongan, tanpa indeks
+        k = self.length - self._pos
+        self._raw[:k] = self._ring[self._pos:]
+        self._raw[k:] = self._ring[:self._pos]
+        q = normalize_sequence(self._raw, self.query)
+        self.evaluations += 1
+
+        # LB_Keogh untuk semua template sekaligus
+        excess = np.maximum(q[None] - self._upper, 0.0) + np.maximum(self._lower - q[None], 0.0)
+        lb = (excess ** 2).sum(axis=(1, 2))
+
+        best, best_name = np.inf, None
+        for t in np.argsort(lb):
+            limit = min(best, float(self._limits[t]))
+            if lb[t] >= limit:
+                continue
+            self.dtw_runs += 1
+            d = self._dtw(q, t, limit)
+            if d < limit:
+                best, best_name = d, self.names[t]
+        self.last_distance = best / self.length if best_name else None
+        self.last_match = best_name
+        return best_name
+
+    def _dtw(self, q, t, limit):
+        """DTW kuadrat jarak dengan pita Sakoe-Chiba; berhenti jika seluruh baris >= limit."""
+        n = self.length
+        band = self.band
+        # |q - t|^2 = |q|^2 + |t|^2 - 2 q.t, ke buffer yang dialokasikan sekali
+        cost = self._cost
+        np.dot(q, self._templates_t[t], out=cost)
+        cost *= -2.0
+        cost += self._templates_sq[t]
+        np.einsum('ij,ij->i', q, q, out=self._query_sq)
+        cost += self._query_sq[:, None]
+        cost = cost.tolist()
+        inf = math.inf
+        prev, cur = self._rows
+        prev[:] = self._inf_row
+        prev[0] = 0.0
+        for i in range(1, n + 1):
+            row = cost[i - 1]
+            lo, hi = max(1, i - band), min(n, i + band)
+            # Sel di luar pita yang dibaca baris ini dan baris berikutnya harus tak hingga
+            cur[lo - 1] = inf
+            if hi < n:
+                cur[hi + 1] = inf
+            row_min = inf
+            for j in range(lo, hi + 1):
+                best = prev[j - 1]
+                if prev[j] < best:
+                    best = prev[j]
+                if cur[j - 1] < best:
+                    best = cur[j - 1]
+                value = row[j - 1] + best
+                cur[j] = value
+                if value < row_min:
+                    row_min = value
+            if row_min >= limit:
+                return inf
+            prev, cur = cur, prev
+        return prev[n]
+
+    def stats(self):
+        return {
+            'evaluations': self.evaluations,
+            'dtw_runs': self.dtw_runs,
+            'templates': len(self.names),
+            'last_match': self.last_match,
+        }
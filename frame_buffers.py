@@ -0,0 +1,52 @@
+# File: frame_buffers.py
+
+import numpy as np
+
+
+class FrameBufferPool:
+    """
+    Kumpulan buffer frame bernama yang dialokasikan sekali dan dipakai ulang.
+
+    Buffer hanya dialokasikan ulang jika ukuran/dtype-nya berubah (misalnya resolusi
+    kamera berganti). Setiap alokasi dihitung di `allocations`, sehingga jumlah
+    alokasi per frame bisa dipantau: dalam kondisi normal nilainya harus 0.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buf
+            self.allocations += 1
+        return buf
+
+    def count_allocation(self, n=1):
+        """Catat alokasi yang terjadi di luar pool (misalnya PhotoImage baru di GUI)."""
+        self.allocations += n
+
+
+class AllocationMeter:
+    """Menghitung jumlah alokasi buffer per frame dari sebuah FrameBufferPool."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._start = pool.allocations
+        self.last = 0       # alokasi pada frame terakhir
+        self.total = 0      # total alokasi sejak meter dibuat
+        self.frames = 0
+
+    def begin(self):
+        self._start = self.pool.allocations
+
+    def end(self):
+        self.last = self.pool.allocations - self._start
+        self.total += self.last
+        self.frames += 1
+        return self.last
+
+    def per_frame(self):
+        return self.total / self.frames if self.frames else 0.0
@@ -0,0 +1,178 @@
+# File: frame_governor.py
+
+import os
+import time
+
+
+# Nilai default governor. Bisa ditimpa lewat argumen FrameRateGovernor(**config).
+GOVERNOR_DEFAULTS = {
+    'active_interval': 0.0,       # detik antar inferensi saat tangan terlihat (0 = setiap frame)
+    'throttled_interval': 0.066,  # detik antar inferensi saat beban terlalu tinggi (~15 fps)
+    'idle_probe_interval': 0.1,   # detik antar cek gerakan saat idle
+    'idle_infer_interval': 0.5,   # detik antar inferensi saat idle (untuk tangan yang diam)
+    'idle_after': 3.0,            # detik tanpa tangan & gerakan sebelum masuk idle
+    'motion_threshold': 0.02,     # fraksi piksel berubah yang dianggap gerakan
+    'frame_budget': 0.050,        # batas waktu inferensi rata-rata per frame (detik)
+    'cpu_budget': 0.85,           # batas pemakaian CPU proses (0..1 dari semua core)
+    'recover_ratio': 0.7,         # keluar dari throttled jika beban < budget * rasio ini
+    'ui_active_ms': 15,           # interval polling Tk saat aktif
+    'ui_idle_ms': 100,            # interval polling Tk saat idle
+}
+
+
+class FrameRateGovernor:
+    """
+    Penjadwal adaptif untuk loop inferensi dengan tiga state:
+
+    - idle      : tidak ada tangan. Hanya cek gerakan murah beberapa kali per detik dan
+                  inferensi sesekali.
+    - active    : ada tangan/gerakan. Inferensi dengan kecepatan penuh.
+    - throttled : waktu frame atau beban CPU melewati budget. Inferensi dibatasi sampai
+                  beban turun kembali.
+
+    Dengan `lossless` = True (sumber file/rekaman tanpa pacing realtime) governor tidak
+    pernah melewati frame, tidak tidur dan tetap di state active; metrik beban tetap dicatat.
+    """
+    IDLE = 'idle'
+    ACTIVE = 'active'
+    THROTTLED = 'throttled'
+
+    def __init__(self, lossless=False, **config):
+        unknown = set(config) - set(GOVERNOR_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Opsi governor tidak dikenal: {', '.join(sorted(unknown))}")
+        self.config = dict(GOVERNOR_DEFAULTS, **config)
+        self.lossless = lossless
+
+        now = time.monotonic()
+        self.state = self.ACTIVE
+        self.state_since = now
+        self.last_activity = now
+        self.last_infer = 0.0
+        self.last_probe = 0.0
+        self.frame_time_avg = 0.0
+        self.cpu_load = 0.0
+        self._cpu_wall = now
+        self._cpu_proc = time.process_time()
+        self._cpu_count = os.cpu_count() or 1
+
+        # Metrik
+        self.transitions = {}
+        self.last_transition = None   # (transisi, alasan) terakhir, untuk log status
+        self.time_in_state = {self.IDLE: 0.0, self.ACTIVE: 0.0, self.THROTTLED: 0.0}
+        self.inferences = 0
+        self.skipped = 0
+
+    # --- Keputusan per frame ---
+    def needs_probe(self, now=None):
+        """Apakah frame ini perlu dicek gerakannya (hanya relevan saat idle)."""
+        now = time.monotonic() if now is None else now
+        if self.lossless:
+            return False
+        return self.state == self.IDLE and now - self.last_probe >= self.config['idle_probe_interval']
+
+    def should_infer(self, now=None, motion=None):
+        """
+        Tentukan apakah MediaPipe perlu dijalankan untuk frame ini.
+        `motion` adalah skor MotionDetector jika frame ini sempat dicek.
+        """
+        now = time.monotonic() if now is None else now
+        if motion is not None:
+            self.last_probe = now
+            if motion >= self.config['motion_threshold']:
+                self.last_activity = now
+                if self.state == self.IDLE:
+                    self._set_state(self.ACTIVE, now, 'motion')
+
+        interval = self._infer_interval()
+        if self.lossless or now - self.last_infer >= interval:
+            self.last_infer = now
+            self.inferences += 1
+            return True
+        self.skipped += 1
+        return False
+
+    def update(self, hand_present, frame_time, now=None):
+        """Dipanggil setelah inferensi dengan hasil deteksi dan durasi inferensi (detik)."""
+        now = time.monotonic() if now is None else now
+        cfg = self.config
+        self.frame_time_avg += 0.1 * (frame_time - self.frame_time_avg)
+        self._update_cpu_load(now)
+
+        if hand_present:
+            self.last_activity = now
+            if self.state == self.IDLE:
+                self._set_state(self.ACTIVE, now, 'hand')
+        if self.lossless:
+            return
+
+        if self.state != self.IDLE and now - self.last_activity > cfg['idle_after']:
+            self._set_state(self.IDLE, now, 'no_hand')
+        elif self.state == self.ACTIVE and self._over_budget(1.0):
+            self._set_state(self.THROTTLED, now, 'over_budget')
+        elif self.state == self.THROTTLED and not self._over_budget(cfg['recover_ratio']):
+            self._set_state(self.ACTIVE, now, 'recovered')
+
+    def sleep_time(self, now=None):
+        """Berapa lama worker boleh tidur sebelum frame berikutnya perlu diperiksa."""
+        now = time.monotonic() if now is None else now
+        if self.lossless or self.state != self.IDLE:
+            return 0.0
+        next_probe = self.last_probe + self.config['idle_probe_interval']
+        return max(0.0, next_probe - now)
+
+    def ui_interval_ms(self):
+        return self.config['ui_idle_ms'] if self.state == self.IDLE else self.config['ui_active_ms']
+
+    # --- Internal ---
+    def _infer_interval(self):
+        if self.state == self.IDLE:
+            return self.config['idle_infer_interval']
+        if self.state == self.THROTTLED:
+            return self.config['throttled_interval']
+        return self.config['active_interval']
+
+    def _over_budget(self, ratio):
+        cfg = self.config
+        return (self.frame_time_avg > cfg['frame_budget'] * ratio
+                or self.cpu_load > cfg['cpu_budget'] * ratio)
+
+    def _update_cpu_load(self, now):
+        wall = now - self._cpu_wall
+        if wall < 0.5:
+            return
+        proc = time.process_time()
+        self.cpu_load = (proc - self._cpu_proc) / wall / self._cpu_count
+        self._cpu_wall, self._cpu_proc = now, proc
+
+    def _set_state(self, state, now, reason):
+        if state == self.state:
+            return
+        self.time_in_state[self.state] += now - self.state_since
+        key = f"{self.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        self.last_transition = (key, reason)
+        self.state = state
+        self.state_since = now
+
+    def status(self):
+        """State beserta alasan transisi terakhir untuk baris status, misalnya 'idle (no_hand)'."""
+        if self.last_transition is None:
+            return self.state
+        return f"{self.state} ({self.last_transition[1]})"
+
+    def metrics(self):
+        now = time.monotonic()
+        time_in_state = dict(self.time_in_state)
+        time_in_state[self.state] += now - self.state_since
+        return {
+            'state': self.state,
+            'frame_time_ms': self.frame_time_avg * 1000.0,
+            'cpu_load': self.cpu_load,
+            'inferences': self.inferences,
+            'skipped': self.skipped,
+            'transitions': dict(self.transitions),
+            'last_transition': self.last_transition,
+            'lossless': self.lossless,
+            'time_in_state': time_in_state,
+        }
@@ -0,0 +1,244 @@
+# File: frame_sources.py
+
+import os
+import time
+import cv2
+import numpy as np
+from camera_stream import CameraStream
+from landmark_trace import TraceReader, TRACE_EXTENSION
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+TRACE_EXTENSIONS = (TRACE_EXTENSION, '.npz')
+
+
+class _PacedSource:
+    """
+    Dasar untuk sumber berbasis file. Dengan realtime=True, read() menunggu sampai
+    waktu frame berikutnya sesuai timestamp/fps rekaman; dengan realtime=False frame
+    dikeluarkan secepat mungkin (untuk benchmark throughput).
+    """
+
+    provides_landmarks = False
+
+    def __init__(self, realtime=True, loop=False):
+        self.realtime = realtime
+        self.loop = loop
+        self.frames_read = 0
+        self._start_wall = None
+        self._start_ts = 0.0
+        self._opened = True
+
+    def _pace(self, ts):
+        """Tunggu hingga `ts` (detik sejak awal rekaman) jika mode realtime."""
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._start_wall is None:
+            self._start_wall, self._start_ts = now, ts
+            return
+        delay = (ts - self._start_ts) - (now - self._start_wall)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _restart_clock(self):
+        self._start_wall = None
+
+    def isOpened(self):
+        return self._opened
+
+    def stats(self):
+        return {'captured': self.frames_read, 'dropped': 0, 'consumed': self.frames_read}
+
+    def release(self):
+        self._opened = False
+
+
+class VideoFileSource(_PacedSource):
+    """Membaca frame dari file video (mp4, avi, ...)."""
+
+    def __init__(self, path, realtime=True, loop=False):
+        super().__init__(realtime, loop)
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self._opened = self.cap.isOpened()
+        self._frame = None
+
+    def read(self, timeout=None):
+        if not self._opened:
+            return False, None
+        success, frame = self.cap.read(self._frame)
+        if not success and self.loop and self.frames_read:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._restart_clock()
+            success, frame = self.cap.read(self._frame)
+        if not success:
+            self._opened = False
+            return False, None
+        self._frame = frame # Buffer yang sama dipakai ulang oleh read() berikutnya
+        self._pace(self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+        self.frames_read += 1
+        return True, frame
+
+    def release(self):
+        super().release()
+        self.cap.release()
+
+
+class ImageSequenceSource(_PacedSource):
+    """Membaca frame dari direktori berisi gambar berurutan (diurutkan menurut nama file)."""
+
+    def __init__(self, directory, fps=30.0, realtime=True, loop=False):
+        super().__init__(realtime, loop)
+        self.directory = directory
+        self.fps = fps
+        self.files = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        self._index = 0
+        self._opened = bool(self.files)
+
+    def read(self, timeout=None):
+        if not self._opened:
+            return False, None
+        if self._index >= len(self.files):
+            if not self.loop:
+                self._opened = False
+                return False, None
+            self._index = 0
+            self._restart_clock()
+        frame = cv2.imread(self.files[self._index])
+        self._pace(self._index / self.fps)
+        self._index += 1
+        if frame is None:
+            return False, None
+        self.frames_read += 1
+        return True, frame
+
+
+class LandmarkTraceSource(_PacedSource):
+    """
+    Memutar ulang landmark yang sudah direkam, tanpa gambar dan tanpa MediaPipe.
+
+    read() mengembalikan frame hitam berukuran tetap (dialokasikan sekali) agar kode
+    tampilan tetap berjalan; landmark frame tersebut tersedia di `record` (semua tangan
+    frame itu di record.hands). Pemanggil yang melihat provides_landmarks=True harus
+    memakai detector.findHandsFromTrace().
+
+    Format utama adalah .lmtrace (lihat landmark_trace.py, dibaca lewat memory-map).
+    Hanya indeks record pertama tiap frame yang disimpan; record dibaca dari memmap saat
+    frame-nya diputar, sehingga rekaman panjang tidak dimuat ke RAM. Untuk kompatibilitas, .npz dengan array timestamp (N,), landmarks (N, 21, 3),
+    handedness (N,) int8 (-1 tidak ada tangan, 0 Left, 1 Right) dan score (N,) juga diterima.
+    """
+
+    provides_landmarks = True
+
+    def __init__(self, path, width=640, height=480, realtime=True, loop=False):
+        super().__init__(realtime, loop)
+        self.path = path
+        if path.lower().endswith(TRACE_EXTENSION):
+            self.reader = TraceReader(path)
+            self._records = self.reader.records
+            self._starts = self.reader.frame_index()   # Record pertama tiap frame
+            self._data = None
+            count = len(self._starts)
+        else:
+            self.reader = None
+            self._records = None
+            data = np.load(path)
+            self._data = {
+                'timestamp': data['timestamp'].astype(np.float64),
+                'landmarks': data['landmarks'].astype(np.float32),
+                'handedness': data['handedness'].astype(np.int8),
+                'score': data['score'].astype(np.float32),
+            }
+            count = len(self._data['timestamp'])
+        self._count = count
+        self._first = self._timestamp(0) if count else 0.0
+        self._blank = np.zeros((height, width, 3), dtype=np.uint8)
+        self._index = 0
+        self._opened = count > 0
+        self.record = None
+
+    def __len__(self):
+        return self._count
+
+    def _timestamp(self, i):
+        if self._data is not None:
+            return float(self._data['timestamp'][i])
+        return float(self._records[self._starts[i]]['timestamp'])
+
+    def _frame(self, i):
+        """TraceRecord frame ke-i dengan semua tangannya (view ke memmap, tanpa salinan)."""
+        if self._data is not None:
+            data = self._data
+            handedness = int(data['handedness'][i])
+            return TraceRecord(float(data['timestamp'][i]), data['landmarks'][i], handedness, float(data['score'][i]))
+        start = self._starts[i]
+        end = self._starts[i + 1] if i + 1 < self._count else len(self._records)
+        rows = self._records[start:end]
+        first = rows[0]
+        if first['hand'] < 0:
+            return TraceRecord(float(first['timestamp']), first['landmarks'], -1, 0.0, int(first['label']), hands=())
+        hands = [(row['landmarks'], int(row['handedness']), float(row['score'])) for row in rows]
+        norm, handedness, score = hands[0]
+        return TraceRecord(float(first['timestamp']), norm, handedness, score, int(first['label']), hands)
+
+    def read(self, timeout=None):
+        if not self._opened:
+            return False, None
+        if self._index >= self._count:
+            if not self.loop:
+                self._opened = False
+                return False, None
+            self._index = 0
+            self._restart_clock()
+        i = self._index
+        self._index += 1
+        self._pace(self._timestamp(i) - self._first)
+        self.record = self._frame(i)
+        self.frames_read += 1
+        return True, self._blank
+
+    def release(self):
+        super().release()
+        if self.reader is not None:
+            self.reader.close()
+            self._records = None
+
+
+class TraceRecord:
+    """
+    Satu frame rekaman landmark: timestamp, norm (21, 3), handedness (-1/0/1), score, label
+    untuk tangan pertama, dan `hands` berisi (norm, handedness, score) setiap tangan di
+    frame itu (kosong jika tidak ada tangan).
+    """
+    __slots__ = ('timestamp', 'norm', 'handedness', 'score', 'label', 'hands')
+
+    def __init__(self, timestamp, norm, handedness, score, label=-1, hands=None):
+        self.timestamp = timestamp
+        self.norm = norm
+        self.handedness = handedness
+        self.score = score
+        self.label = label
+        if hands is None:
+            hands = [(norm, handedness, score)] if handedness >= 0 else ()
+        self.hands = hands
+
+
+def open_source(spec, width=640, height=480, realtime=True, loop=False):
+    """
+    Membuka sumber frame dari spesifikasi:
+    - int atau string angka   -> kamera live (CameraStream)
+    - direktori               -> urutan gambar
+    - file .lmtrace / .npz    -> rekaman landmark
+    - file lain               -> file video
+    Semua sumber punya read()/isOpened()/release()/stats() yang sama.
+    """
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraStream(int(spec), width, height).start()
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, realtime=realtime, loop=loop)
+    if spec.lower().endswith(TRACE_EXTENSIONS):
+        return LandmarkTraceSource(spec, width, height, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
@@ -0,0 +1,341 @@
+# File: gesture_classifier.py
+#
+# Klasifikasi gestur statis dengan model kecil (k-NN atau MLP NumPy) dari landmark ternormalisasi.
+# Data latih adalah rekaman .lmtrace berlabel, misalnya:
+#   python HandTrackingModule.py --record rock.lmtrace --label 0
+#   python HandTrackingModule.py --record call.lmtrace --label 1
+#   python gesture_classifier.py model.npz rock.lmtrace call.lmtrace --names rock,call_me --kind knn
+# Nama label bisa langsung dipakai sebagai pose di GestureEngine (play_pose='rock', dst.).
+
+import argparse
+import os
+import time
+import numpy as np
+
+from landmark_trace import TraceReader
+
+NUM_FEATURES = 21 * 3
+MODEL_KINDS = ('knn', 'mlp')
+# Skala tetap (rasio 4:3) dari koordinat ternormalisasi ke 'piksel' untuk fitur. Latih dan
+# prediksi sama-sama memakai norm x skala ini, bukan px yang bergantung pada ukuran frame,
+# sehingga sumber selain 4:3 tidak menghasilkan fitur dengan distorsi yang berbeda.
+FEATURE_SCALE = np.array([640, 480, 640], dtype=np.float32)
+# Penolakan open-set: tangan yang jaraknya ke centroid kelas pemenang lebih dari radius kelas
+# itu (persentil 95 jarak sampel latih x margin, minimal MIN_RADIUS) dianggap bukan kelas
+# mana pun. Satuan jarak adalah panjang pergelangan -> pangkal jari tengah.
+REJECT_MARGIN = 1.5
+MIN_RADIUS = 0.5
+
+
+def landmark_features(px, left_handed, out):
+    """
+    Ubah landmark piksel (B, 21, 3), yaitu norm x FEATURE_SCALE, menjadi vektor fitur (B, 63) yang tidak bergantung
+    pada posisi, skala, rotasi di bidang gambar, dan tangan kiri/kanan:
+    pergelangan di titik asal, arah pergelangan -> pangkal jari tengah diputar ke atas,
+    panjangnya dijadikan 1, dan tangan kiri di-mirror. `out` (B, 63) diisi in-place.
+    """
+    p = out.reshape(-1, 21, 3)
+    np.subtract(px, px[:, :1, :], out=p)
+    up = p[:, 9, :2]
+    scale = np.maximum(np.hypot(up[:, 0], up[:, 1]), 1e-6)
+    # Rotasi agar vektor 'up' menjadi (0, -1): cos = -uy / |u|, sin = -ux / |u|
+    cos = -up[:, 1] / scale
+    sin = -up[:, 0] / scale
+    x = p[:, :, 0].copy()
+    y = p[:, :, 1]
+    p[:, :, 0] = x * cos[:, None] - y * sin[:, None]
+    p[:, :, 1] = x * sin[:, None] + y * cos[:, None]
+    p /= scale[:, None, None]
+    p[left_handed, :, 0] *= -1
+    return out
+
+
+def class_bounds(features, labels, count):
+    """Centroid (count, 63) dan radius penerimaan (count,) per kelas dari data latih."""
+    centroids = np.zeros((count, NUM_FEATURES), dtype=np.float32)
+    radii = np.full(count, np.inf, dtype=np.float32)
+    for label in range(count):
+        sel = features[labels == label]
+        if not len(sel):
+            continue
+        centroids[label] = sel.mean(axis=0)
+        spread = np.linalg.norm(sel - centroids[label], axis=1)
+        radii[label] = max(MIN_RADIUS, REJECT_MARGIN * float(np.percentile(spread, 95)))
+    return centroids, radii
+
+
+def reject_outliers(proba, x, centroids, radii):
+    """Nolkan probabilitas baris yang terlalu jauh dari kelas pemenangnya (in-place)."""
+    best = proba.argmax(axis=1)
+    distance = np.linalg.norm(x - centroids[best], axis=1)
+    proba[distance > radii[best]] = 0.0
+    return proba
+
+
+class KNNModel:
+    """
+    k-NN dengan indeks yang dihitung sekali (fitur dan norma kuadratnya). Centroid dan
+    radius per kelas untuk penolakan open-set dihitung dari indeks yang sama.
+    """
+    kind = 'knn'
+
+    def __init__(self, features, labels, names, k=5):
+        self.features = np.ascontiguousarray(features, dtype=np.float32)
+        self.labels = np.asarray(labels, dtype=np.int32)
+        self.names = list(names)
+        self.k = min(k, len(self.labels))
+        self._sq = np.einsum('ij,ij->i', self.features, self.features)
+        self.centroids, self.radii = class_bounds(self.features, self.labels, len(self.names))
+
+    def predict_proba(self, x):
+        # |a - b|^2 = |a|^2 - 2 a.b + |b|^2, |a|^2 konstan per baris jadi tidak perlu
+        d = self._sq[None, :] - 2.0 * (x @ self.features.T)
+        nearest = np.argpartition(d, self.k - 1, axis=1)[:, :self.k]
+        votes = np.zeros((len(x), len(self.names)), dtype=np.float32)
+        np.add.at(votes, (np.arange(len(x))[:, None], self.labels[nearest]), 1.0)
+        votes /= self.k
+        return reject_outliers(votes, x, self.centroids, self.radii)
+
+    def arrays(self):
+        return {'features': self.features, 'labels': self.labels, 'k': np.int32(self.k)}
+
+    @classmethod
+    def from_arrays(cls, data, names):
+        return cls(data['features'], data['labels'], names, int(data['k']))
+
+    @classmethod
+    def train(cls, features, labels, names, k=5, max_per_class=300, seed=0):
+        """Indeks dibatasi max_per_class sampel per kelas agar biaya per frame tetap kecil."""
+        rng = np.random.default_rng(seed)
+        keep = []
+        for label in np.unique(labels):
+            idx = np.flatnonzero(labels == label)
+            if len(idx) > max_per_class:
+                idx = rng.choice(idx, max_per_class, replace=False)
+            keep.append(idx)
+        keep = np.concatenate(keep)
+        return cls(features[keep], labels[keep], names, k)
+
+
+class MLPModel:
+    """
+    MLP satu hidden layer (ReLU) + softmax, dilatih dengan Adam full-batch di NumPy.
+    Softmax selalu memilih salah satu kelas, jadi centroid dan radius kelas dari data
+    latih disimpan bersama bobot untuk penolakan open-set (model lama tanpa keduanya
+    tidak menolak apa pun).
+    """
+    kind = 'mlp'
+
+    def __init__(self, w1, b1, w2, b2, names, centroids=None, radii=None):
+        self.w1, self.b1, self.w2, self.b2 = (np.asarray(a, dtype=np.float32) for a in (w1, b1, w2, b2))
+        self.names = list(names)
+        self.centroids = centroids
+        self.radii = radii
+
+    def predict_proba(self, x):
+        h = np.maximum(x @ self.w1 + self.b1, 0.0)
+        z = h @ self.w2 + self.b2
+        z -= z.max(axis=1, keepdims=True)
+        np.exp(z, out=z)
+        z /= z.sum(axis=1, keepdims=True)
+        if self.centroids is not None:
+            reject_outliers(z, x, self.centroids, self.radii)
+        return z
+
+    def arrays(self):
+        arrays = {'w1': self.w1, 'b1': self.b1, 'w2': self.w2, 'b2': self.b2}
+        if self.centroids is not None:
+            arrays.update(centroids=self.centroids, radii=self.radii)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, data, names):
+        bounds = (data['centroids'], data['radii']) if 'centroids' in data.files else (None, None)
+        return cls(data['w1'], data['b1'], data['w2'], data['b2'], names, *bounds)
+
+    @classmethod
+    def train(cls, features, labels, names, hidden=32, epochs=400, lr=0.01, weight_decay=1e-4, seed=0):
+        rng = np.random.default_rng(seed)
+        n, d = features.shape
+        c = len(names)
+        params = [
+            rng.normal(0, np.sqrt(2.0 / d), (d, hidden)).astype(np.float32),
+            np.zeros(hidden, dtype=np.float32),
+            rng.normal(0, np.sqrt(2.0 / hidden), (hidden, c)).astype(np.float32),
+            np.zeros(c, dtype=np.float32),
+        ]
+        m = [np.zeros_like(p) for p in params]
+        v = [np.zeros_like(p) for p in params]
+        onehot = np.eye(c, dtype=np.float32)[labels]
+        x = features.astype(np.float32)
+        for step in range(1, epochs + 1):
+            w1, b1, w2, b2 = params
+            h_pre = x @ w1 + b1
+            h = np.maximum(h_pre, 0.0)
+            z = h @ w2 + b2
+            z -= z.max(axis=1, keepdims=True)
+            prob = np.exp(z)
+            prob /= prob.sum(axis=1, keepdims=True)
+            dz = (prob - onehot) / n
+            dh = (dz @ w2.T) * (h_pre > 0)
+            grads = [x.T @ dh + weight_decay * w1, dh.sum(axis=0),
+                     h.T @ dz + weight_decay * w2, dz.sum(axis=0)]
+            for p, g, mi, vi in zip(params, grads, m, v):
+                mi *= 0.9
+                mi += 0.1 * g
+                vi *= 0.999
+                vi += 0.001 * g * g
+                p -= lr * (mi / (1 - 0.9 ** step)) / (np.sqrt(vi / (1 - 0.999 ** step)) + 1e-8)
+        return cls(*params, names, *class_bounds(x, labels, c))
+
+
+MODEL_CLASSES = {cls.kind: cls for cls in (KNNModel, MLPModel)}
+
+
+def save_model(path, model):
+    np.savez(path, kind=model.kind, names=np.array(model.names), **model.arrays())
+
+
+_model_cache = {}
+
+
+def load_model(path):
+    """Muat model dari .npz. Hasil di-cache per path dan dimuat ulang jika file berubah."""
+    mtime = os.path.getmtime(path)
+    cached = _model_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with np.load(path, allow_pickle=False) as data:
+        kind = str(data['kind'])
+        if kind not in MODEL_CLASSES:
+            raise ValueError(f"{path}: jenis model tidak dikenal ({kind})")
+        model = MODEL_CLASSES[kind].from_arrays(data, [str(n) for n in data['names']])
+    _model_cache[path] = (mtime, model)
+    return model
+
+
+class GestureClassifier:
+    """
+    Klasifier gestur untuk dipakai per frame. Model dimuat saat prediksi pertama
+    (lazy) lewat load_model() yang di-cache. predict() menerima beberapa HandLandmarks
+    sekaligus (batch, misalnya semua tangan dari HandTracker) dan mengembalikan
+    (nama pose atau None, confidence) per tangan. Prediksi dengan confidence di bawah
+    `min_confidence` dikembalikan sebagai None sehingga engine memakai aturan jari biasa.
+    Default-nya di atas suara mayoritas minimum k-NN dua kelas (3/5 = 0.6), dan tangan
+    yang jauh dari semua kelas latih (open-set) selalu mendapat confidence 0.
+    """
+
+    def __init__(self, path, min_confidence=0.7, max_batch=4):
+        self.path = path
+        self.min_confidence = min_confidence
+        self._model = None
+        self._px = np.zeros((max_batch, 21, 3), dtype=np.float32)
+        self._left = np.zeros(max_batch, dtype=bool)
+        self._features = np.zeros((max_batch, NUM_FEATURES), dtype=np.float32)
+        self.predictions = 0
+        self.total_time = 0.0
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = load_model(self.path)
+        return self._model
+
+    @property
+    def names(self):
+        return self.model.names
+
+    def predict(self, hands):
+        t0 = time.perf_counter()
+        model = self.model
+        count = len(hands)
+        if count > len(self._px):
+            self._px = np.zeros((count, 21, 3), dtype=np.float32)
+            self._left = np.zeros(count, dtype=bool)
+            self._features = np.zeros((count, NUM_FEATURES), dtype=np.float32)
+        for i, hand in enumerate(hands):
+            np.multiply(hand.norm, FEATURE_SCALE, out=self._px[i])
+            self._left[i] = hand.handedness == 'Left'
+        features = landmark_features(self._px[:count], self._left[:count], self._features[:count])
+        proba = model.predict_proba(features)
+        best = proba.argmax(axis=1)
+        results = []
+        for i in range(count):
+            confidence = float(proba[i, best[i]])
+            name = model.names[best[i]] if confidence >= self.min_confidence else None
+            results.append((name, confidence))
+        self.predictions += count
+        self.total_time += time.perf_counter() - t0
+        return results
+
+    def predict_one(self, landmarks):
+        return self.predict((landmarks,))[0]
+
+    def stats(self):
+        return {
+            'predictions': self.predictions,
+            'mean_ms': self.total_time / self.predictions * 1000.0 if self.predictions else 0.0,
+        }
+
+
+def load_training_data(paths):
+    """Kumpulkan fitur dan label dari rekaman .lmtrace (hanya record bertangan dan berlabel)."""
+    feats, labels = [], []
+    for path in paths:
+        reader = TraceReader(path)
+        for chunk in reader.iter_chunks():
+            keep = (chunk['hand'] >= 0) & (chunk['label'] >= 0)
+            if not keep.any():
+                continue
+            rec = chunk[keep]
+            px = rec['landmarks'] * FEATURE_SCALE
+            out = np.zeros((len(rec), NUM_FEATURES), dtype=np.float32)
+            feats.append(landmark_features(px, rec['handedness'] == 0, out))
+            labels.append(rec['label'].astype(np.int32))
+        reader.close()
+    if not feats:
+        raise ValueError("Tidak ada record berlabel di rekaman yang diberikan")
+    return np.concatenate(feats), np.concatenate(labels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latih klasifier gestur dari rekaman .lmtrace berlabel")
+    parser.add_argument('output', help="File model keluaran (.npz)")
+    parser.add_argument('traces', nargs='+', help="Rekaman .lmtrace berlabel")
+    parser.add_argument('--names', required=True, help="Nama pose untuk label 0, 1, 2, ... dipisah koma")
+    parser.add_argument('--kind', choices=MODEL_KINDS, default='knn', help="Jenis model")
+    parser.add_argument('--k', type=int, default=5, help="Jumlah tetangga (k-NN)")
+    parser.add_argument('--hidden', type=int, default=32, help="Ukuran hidden layer (MLP)")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.names.split(',') if n.strip()]
+    features, labels = load_training_data(args.traces)
+    if labels.max() >= len(names):
+        raise SystemExit(f"Label {labels.max()} tidak punya nama (--names hanya {len(names)} nama)")
+
+    # Validasi sederhana: 20% sampel acak ditahan untuk mengukur akurasi
+    rng = np.random.default_rng(0)
+    order = rng.permutation(len(labels))
+    split = max(1, len(order) // 5)
+    test, train = order[:split], order[split:]
+    if args.kind == 'knn':
+        model = KNNModel.train(features[train], labels[train], names, k=args.k)
+    else:
+        model = MLPModel.train(features[train], labels[train], names, hidden=args.hidden)
+    proba = model.predict_proba(features[test])
+    accepted = proba.max(axis=1) > 0     # Sisanya ditolak sebagai open-set
+    accuracy = float(((proba.argmax(axis=1) == labels[test]) & accepted).mean())
+    print(f"{len(labels)} sampel, {len(names)} kelas, akurasi validasi {accuracy:.3f}"
+          f" (ditolak open-set {1.0 - float(accepted.mean()):.3f})")
+
+    # Model akhir dilatih dengan semua data
+    if args.kind == 'knn':
+        model = KNNModel.train(features, labels, names, k=args.k)
+    else:
+        model = MLPModel.train(features, labels, names, hidden=args.hidden)
+    save_model(args.output, model)
+    print(f"Model {args.kind} disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
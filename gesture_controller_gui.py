@@ -3,22 +3,18 @@
 import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-import cv2
 from PIL import Image, ImageTk
 import time
-import numpy as np
 
 # Impor semua modul yang dibutuhkan
 import HandTrackingModule as htm
-import pyautogui
-import pygame
-try:
-    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-    from ctypes import cast, POINTER
-    from comtypes import CLSCTX_ALL
-    PYCAW_AVAILABLE = True
-except (ImportError, OSError):
-    PYCAW_AVAILABLE = False
+from frame_sources import open_source
+from gesture_pipeline import GesturePipeline
+from frame_governor import FrameRateGovernor
+from landmark_filter import LandmarkFilter
+from gesture_engine import GestureEngine
+from action_backends import MediaKeyBackend, SoundFeedbackBackend
+from action_dispatcher import ActionDispatcher
 
 # Impor jendela manual
 from gesture_manual import ManualWindow
@@ -35,8 +31,6 @@ class GestureControllerApp:
         # --- Inisialisasi Logika dari windows_control.py ---
         self._initialize_logic()
 
-        self.is_assumed_playing = False # Asumsikan musik sedang tidak berjalan di awal
-
         # --- Buat Widget GUI ---
         self._create_widgets()
         
@@ -47,45 +41,28 @@ class GestureControllerApp:
 
     def _initialize_logic(self):
         """Inisialisasi semua variabel dan objek dari skrip logika."""
-        self.cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
-        self.cap.set(3, 640)
-        self.cap.set(4, 480)
+        # Capture berjalan di thread sendiri, GUI hanya mengambil frame terbaru.
+        # camera_index juga boleh berupa path video/direktori gambar/rekaman landmark.
+        self.cap = open_source(self.camera_index, 640, 480)
         
         self.detector = htm.handDetector(detectionCon=0.75, maxHands=1)
-
-        # Variabel Status
-        self.pTime = 0
-        self.last_action_time = 0
-        self.ACTION_COOLDOWN = 1.5
-        self.hand_center_x_history = []
-        self.SWIPE_THRESHOLD = 80
-        self.is_volume_mode = False
-        self.volume_mode_timeout = 0
-        self.VOLUME_MODE_DURATION = 4.0
-
-        # Inisialisasi Volume Control
-        self.volume_control_enabled = False
-        if PYCAW_AVAILABLE:
-            try:
-                devices = AudioUtilities.GetSpeakers()
-                interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-                self.volume = cast(interface, POINTER(IAudioEndpointVolume))
-                self.volRange = self.volume.GetVolumeRange()
-                self.minVol, self.maxVol = self.volRange[0], self.volRange[1]
-                self.volume_control_enabled = True
-            except Exception as e:
-                print(f"Gagal menginisialisasi Pycaw: {e}")
-
-        # Inisialisasi Suara
-        pygame.mixer.init()
-        try:
-            self.sound_volume = pygame.mixer.Sound("Sounds/sfx-1.wav")
-            self.sound_play_pause = pygame.mixer.Sound("Sounds/sfx-2.wav")
-            self.sound_next_prev = pygame.mixer.Sound("Sounds/sfx-3.wav")
-        except pygame.error:
-            class DummySound:
-                def play(self): pass
-            self.sound_volume = self.sound_play_pause = self.sound_next_prev = DummySound()
+        # Inferensi berjalan di thread worker, Tk hanya menerima hasil jadi.
+        # Governor menurunkan frekuensi inferensi saat tidak ada tangan di depan kamera.
+        self.governor = FrameRateGovernor()
+        # Landmark dihaluskan dan status jari di-voting sebelum sampai ke mesin gestur
+        self.landmark_filter = LandmarkFilter()
+        self.pipeline = GesturePipeline(self.cap, self.detector, governor=self.governor,
+                                        landmark_filter=self.landmark_filter).start()
+        self.STATS_REPORT_INTERVAL = 5.0
+        self.last_stats_report = 0
+        self.imgtk = None
+
+        # Logika gestur dan aksinya (tombol media + volume Windows, efek suara)
+        self.media = MediaKeyBackend(assume_playing=False) # Asumsikan musik sedang tidak berjalan di awal
+        self.sounds = SoundFeedbackBackend()
+        # Tombol media (PAUSE pyautogui), pycaw dan suara dijalankan di thread dispatcher, bukan di loop GUI
+        self.actions = ActionDispatcher([self.media, self.sounds]).start()
+        self.engine = GestureEngine(backends=[self.actions])
 
     def _create_widgets(self):
         """Membuat semua widget GUI."""
@@ -132,100 +109,70 @@ class GestureControllerApp:
         self.camera_label.pack(fill=BOTH, expand=True)
 
     def _update_frame_and_gestures(self):
-        """Metode ini menggantikan 'while True' dari skrip asli."""
-        success, img = self.cap.read()
-        if not success:
-            self.master.after(15, self._update_frame_and_gestures)
+        """
+        Metode ini menggantikan 'while True' dari skrip asli.
+        Hanya mengambil hasil inferensi terbaru dari pipeline, sehingga Tk tidak pernah
+        menunggu kamera maupun MediaPipe.
+        """
+        result = self.pipeline.poll()
+        if result is None:
+            self.master.after(self.pipeline.ui_interval_ms(), self._update_frame_and_gestures)
             return
 
-        img = cv2.flip(img, 1)
-        img_for_detection = img.copy() # Gunakan copy untuk deteksi agar gambar asli tidak dimodifikasi
-        action_text = ""
-        
-        img_for_detection = self.detector.findHands(img_for_detection)
-        lmList = self.detector.findPosition(img_for_detection, draw=False)
-
-        # --- Logika Gestur (hampir sama seperti windows_control.py) ---
-        current_time = time.time()
-       
-
-        if self.is_volume_mode and current_time > self.volume_mode_timeout:
-            self.is_volume_mode = False
-            action_text = "Volume Mode OFF"
-
-        if lmList:
-            fingers = self.detector.fingersUp()
-
-            print(f"Finger: {fingers}")
-            
-            # Deteksi jempol
-            thumbs_up = fingers == [1, 0, 0, 0, 0] and lmList[4][2] < lmList[2][2]
-            thumbs_down = fingers == [1, 0, 0, 0, 0] and lmList[4][2] > lmList[2][2]
-            
-            if self.is_volume_mode:
-                action_text = "VOL MODE"
-                if thumbs_up and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                    self.set_volume_percentage(self.get_current_volume_percentage() + 10)
-                    action_text = "Vol +10"
-                    self.sound_volume.play()
-                    self.last_action_time = current_time
-                    self.volume_mode_timeout = current_time + self.VOLUME_MODE_DURATION
-                elif thumbs_down and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                    self.set_volume_percentage(self.get_current_volume_percentage() - 10)
-                    action_text = "Vol -10"
-                    self.sound_volume.play()
-                    self.last_action_time = current_time
-                    self.volume_mode_timeout = current_time + self.VOLUME_MODE_DURATION
-            else:
-                if fingers == [0, 1, 1, 1, 0] and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                    self.is_volume_mode = True
-                    self.volume_mode_timeout = current_time + self.VOLUME_MODE_DURATION
-                    action_text = "Volume Mode ON"
-                    self.sound_volume.play()
-                    self.last_action_time = current_time
-                if fingers == [1, 1, 1, 1, 1] and not self.is_assumed_playing and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                        action_text = "PLAY"
-                        pyautogui.press('playpause')
-                        self.sound_play_pause.play()
-                        self.last_action_time = current_time
-                        self.is_assumed_playing = True # Update status internal
-                elif thumbs_down and self.is_assumed_playing and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                        action_text = "PAUSE"
-                        pyautogui.press('playpause')
-                        self.sound_play_pause.play()
-                        self.last_action_time = current_time
-                        self.is_assumed_playing = False # Update status internal
-                elif fingers == [0, 1, 1, 0, 0] and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                    # ... (logika swipe)
-                    hand_center_x = lmList[9][1]; self.hand_center_x_history.append(hand_center_x)
-                    if len(self.hand_center_x_history) > 10:
-                        dx = self.hand_center_x_history[-1] - self.hand_center_x_history[0]; key = None
-                        if dx > self.SWIPE_THRESHOLD: action_text, key = "NEXT TRACK", 'nexttrack'
-                        elif dx < -self.SWIPE_THRESHOLD: action_text, key = "PREV TRACK", 'prevtrack'
-                        if key: pyautogui.press(key); self.sound_next_prev.play(); self.last_action_time = current_time; self.hand_center_x_history.clear()
-                    if not action_text: action_text = "Ready to Swipe"
-                else: self.hand_center_x_history.clear()
+        t_gesture = time.perf_counter()
+        action_text = self._process_gestures(result.lmList, result.finger_code, result.stamp)
+        self.pipeline.timer.add('gesture', time.perf_counter() - t_gesture)
 
         # --- Update GUI ---
+        t_render = time.perf_counter()
         if action_text:
             self.recognized_gesture_var.set(action_text)
 
         # Update Volume Bar
-        if self.volume_control_enabled:
-            current_vol = self.get_current_volume_percentage()
-            self.volume_var.set(current_vol)
+        if self.media.volume_control_enabled:
+            self.volume_var.set(self.media.level)
 
         # Update Camera Feed
-        cv2image = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img_pil = Image.fromarray(cv2image)
-        imgtk = ImageTk.PhotoImage(image=img_pil)
+        self._render_frame(result.image)
 
-
-        self.camera_label.imgtk = imgtk
-        self.camera_label.configure(image=imgtk)
+        self.pipeline.timer.add('render', time.perf_counter() - t_render)
+        self._report_pipeline_stats()
 
         # Jadwalkan frame berikutnya
-        self.master.after(15, self._update_frame_and_gestures)
+        self.master.after(self.pipeline.ui_interval_ms(), self._update_frame_and_gestures)
+
+    def _render_frame(self, rgb):
+        """
+        Tampilkan frame RGB dari pipeline. Image.frombuffer tidak menyalin piksel dan
+        PhotoImage yang sama dipakai ulang lewat paste(), jadi tidak ada buffer baru per frame.
+        """
+        h, w = rgb.shape[:2]
+        img_pil = Image.frombuffer("RGB", (w, h), rgb, "raw", "RGB", 0, 1)
+        if self.imgtk is None or (self.imgtk.width(), self.imgtk.height()) != (w, h):
+            self.imgtk = ImageTk.PhotoImage(image=img_pil)
+            self.pipeline.buffers.count_allocation()
+            self.camera_label.imgtk = self.imgtk
+            self.camera_label.configure(image=self.imgtk)
+        else:
+            self.imgtk.paste(img_pil)
+
+    def _process_gestures(self, lmList, finger_code, stamp):
+        """
+        Tahap gestur: menerjemahkan landmark dan status jari menjadi aksi. Mengembalikan teks aksi.
+        Engine memakai waktu capture frame (`stamp`), bukan waktu callback Tk yang tertunda antrian.
+        """
+        return self.engine.update(finger_code, lmList.landmarks, stamp)
+
+    def _report_pipeline_stats(self):
+        """Cetak timing per tahap pipeline secara berkala."""
+        now = time.time()
+        if now - self.last_stats_report < self.STATS_REPORT_INTERVAL:
+            return
+        self.last_stats_report = now
+        capture = self.cap.stats()
+        print(f"Pipeline: {self.pipeline.timer.report()} | dropped {capture['dropped']}/{capture['captured']}"
+              f" | alloc/frame {self.pipeline.alloc_meter.per_frame():.2f} | governor {self.governor.status()}"
+              f" | {self.actions.report()}")
 
     def _open_manual_window(self):
         """Membuka jendela manual."""
@@ -234,18 +181,8 @@ class GestureControllerApp:
     def _on_closing(self):
         """Aksi sebelum jendela ditutup."""
         print("Menutup aplikasi utama...")
+        self.pipeline.stop()
         self.cap.release()
-        pygame.mixer.quit()
-        self.master.destroy()
-        
-    # --- Fungsi bantuan dari skrip asli ---
-    def get_current_volume_percentage(self):
-        if not self.volume_control_enabled: return 0
-        current_level = self.volume.GetMasterVolumeLevel()
-        return np.interp(current_level, [self.minVol, self.maxVol], [0, 100])
-
-    def set_volume_percentage(self, percentage):
-        if not self.volume_control_enabled: return
-        percentage = np.clip(percentage, 0, 100)
-        level = np.interp(percentage, [0, 100], [self.minVol, self.maxVol])
-        self.volume.SetMasterVolumeLevel(level, None)
\ No newline at end of file
+        self.actions.close()
+        self.sounds.close()
+        self.master.destroy()
\ No newline at end of file
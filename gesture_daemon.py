@@ -0,0 +1,260 @@
+# File: gesture_daemon.py
+#
+# Layanan headless: capture -> inferensi -> gestur -> aksi, tanpa Tk, tanpa preview dan
+# tanpa konversi tampilan. Cocok untuk mesin tanpa layar (systemd, container).
+# Contoh:
+#   python gesture_daemon.py --camera 0 --mode spotify
+#   python gesture_daemon.py --camera sesi.lmtrace --mode log --fast
+#
+# Semua opsi juga bisa diisi di bagian [Daemon] pada config.ini (CLI menang):
+#   [Daemon]
+#   camera = 0
+#   mode = windows
+#   hands = 2
+#   policy = largest
+#
+# Mode spotify memakai client_id/client_secret di bagian [Spotify]; untuk uji offline
+# tambahkan api_base = http://127.0.0.1:8900/v1/ dan access_token = mock (mock_spotify_server.py).
+
+import argparse
+import configparser
+import os
+import signal
+import threading
+import time
+
+import HandTrackingModule as htm
+from frame_sources import open_source
+from frame_governor import FrameRateGovernor
+from gesture_pipeline import GesturePipeline
+from landmark_filter import LandmarkFilter
+from gesture_engine import GestureEngine
+from action_dispatcher import ActionDispatcher
+from hand_tracker import HandTracker, MultiHandController, POLICIES, POLICY_FIRST
+
+
+MODES = ('windows', 'spotify', 'log')
+
+DAEMON_DEFAULTS = {
+    'camera': '0',              # indeks kamera, file video, direktori gambar, atau rekaman landmark
+    'mode': 'windows',          # windows = tombol media + pycaw, spotify = Web API, log = cetak event saja
+    'width': 640,
+    'height': 480,
+    'finger_method': 'position',
+    'model': '',                # model gestur terlatih (.npz), kosong = tabel pose
+    'hands': 1,
+    'policy': POLICY_FIRST,
+    'sounds': False,            # efek suara umpan balik (butuh perangkat audio)
+    'governor': True,           # turunkan frekuensi inferensi saat tidak ada tangan
+    'fast': False,              # sumber file diputar secepat mungkin
+    'stats_interval': 30.0,     # detik antar ringkasan statistik di log, 0 = mati
+}
+
+
+def load_config(path, overrides=None):
+    """
+    Gabungkan DAEMON_DEFAULTS, bagian [Daemon] config.ini (jika ada) dan `overrides`
+    (nilai None diabaikan). Tipe nilai mengikuti tipe default-nya.
+    """
+    config = dict(DAEMON_DEFAULTS)
+    values = {}
+    if path and os.path.exists(path):
+        parser = configparser.ConfigParser()
+        parser.read(path)
+        if parser.has_section('Daemon'):
+            values.update(parser['Daemon'])
+    values.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    unknown = set(values) - set(DAEMON_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Opsi daemon tidak dikenal: {', '.join(sorted(unknown))}")
+    for key, value in values.items():
+        default = DAEMON_DEFAULTS[key]
+        if isinstance(default, bool) and isinstance(value, str):
+            value = value.strip().lower() in ('1', 'true', 'yes', 'on')
+        elif not isinstance(default, str):
+            value = type(default)(value)
+        config[key] = value
+    if config['mode'] not in MODES:
+        raise ValueError(f"Mode tidak dikenal: {config['mode']} (pilihan: {', '.join(MODES)})")
+    if config['policy'] not in POLICIES:
+        raise ValueError(f"Kebijakan kontrol tidak dikenal: {config['policy']}")
+    return config
+
+
+SPOTIFY_OPTIONS = ('client_id', 'client_secret', 'api_base', 'access_token')
+
+
+def load_spotify_options(path):
+    """
+    Argumen SpotifyController dari bagian [Spotify] config.ini: client_id/client_secret
+    (disimpan oleh ModeSelectorApp), serta api_base/access_token opsional untuk
+    mengarahkan controller ke mock_spotify_server.py tanpa OAuth.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    if not parser.has_section('Spotify'):
+        return {}
+    return {key: parser['Spotify'][key] for key in SPOTIFY_OPTIONS if parser['Spotify'].get(key)}
+
+
+class GestureDaemon:
+    """
+    Loop gestur headless. Inferensi berjalan di worker GesturePipeline; thread utama
+    menunggu hasil dengan poll(timeout) lalu menjalankan mesin gestur, sehingga tidak
+    ada polling sibuk maupun rendering. stop() aman dipanggil dari signal handler.
+    """
+
+    def __init__(self, config, config_path='config.ini'):
+        self.config = config
+        self.config_path = config_path
+        self._stop = threading.Event()
+        self.spotify_client = None
+        self.sounds = None
+        self.actions = None
+        self.cap = None
+        self.pipeline = None
+        self.frames = 0
+        self.last_stats = 0.0
+
+    def _create_backends(self):
+        mode = self.config['mode']
+        if mode == 'windows':
+            from action_backends import MediaKeyBackend
+            backends = [MediaKeyBackend()]
+        elif mode == 'spotify':
+            from spotify_controller import SpotifyController
+            from action_backends import SpotifyBackend
+            options = load_spotify_options(self.config_path)
+            if not options.get('access_token') and not (options.get('client_id') and options.get('client_secret')):
+                raise ValueError(f"Client ID/Secret Spotify belum diisi di bagian [Spotify] {self.config_path}")
+            self.spotify_client = SpotifyController(**options)
+            if not self.spotify_client.start():
+                raise RuntimeError("Koneksi ke Spotify gagal")
+            backends = [SpotifyBackend(self.spotify_client)]
+        else:
+            from action_backends import LogBackend
+            backends = [LogBackend()]
+        if self.config['sounds']:
+            from action_backends import SoundFeedbackBackend
+            self.sounds = SoundFeedbackBackend()
+            backends.append(self.sounds)
+        return backends
+
+    def setup(self):
+        cfg = self.config
+        self.actions = ActionDispatcher(self._create_backends()).start()
+        classifier = None
+        if cfg['model']:
+            from gesture_classifier import GestureClassifier
+            classifier = GestureClassifier(cfg['model'])
+
+        self.cap = open_source(cfg['camera'], cfg['width'], cfg['height'], realtime=not cfg['fast'])
+        self.detector = htm.handDetector(detectionCon=0.75, maxHands=cfg['hands'], fingerMethod=cfg['finger_method'])
+        # Multi-tangan: setiap slot HandTracker punya filter sendiri; filter tunggal di pipeline
+        # akan mencampur dua tangan saat urutan tangan dari MediaPipe bertukar
+        self.landmark_filter = None if cfg['hands'] > 1 else LandmarkFilter()
+        self.governor = FrameRateGovernor() if cfg['governor'] else None
+        self.pipeline = GesturePipeline(self.cap, self.detector, governor=self.governor,
+                                        landmark_filter=self.landmark_filter)
+
+        def make_engine():
+            return GestureEngine(backends=[self.actions], classifier=classifier)
+
+        self.engine = make_engine()
+        self.controller = None
+        if cfg['hands'] > 1:
+            tracker = HandTracker(self.detector, cfg['hands'], filter_factory=LandmarkFilter)
+            self.controller = MultiHandController(tracker, make_engine, cfg['policy'], classifier)
+        return self
+
+    def run(self):
+        """Jalankan sampai stop() dipanggil (sinyal) atau sumber file habis."""
+        cfg = self.config
+        print(f"Gesture daemon berjalan: sumber {cfg['camera']}, mode {cfg['mode']}, {cfg['hands']} tangan")
+        self.pipeline.start()
+        try:
+            while not self._stop.is_set():
+                result = self.pipeline.poll(timeout=0.5)
+                if result is None:
+                    if self.pipeline.finished:
+                        print("Sumber frame habis.")
+                        break
+                    continue
+                t0 = time.perf_counter()
+                # Waktu frame dari pipeline (timestamp rekaman saat replay), bukan jam dinding
+                if self.controller is not None:
+                    self.controller.update(result.hands, result.stamp)
+                else:
+                    self.engine.update(result.finger_code, result.lmList.landmarks, result.stamp)
+                self.pipeline.timer.add('gesture', time.perf_counter() - t0)
+                self.frames += 1
+                self._report_stats()
+        finally:
+            self.close()
+
+    def _report_stats(self):
+        interval = self.config['stats_interval']
+        now = time.time()
+        if interval <= 0 or now - self.last_stats < interval:
+            return
+        self.last_stats = now
+        stats = self.pipeline.stats()
+        engines = self.controller.engines if self.controller is not None else (self.engine,)
+        events = sum(engine.events_emitted for engine in engines)
+        governor = f" | governor {self.governor.status()}" if self.governor is not None else ""
+        spotify = ""
+        if self.spotify_client is not None:
+            client = self.spotify_client.stats()
+            spotify = f" | spotify {client['latency_avg_ms']:.0f}ms antri {client['queue_depth']}/{client['max_queue_depth']}"
+        print(f"Pipeline: {self.pipeline.timer.report()} | frame {self.frames} | dropped {stats['results_dropped']}"
+              f" | events {events}{governor}{spotify} | {self.actions.report()}")
+
+    def stop(self, *args):
+        self._stop.set()
+
+    def close(self):
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        if self.cap is not None:
+            self.cap.release()
+        if self.actions is not None:
+            self.actions.close()
+        if self.spotify_client is not None:
+            self.spotify_client.stop()
+        if self.sounds is not None:
+            self.sounds.close()
+        print(f"Gesture daemon berhenti setelah {self.frames} frame.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kontrol musik dengan gestur tangan tanpa GUI")
+    parser.add_argument('--config', default='config.ini', help="File konfigurasi (bagian [Daemon] dan [Spotify])")
+    parser.add_argument('--camera', help="Indeks kamera, file video, direktori gambar, atau rekaman landmark")
+    parser.add_argument('--mode', choices=MODES, help="Backend aksi")
+    parser.add_argument('--finger-method', choices=('position', 'angle'))
+    parser.add_argument('--model', help="Model gestur terlatih (.npz dari gesture_classifier.py)")
+    parser.add_argument('--hands', type=int)
+    parser.add_argument('--policy', choices=POLICIES)
+    parser.add_argument('--sounds', action='store_true', default=None, help="Putar efek suara umpan balik")
+    parser.add_argument('--no-governor', dest='governor', action='store_false', default=None,
+                        help="Inferensi dengan kecepatan penuh walau tidak ada tangan")
+    parser.add_argument('--fast', action='store_true', default=None, help="Putar file secepat mungkin")
+    parser.add_argument('--stats-interval', type=float)
+    args = parser.parse_args()
+
+    overrides = {key: value for key, value in vars(args).items() if key != 'config'}
+    try:
+        config = load_config(args.config, overrides)
+        daemon = GestureDaemon(config, args.config).setup()
+    except (ValueError, RuntimeError) as e:
+        print(f"Gagal memulai daemon: {e}")
+        raise SystemExit(1)
+
+    # SIGINT (Ctrl+C) dan SIGTERM (systemd/docker stop) menghentikan loop dengan rapi
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    daemon.run()
+
+
+if __name__ == "__main__":
+    main()
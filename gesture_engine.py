@@ -0,0 +1,388 @@
+# File: gesture_engine.py
+
+import time
+from swipe_detector import SwipeDetector, RIGHT, UP
+import dynamic_gestures as dg
+
+
+# --- Jenis event yang dikirim ke action backend ---
+PLAY = 'play'
+PAUSE = 'pause'
+NEXT_TRACK = 'next_track'
+PREV_TRACK = 'prev_track'
+VOLUME_UP = 'volume_up'
+VOLUME_DOWN = 'volume_down'
+VOLUME_SET = 'volume_set'
+VOLUME_MODE_ON = 'volume_mode_on'
+VOLUME_MODE_OFF = 'volume_mode_off'
+SEEK_FORWARD = 'seek_forward'
+SEEK_BACKWARD = 'seek_backward'
+LIKE = 'like'
+SHUFFLE = 'shuffle'
+
+EVENT_TEXT = {
+    PLAY: "PLAY",
+    PAUSE: "PAUSE",
+    NEXT_TRACK: "NEXT TRACK",
+    PREV_TRACK: "PREV TRACK",
+    VOLUME_UP: "Vol +{value}",
+    VOLUME_DOWN: "Vol -{value}",
+    VOLUME_SET: "Vol {value}%",
+    VOLUME_MODE_ON: "Volume Mode ON",
+    VOLUME_MODE_OFF: "Volume Mode OFF",
+    SEEK_FORWARD: "SEEK +{value}s",
+    SEEK_BACKWARD: "SEEK -{value}s",
+    LIKE: "LIKE",
+    SHUFFLE: "SHUFFLE",
+}
+
+
+class GestureEvent:
+    """
+    Event hasil pengenalan gestur. `value` dipakai oleh event volume (besar langkah, atau
+    level absolut 0..100 untuk VOLUME_SET), event next/prev (jumlah lagu yang
+    dilewati, > 1 untuk swipe cepat) dan event seek (detik).
+    """
+    __slots__ = ('kind', 'value', 'timestamp')
+
+    def __init__(self, kind, value=None, timestamp=0.0):
+        self.kind = kind
+        self.value = value
+        self.timestamp = timestamp
+
+    @property
+    def text(self):
+        text = EVENT_TEXT[self.kind].format(value=self.value)
+        if self.kind in (NEXT_TRACK, PREV_TRACK) and self.value and self.value > 1:
+            text += f" x{self.value}"  # Skip cepat
+        return text
+
+    def __repr__(self):
+        return f"GestureEvent({self.kind!r}, {self.value!r})"
+
+
+# --- Definisi pose: status 5 jari [jempol, telunjuk, tengah, manis, kelingking] ---
+POSE_DEFINITIONS = {
+    'open_palm': (1, 1, 1, 1, 1),
+    'fist': (0, 0, 0, 0, 0),
+    'three': (0, 1, 1, 1, 0),
+    'peace': (0, 1, 1, 0, 0),
+    'thumb': (1, 0, 0, 0, 0),  # dipecah menjadi thumb_up/thumb_down dari posisi ujung jempol
+    'pinch': (1, 1, 0, 0, 0),  # jempol + telunjuk, jaraknya mengatur volume secara kontinu
+    'point': (0, 1, 0, 0, 0),  # telunjuk saja, mengaktifkan gestur dinamis (lingkaran, dorong, ketuk)
+}
+
+# Gestur dinamis (template dynamic_gestures) -> event. DOUBLE_TAP menjadi PLAY/PAUSE.
+DYNAMIC_ACTIONS = {
+    dg.CIRCLE_CW: SEEK_FORWARD,
+    dg.CIRCLE_CCW: SEEK_BACKWARD,
+    dg.PUSH: LIKE,
+    dg.PULL: SHUFFLE,
+    dg.DOUBLE_TAP: PLAY,
+}
+
+# Konfigurasi default yang dipakai bersama oleh semua front-end.
+DEFAULT_CONFIG = {
+    'action_cooldown': 0.6,         # detik antar aksi (status jari sudah distabilkan LandmarkFilter)
+    'volume_mode_duration': 4.0,    # detik mode volume tetap aktif sejak aksi terakhir
+    'volume_step': 10,              # persen per gestur jempol
+    'swipe_window': 0.4,            # detik riwayat posisi tangan yang dipakai fit kecepatan swipe
+    'swipe_distance': 0.12,         # perpindahan minimal (fraksi lebar/tinggi gambar) untuk swipe
+    'swipe_min_velocity': 0.5,      # kecepatan minimal (fraksi gambar per detik)
+    'swipe_fast_velocity': 2.0,     # di atas kecepatan ini swipe horizontal menjadi skip cepat
+    'fast_skip_tracks': 2,          # jumlah lagu yang dilewati oleh skip cepat
+    'swipe_vertical': True,         # swipe atas/bawah mengubah volume sebesar volume_step
+    'pinch_volume': True,           # di mode volume, jarak jempol-telunjuk mengatur volume kontinu
+    'pinch_min': 0.25,              # jarak jempol-telunjuk / ukuran tangan untuk volume 0%
+    'pinch_max': 1.1,               # jarak jempol-telunjuk / ukuran tangan untuk volume 100%
+    'pinch_smoothing': 0.3,         # faktor EMA untuk level volume pinch (1 = tanpa penghalusan)
+    'swipe_lock': True,             # setelah swipe, pose harus dilepas dulu sebelum swipe lagi
+    'dynamic_gestures': True,       # dengan pose telunjuk: lingkaran = seek, dorong/tarik = like/shuffle
+    'dynamic_duration': 1.0,        # detik riwayat yang dicocokkan dengan template gestur dinamis
+    'seek_seconds': 10,             # detik per gestur lingkaran
+    'volume_pose': 'three',
+    'play_pose': 'open_palm',
+    'pause_pose': 'thumb_down',
+    'swipe_pose': 'peace',
+    'pinch_pose': 'pinch',
+    'dynamic_pose': 'point',
+}
+
+
+NUM_FINGER_CODES = 32  # 2^5 kombinasi jari
+
+# Pasangan landmark untuk pinch: (ujung jempol, ujung telunjuk) dan (pergelangan, pangkal jari tengah)
+PINCH_FROM = (4, 0)
+PINCH_TO = (8, 9)
+
+
+def fingers_to_mask(fingers):
+    """
+    Ubah status jari menjadi bitmask 5-bit (bit 0 = jempol). Integer (hasil
+    handDetector.fingerState()) dikembalikan apa adanya; list dari fingersUp() dikonversi.
+    """
+    if isinstance(fingers, int):
+        return fingers
+    mask = 0
+    for i, up in enumerate(fingers):
+        if up:
+            mask |= 1 << i
+    return mask
+
+
+def compile_poses(definitions):
+    """
+    Kompilasi definisi pose sekali menjadi tabel dispatch 32 entri: indeks = bitmask
+    jari, isi = nama pose (None untuk kombinasi yang tidak dikenali).
+    """
+    table = [None] * NUM_FINGER_CODES
+    for name, fingers in definitions.items():
+        mask = fingers_to_mask(fingers)
+        if table[mask] is not None:
+            raise ValueError(f"Pose '{name}' dan '{table[mask]}' memakai kombinasi jari yang sama")
+        table[mask] = name
+    return tuple(table)
+
+
+class GestureEngine:
+    """
+    Mesin gestur tunggal untuk semua front-end (GUI Windows, GUI Spotify, spotify_control.py).
+
+    State eksplisit:
+    - idle        : menunggu gestur
+    - volume      : mode volume aktif, jempol atas/bawah mengubah volume
+    - swipe_armed : pose swipe terdeteksi, posisi tangan dikumpulkan untuk next/prev
+                    (pose telunjuk mengumpulkan lintasan untuk gestur dinamis dengan cara serupa)
+    - cooldown    : aksi baru saja dikirim, gestur lain diabaikan sampai cooldown selesai
+
+    Setiap aksi dikirim sebagai GestureEvent ke semua backend (objek dengan method
+    handle(event)). Backend pertama yang punya is_playing() dipakai untuk tahu status
+    pemutaran saat memilih antara PLAY dan PAUSE.
+    """
+    IDLE = 'idle'
+    VOLUME = 'volume'
+    SWIPE_ARMED = 'swipe_armed'
+    COOLDOWN = 'cooldown'
+
+    def __init__(self, backends=(), poses=None, classifier=None, **config):
+        unknown = set(config) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise ValueError(f"Opsi gestur tidak dikenal: {', '.join(sorted(unknown))}")
+        self.config = dict(DEFAULT_CONFIG, **config)
+        self.pose_table = compile_poses(poses or POSE_DEFINITIONS)
+        # Klasifier terlatih opsional (gesture_classifier.GestureClassifier); jika yakin,
+        # hasilnya menggantikan tabel pose sehingga pose kustom bisa dipakai di konfigurasi.
+        self.classifier = classifier
+        self.backends = []
+        self._tickers = []
+        for backend in backends:
+            self.add_backend(backend)
+        # Handler per pose untuk state idle, disusun sekali dari konfigurasi
+        cfg = self.config
+        self._idle_handlers = {
+            cfg['swipe_pose']: self._update_swipe,
+            cfg['volume_pose']: self._enter_volume_mode,
+            cfg['play_pose']: self._play,
+            cfg['pause_pose']: self._pause,
+        }
+        self.dynamic = None
+        if cfg['dynamic_gestures']:
+            self.dynamic = dg.DynamicGestureRecognizer(duration=cfg['dynamic_duration'])
+            self._idle_handlers[cfg['dynamic_pose']] = self._update_dynamic
+
+        self.state = self.IDLE
+        self.volume_mode = False
+        self.volume_mode_until = 0.0
+        self.cooldown_until = 0.0
+        self.swipe_locked = False
+        self.pinch_level = None
+        self.last_volume_set = None
+        self.swipe = SwipeDetector(window=cfg['swipe_window'], min_distance=cfg['swipe_distance'],
+                                   min_velocity=cfg['swipe_min_velocity'],
+                                   fast_velocity=cfg['swipe_fast_velocity'])
+        self.pose = None
+        self.status_text = ""
+        self.events_emitted = 0
+
+    def add_backend(self, backend):
+        self.backends.append(backend)
+        if hasattr(backend, 'tick'):
+            # Backend dengan pekerjaan tertunda (mis. penulisan volume yang di-rate-limit)
+            self._tickers.append(backend)
+
+    def is_playing(self):
+        for backend in self.backends:
+            if hasattr(backend, 'is_playing'):
+                return backend.is_playing()
+        return False
+
+    # --- Jalur utama per frame ---
+    def update(self, fingers, landmarks, now=None, pose=None):
+        """
+        Proses satu frame. `fingers` adalah kode 5-bit dari fingerState() (atau list
+        5 status jari dari fingersUp() untuk kompatibilitas), `landmarks` adalah
+        HandLandmarks (atau None jika tidak ada tangan). Mengembalikan teks status
+        untuk ditampilkan GUI ("" jika tidak ada perubahan). `pose` bisa diisi dengan
+        hasil klasifier yang sudah dihitung di luar (misalnya batch untuk banyak tangan).
+        """
+        now = time.time() if now is None else now
+        cfg = self.config
+        self.status_text = ""
+        for backend in self._tickers:
+            backend.tick(now)
+
+        if self.volume_mode and now > self.volume_mode_until:
+            self.volume_mode = False
+            self._emit(VOLUME_MODE_OFF, now=now)
+            if self.state == self.VOLUME:
+                self.state = self.IDLE
+        if self.state == self.COOLDOWN and now > self.cooldown_until:
+            self.state = self.VOLUME if self.volume_mode else self.IDLE
+
+        if landmarks is None or not landmarks.valid:
+            self.pose = None
+            self._reset_swipe()
+            if self.dynamic is not None:
+                self.dynamic.reset()
+            return self.status_text
+
+        self.pose = self._classify(fingers, landmarks, pose)
+
+        if self.pose != cfg['swipe_pose']:
+            self._reset_swipe()
+        if self.pose != cfg['dynamic_pose'] and self.dynamic is not None:
+            self.dynamic.reset()
+        if self.pose != cfg['pinch_pose']:
+            self.pinch_level = None
+            self.last_volume_set = None
+
+        if self.state == self.COOLDOWN:
+            if self.volume_mode:
+                self.status_text = "VOL MODE"
+            elif self.pose == cfg['swipe_pose'] and self.swipe_locked:
+                self.status_text = "Swipe Done"
+            return self.status_text
+
+        if self.state == self.VOLUME:
+            self._update_volume_mode(landmarks, now)
+        else:
+            self._update_idle(landmarks, now)
+        return self.status_text
+
+    def _classify(self, fingers, landmarks, pose=None):
+        if pose is None and self.classifier is not None:
+            pose = self.classifier.predict_one(landmarks)[0]
+        if pose is None:
+            pose = self.pose_table[fingers_to_mask(fingers)]
+        if pose == 'thumb':
+            # Ujung jempol (4) di atas pangkalnya (2) berarti jempol ke atas (Y OpenCV terbalik)
+            px = landmarks.px
+            pose = 'thumb_up' if px[4, 1] < px[2, 1] else 'thumb_down'
+        return pose
+
+    def _update_volume_mode(self, landmarks, now):
+        cfg = self.config
+        self.status_text = "VOL MODE"
+        if self.pose == cfg['pinch_pose'] and cfg['pinch_volume']:
+            self._update_pinch(landmarks, now)
+        elif self.pose == 'thumb_up':
+            self._action(VOLUME_UP, now, cfg['volume_step'])
+        elif self.pose == 'thumb_down':
+            self._action(VOLUME_DOWN, now, cfg['volume_step'])
+
+    def _update_pinch(self, landmarks, now):
+        """Volume kontinu dari jarak jempol-telunjuk, dinormalisasi dengan ukuran tangan."""
+        cfg = self.config
+        # Jarak ujung jempol (4) - ujung telunjuk (8) dan pergelangan (0) - pangkal jari tengah (9)
+        pinch, hand_size = landmarks.distances(PINCH_FROM, PINCH_TO)
+        ratio = pinch / max(hand_size, 1e-6)
+        target = (ratio - cfg['pinch_min']) / (cfg['pinch_max'] - cfg['pinch_min']) * 100.0
+        target = min(max(target, 0.0), 100.0)
+        if self.pinch_level is None:
+            self.pinch_level = target
+        else:
+            self.pinch_level += cfg['pinch_smoothing'] * (target - self.pinch_level)
+        # Mode volume tetap aktif selama pinch dipakai, tanpa cooldown
+        self.volume_mode_until = now + cfg['volume_mode_duration']
+        level = int(round(self.pinch_level))
+        if level != self.last_volume_set:
+            self.last_volume_set = level
+            self._emit(VOLUME_SET, level, now)
+        else:
+            self.status_text = EVENT_TEXT[VOLUME_SET].format(value=level)
+
+    def _update_idle(self, landmarks, now):
+        handler = self._idle_handlers.get(self.pose)
+        if handler is not None:
+            handler(landmarks, now)
+
+    def _enter_volume_mode(self, landmarks, now):
+        self.volume_mode = True
+        self._action(VOLUME_MODE_ON, now)
+
+    def _play(self, landmarks, now):
+        if not self.is_playing():
+            self._action(PLAY, now)
+
+    def _pause(self, landmarks, now):
+        if self.is_playing():
+            self._action(PAUSE, now)
+
+    def _update_dynamic(self, landmarks, now):
+        name = self.dynamic.update(landmarks, now)
+        kind = DYNAMIC_ACTIONS.get(name)
+        if kind is None:
+            self.status_text = "Ready to Draw"
+        elif kind == PLAY:
+            self._action(PAUSE if self.is_playing() else PLAY, now)
+        elif kind in (SEEK_FORWARD, SEEK_BACKWARD):
+            self._action(kind, now, self.config['seek_seconds'])
+        else:
+            self._action(kind, now)
+
+    def _update_swipe(self, landmarks, now):
+        cfg = self.config
+        if self.swipe_locked:
+            self.status_text = "Swipe Done"
+            return
+        self.state = self.SWIPE_ARMED
+        # Pusat tangan (pangkal jari tengah) dalam koordinat ternormalisasi
+        swipe = self.swipe.add(now, landmarks.norm[9, 0], landmarks.norm[9, 1])
+        if swipe is None:
+            self.status_text = "Ready to Swipe"
+            return
+        if swipe.horizontal:
+            skip = cfg['fast_skip_tracks'] if swipe.fast else 1
+            self._swipe_done(NEXT_TRACK if swipe.direction == RIGHT else PREV_TRACK, now, skip)
+        elif cfg['swipe_vertical']:
+            self._swipe_done(VOLUME_UP if swipe.direction == UP else VOLUME_DOWN, now, cfg['volume_step'])
+        else:
+            self.status_text = "Ready to Swipe"
+
+    def _swipe_done(self, kind, now, value=None):
+        self.swipe.reset()
+        self.swipe_locked = self.config['swipe_lock']
+        self._action(kind, now, value)
+
+    def _reset_swipe(self):
+        self.swipe.reset()
+        self.swipe_locked = False
+        if self.state == self.SWIPE_ARMED:
+            self.state = self.IDLE
+
+    # --- Pengiriman aksi ---
+    def _action(self, kind, now, value=None):
+        """Kirim aksi lalu masuk cooldown. Mode volume diperpanjang setiap ada aksi."""
+        self._emit(kind, value, now)
+        self.cooldown_until = now + self.config['action_cooldown']
+        self.state = self.COOLDOWN
+        if self.volume_mode:
+            self.volume_mode_until = now + self.config['volume_mode_duration']
+
+    def _emit(self, kind, value=None, now=0.0):
+        event = GestureEvent(kind, value, now)
+        self.status_text = event.text
+        self.events_emitted += 1
+        for backend in self.backends:
+            backend.handle(event)
+        return event
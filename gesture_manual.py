@@ -8,7 +8,7 @@ class ManualWindow(tk.Toplevel):
     def __init__(self, master):
         super().__init__(master)
         self.title("Manual Penggunaan Gestur")
-        self.geometry("500x600")
+        self.geometry("500x840")
 
         main_frame = ttk.Frame(self, padding=20)
         main_frame.pack(fill=BOTH, expand=True)
@@ -36,11 +36,22 @@ class ManualWindow(tk.Toplevel):
         - Volume Turun (-10):
           Saat mode volume aktif, arahkan jempol ke bawah.
 
+        - Atur Volume Langsung (Pinch):
+          Saat mode volume aktif, angkat jempol dan telunjuk lalu
+          atur jarak keduanya (rapat = pelan, lebar = keras).
+
         - Lagu Selanjutnya (Next):
           Gunakan gestur 'Peace' (V) dan geser ke kanan.
 
         - Lagu Sebelumnya (Previous):
           Gunakan gestur 'Peace' (V) dan geser ke kiri.
+
+        - Gestur Dinamis (angkat telunjuk saja):
+          Gambar lingkaran searah jarum jam = maju 10 detik,
+          berlawanan arah jarum jam = mundur 10 detik.
+          Dorong tangan ke kamera = Like (Spotify),
+          tarik menjauh = Shuffle (Spotify),
+          ketuk ke arah kamera dua kali = Play/Pause.
         """
         
         manual_text = ttk.Label(main_frame, text=text_content, justify=LEFT, font=("Helvetica", 11))
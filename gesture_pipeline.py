@@ -0,0 +1,268 @@
+# File: gesture_pipeline.py
+
+import threading
+import time
+from queue import Queue, Empty, Full
+import cv2
+from HandTrackingModule import HandLandmarks, LandmarkListView, MotionDetector, codeToFingers
+from frame_buffers import AllocationMeter
+
+
+class StageTimer:
+    """Mencatat durasi tiap tahap pipeline (rata-rata bergerak eksponensial, dalam ms)."""
+
+    def __init__(self, alpha=0.1):
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self.avg_ms = {}
+        self.max_ms = {}
+        self.counts = {}
+
+    def add(self, stage, seconds):
+        ms = seconds * 1000.0
+        with self._lock:
+            if stage not in self.avg_ms:
+                self.avg_ms[stage] = ms
+                self.max_ms[stage] = ms
+                self.counts[stage] = 0
+            else:
+                self.avg_ms[stage] += self.alpha * (ms - self.avg_ms[stage])
+                self.max_ms[stage] = max(self.max_ms[stage], ms)
+            self.counts[stage] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {stage: {'avg_ms': self.avg_ms[stage], 'max_ms': self.max_ms[stage], 'count': self.counts[stage]}
+                    for stage in self.avg_ms}
+
+    def report(self):
+        """String ringkas untuk dicetak ke konsol."""
+        snap = self.snapshot()
+        return " | ".join(f"{stage} {data['avg_ms']:.1f}ms" for stage, data in snap.items())
+
+    def reset_max(self):
+        with self._lock:
+            for stage in self.max_ms:
+                self.max_ms[stage] = self.avg_ms[stage]
+
+
+class FrameResult:
+    """
+    Hasil inferensi satu frame yang diserahkan dari worker ke thread GUI.
+    `image` adalah frame RGB yang sudah di-mirror, siap ditampilkan tanpa konversi lagi.
+    `finger_code` adalah kode 5-bit dari handDetector.fingerState() (None tanpa tangan).
+    `hands` berisi salinan HandLandmarks semua tangan yang terdeteksi (untuk HandTracker).
+    `stamp` adalah waktu frame yang dipakai filter landmark: timestamp asli untuk rekaman
+    landmark, capture_time untuk sumber lain. Mesin gestur sebaiknya memakai waktu yang sama
+    agar replay berperilaku seperti sesi aslinya.
+    """
+    __slots__ = ('frame_id', 'image', 'lmList', 'finger_code', 'capture_time', 'done_time', 'hands', 'stamp')
+
+    def __init__(self, frame_id, image, lmList, finger_code, capture_time, done_time, hands=(), stamp=None):
+        self.frame_id = frame_id
+        self.image = image
+        self.lmList = lmList
+        self.finger_code = finger_code
+        self.capture_time = capture_time
+        self.done_time = done_time
+        self.hands = hands
+        self.stamp = capture_time if stamp is None else stamp
+
+    @property
+    def fingers(self):
+        """List 5 status jari (format lama fingersUp()), dibuat hanya jika diminta."""
+        return codeToFingers(self.finger_code) if self.finger_code is not None else []
+
+
+class GesturePipeline:
+    """
+    Pipeline capture -> inferensi -> gestur -> render.
+
+    `cap` adalah sumber frame dari frame_sources.open_source() (kamera, video, urutan
+    gambar, atau rekaman landmark). Capture kamera berjalan di thread CameraStream,
+    inferensi MediaPipe berjalan di thread worker milik pipeline ini. Hasilnya diserahkan lewat antrian berukuran terbatas
+    (hanya hasil terbaru yang disimpan), sehingga event loop Tk cukup memanggil
+    poll() tanpa pernah menunggu kamera atau MediaPipe. Tahap gestur dan render
+    dijalankan oleh pemanggil poll() dan dicatat lewat timer.add().
+
+    Jika `governor` (FrameRateGovernor) diberikan, frekuensi inferensi diatur secara
+    adaptif: turun ke mode idle saat tidak ada tangan dan kembali penuh saat ada gerakan.
+    Untuk sumber file tanpa pacing realtime governor dipasang dalam mode lossless, sehingga
+    setiap frame tetap diinferensi dan diserahkan ke konsumen.
+
+    Jika `landmark_filter` (LandmarkFilter) diberikan, landmark dihaluskan dan status
+    jari distabilkan di worker sebelum hasil dikirim ke GUI.
+    """
+
+    def __init__(self, cap, detector, queue_size=1, governor=None, ui_interval_ms=15, landmark_filter=None):
+        self.cap = cap
+        self.detector = detector
+        self.governor = governor
+        self.landmark_filter = landmark_filter
+        self.motion = MotionDetector() if governor is not None else None
+        self._ui_interval_ms = ui_interval_ms
+        self.timer = StageTimer()
+        self._results = Queue(maxsize=queue_size)
+        self.results_dropped = 0
+        self.frames_processed = 0
+        # Landmark dan frame RGB tiap hasil ditulis ke ring slot yang dialokasikan sekali,
+        # karena data milik worker akan ditimpa oleh frame berikutnya.
+        # Jumlahnya cukup untuk: 1 sedang ditulis + isi antrian + 1 dipegang GUI.
+        self._num_slots = queue_size + 3
+        self._snapshots = [HandLandmarks() for _ in range(self._num_slots)]
+        # Detector multi-tangan: salinan semua tangan per slot (tangan pertama memakai _snapshots)
+        self._multi_hand = detector.maxHands > 1
+        self._hand_snapshots = [[HandLandmarks() for _ in range(detector.maxHands - 1)]
+                                for _ in range(self._num_slots)] if self._multi_hand else None
+        self._slot_idx = 0
+        # Pool buffer dibagi dengan detector agar semua alokasi frame tercatat di satu tempat
+        self.buffers = detector.buffers
+        self.alloc_meter = AllocationMeter(self.buffers)
+        # Sumber rekaman landmark (LandmarkTraceSource) melewati MediaPipe sepenuhnya
+        self.replay_landmarks = getattr(cap, 'provides_landmarks', False)
+        # File yang diputar tanpa pacing (realtime=False): setiap hasil harus sampai ke
+        # konsumen, jadi worker menunggu alih-alih membuang hasil lama
+        self.lossless = not getattr(cap, 'realtime', True)
+        if governor is not None and self.lossless:
+            governor.lossless = True    # Idle/throttle berbasis jam dinding tidak boleh melewati frame
+        self.finished = False
+        self.is_running = False
+        self._thread = None
+
+    def start(self):
+        if self.is_running:
+            return self
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.is_running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self):
+        """Loop worker: ambil frame terbaru, jalankan MediaPipe, kirim hasil ke GUI."""
+        governor = self.governor
+        while self.is_running:
+            if governor is not None:
+                wait = governor.sleep_time()
+                if wait > 0:
+                    time.sleep(min(wait, 0.1))
+                    continue
+
+            t0 = time.perf_counter()
+            success, frame = self.cap.read(timeout=0.1)
+            if not success:
+                if not self.cap.isOpened():
+                    self.finished = True # Sumber file/rekaman sudah habis
+                    break
+                continue
+            capture_time = time.time()
+            t1 = time.perf_counter()
+            self.timer.add('capture', t1 - t0)
+
+            if governor is not None:
+                motion = self.motion.score(frame) if governor.needs_probe() else None
+                if not governor.should_infer(motion=motion):
+                    continue
+                t1 = time.perf_counter()
+
+            self.alloc_meter.begin()
+            slot = self._slot_idx
+            self._slot_idx = (self._slot_idx + 1) % self._num_slots
+
+            # Satu konversi RGB dipakai bersama oleh MediaPipe dan tampilan GUI,
+            # mirror dilakukan in-place pada buffer yang sama.
+            rgb = self.buffers.get(f'display_{slot}', frame.shape)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+            cv2.flip(rgb, 1, dst=rgb)
+
+            if self.replay_landmarks:
+                self.detector.findHandsFromTrace(rgb, self.cap.record, draw=False)
+            else:
+                self.detector.findHands(rgb, draw=False, isRGB=True)
+            if self._multi_hand:
+                self.detector.findAllPositions(rgb)
+            else:
+                self.detector.findPosition(rgb, draw=False)
+            # Rekaman memakai timestamp aslinya agar dt filter dan gestur sama seperti saat direkam
+            stamp = float(self.cap.record.timestamp) if self.replay_landmarks else capture_time
+            if self.landmark_filter is not None:
+                finger_code = self.landmark_filter.apply(self.detector, stamp)
+            else:
+                finger_code = self.detector.fingerState()
+            lmList = LandmarkListView(self.detector.landmarks.copy_into(self._snapshots[slot]))
+            hands = (lmList.landmarks,) if lmList else ()
+            if self._multi_hand and self.detector.handCount > 1:
+                others = self.detector.allLandmarks[1:self.detector.handCount]
+                hands += tuple(hand.copy_into(snap) for hand, snap in zip(others, self._hand_snapshots[slot]))
+            t2 = time.perf_counter()
+            self.timer.add('inference', t2 - t1)
+            self.alloc_meter.end()
+            if governor is not None:
+                governor.update(bool(lmList), t2 - t1)
+
+            self.frames_processed += 1
+            self._publish(FrameResult(self.frames_processed, rgb, lmList, finger_code, capture_time, time.time(),
+                                      hands, stamp))
+
+    def _publish(self, result):
+        """Simpan hasil terbaru; jika GUI belum sempat mengambil hasil lama, buang hasil lama."""
+        if self.lossless:
+            while self.is_running:
+                try:
+                    self._results.put(result, timeout=0.1)
+                    return
+                except Full:
+                    continue
+            return
+        try:
+            self._results.put_nowait(result)
+        except Full:
+            try:
+                self._results.get_nowait()
+                self.results_dropped += 1
+            except Empty:
+                pass
+            self._results.put_nowait(result)
+
+    def poll(self, timeout=None):
+        """
+        Dipanggil dari thread GUI. Mengembalikan FrameResult terbaru atau None. Tanpa
+        `timeout` tidak memblokir; dengan `timeout` (detik) menunggu hasil berikutnya,
+        untuk konsumen tanpa event loop seperti gesture_daemon.py.
+        """
+        try:
+            if timeout is None:
+                return self._results.get_nowait()
+            return self._results.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def ui_interval_ms(self):
+        """Interval polling Tk yang disarankan (lebih jarang saat governor idle)."""
+        if self.governor is not None:
+            return self.governor.ui_interval_ms()
+        return self._ui_interval_ms
+
+    def stats(self):
+        """Ringkasan timing per tahap dan jumlah frame untuk ditampilkan/di-log."""
+        stats = {
+            'stages': self.timer.snapshot(),
+            'processed': self.frames_processed,
+            'results_dropped': self.results_dropped,
+            'allocs_last_frame': self.alloc_meter.last,
+            'allocs_per_frame': self.alloc_meter.per_frame(),
+        }
+        if self.governor is not None:
+            stats['governor'] = self.governor.metrics()
+        if self.detector.prefilter is not None:
+            stats['prefilter'] = self.detector.prefilter.stats()
+        if self.landmark_filter is not None:
+            stats['filter'] = self.landmark_filter.stats()
+        if hasattr(self.cap, 'stats'):
+            stats['capture'] = self.cap.stats()
+        return stats
@@ -0,0 +1,228 @@
+# File: hand_tracker.py
+
+import numpy as np
+
+from HandTrackingModule import HandLandmarks
+from landmark_trace import HANDEDNESS_CODES
+
+
+# Kebijakan tangan mana yang boleh mengendalikan musik
+POLICY_FIRST = 'first'      # tangan yang paling dulu terlihat, tetap memegang kontrol sampai hilang
+POLICY_LARGEST = 'largest'  # tangan terbesar (paling dekat ke kamera)
+POLICY_RIGHT = 'right'      # hanya tangan kanan (menurut MediaPipe)
+POLICY_LEFT = 'left'        # hanya tangan kiri
+POLICY_ALL = 'all'          # semua tangan boleh memicu aksi, masing-masing dengan state sendiri
+POLICIES = (POLICY_FIRST, POLICY_LARGEST, POLICY_RIGHT, POLICY_LEFT, POLICY_ALL)
+
+
+class HandTracker:
+    """
+    Pelacak beberapa tangan dengan ID stabil antar frame.
+
+    Setiap tangan menempati satu slot dari `max_hands` slot tetap. State per slot
+    disimpan sebagai array NumPy (ID, centroid, jumlah frame hilang, kode jari, ukuran
+    tangan, handedness, waktu pertama terlihat), sehingga biaya per frame linear
+    terhadap jumlah tangan. Deteksi baru dicocokkan ke track lama dengan nearest-centroid
+    (pasangan berjarak terdekat diambil lebih dulu) pada koordinat ternormalisasi.
+
+    Track yang tidak terlihat lebih dari `max_missing` frame dilepas; jika tangan itu
+    muncul lagi, ia mendapat ID baru.
+    """
+
+    def __init__(self, detector, max_hands=2, max_distance=0.25, max_missing=5, filter_factory=None):
+        self.detector = detector
+        self.max_hands = max_hands
+        self.max_distance = max_distance
+        self.max_missing = max_missing
+
+        self.ids = np.full(max_hands, -1, dtype=np.int32)       # -1 = slot kosong
+        self.centroids = np.zeros((max_hands, 2), dtype=np.float32)
+        self.missing = np.zeros(max_hands, dtype=np.int16)
+        self.codes = np.full(max_hands, -1, dtype=np.int16)     # kode jari 5-bit, -1 = tidak terlihat
+        self.sizes = np.zeros(max_hands, dtype=np.float32)      # ukuran tangan ternormalisasi
+        self.handedness = np.full(max_hands, -1, dtype=np.int8)  # -1 tidak diketahui, 0 Left, 1 Right
+        self.first_seen = np.zeros(max_hands, dtype=np.float64)
+        self.landmarks = [HandLandmarks() for _ in range(max_hands)]
+        self.filters = [filter_factory() for _ in range(max_hands)] if filter_factory else None
+
+        # Buffer kerja pencocokan
+        self._det_centroids = np.zeros((max_hands, 2), dtype=np.float32)
+        self._cost = np.zeros((max_hands, max_hands), dtype=np.float32)
+        self._matched = np.zeros(max_hands, dtype=bool)
+        self._next_id = 0
+        self.new_tracks = []    # slot yang baru mendapat ID pada update() terakhir
+
+    def active_slots(self):
+        return np.flatnonzero(self.ids >= 0)
+
+    def visible_slots(self):
+        return np.flatnonzero(self.codes >= 0)
+
+    def reset(self):
+        self.ids.fill(-1)
+        self.codes.fill(-1)
+        self.missing.fill(0)
+
+    def update(self, hands, now):
+        """
+        Perbarui track dari daftar HandLandmarks frame ini (misalnya
+        detector.allLandmarks[:detector.handCount]). Mengembalikan slot yang terlihat.
+        """
+        count = min(len(hands), self.max_hands)
+        for i in range(count):
+            self._det_centroids[i] = hands[i].norm[:, :2].mean(axis=0)
+
+        # Matriks jarak track x deteksi; slot kosong diberi biaya tak hingga
+        n = self.max_hands
+        cost = self._cost[:, :count]
+        diff = self.centroids[:, None, :] - self._det_centroids[None, :count, :]
+        np.hypot(diff[..., 0], diff[..., 1], out=cost)
+        cost[self.ids < 0] = np.inf
+        cost[cost > self.max_distance] = np.inf
+
+        assignment = [-1] * count
+        self._matched.fill(False)
+        for _ in range(min(n, count)):
+            flat = int(np.argmin(cost))
+            slot, det = divmod(flat, count)
+            if not np.isfinite(cost[slot, det]):
+                break
+            assignment[det] = slot
+            self._matched[slot] = True
+            cost[slot, :] = np.inf
+            cost[:, det] = np.inf
+
+        # Deteksi tanpa pasangan -> slot kosong dengan ID baru
+        self.new_tracks = []
+        for det in range(count):
+            if assignment[det] >= 0:
+                continue
+            free = np.flatnonzero((self.ids < 0) & ~self._matched)
+            if len(free) == 0:
+                break
+            slot = int(free[0])
+            self.ids[slot] = self._next_id
+            self._next_id += 1
+            self.first_seen[slot] = now
+            if self.filters is not None:
+                self.filters[slot].reset()
+            assignment[det] = slot
+            self._matched[slot] = True
+            self.new_tracks.append(slot)
+
+        # Salin landmark dan hitung kode jari per slot yang terlihat
+        for det in range(count):
+            slot = assignment[det]
+            if slot < 0:
+                continue
+            landmarks = hands[det].copy_into(self.landmarks[slot])
+            self.centroids[slot] = self._det_centroids[det]
+            self.missing[slot] = 0
+            self.handedness[slot] = HANDEDNESS_CODES.get(landmarks.handedness, -1)
+            n0 = landmarks.norm
+            self.sizes[slot] = np.hypot(n0[9, 0] - n0[0, 0], n0[9, 1] - n0[0, 1])
+            if self.filters is not None:
+                code = self.filters[slot].apply(self.detector, now, landmarks)
+            else:
+                code = self.detector.fingerState(landmarks=landmarks)
+            self.codes[slot] = code
+
+        # Track yang tidak terlihat frame ini
+        lost = (self.ids >= 0) & ~self._matched
+        self.codes[lost] = -1
+        self.missing[lost] += 1
+        for slot in np.flatnonzero(lost):
+            self.landmarks[slot].clear()
+        expired = lost & (self.missing > self.max_missing)
+        self.ids[expired] = -1
+        return self.visible_slots()
+
+
+class MultiHandController:
+    """
+    Satu GestureEngine per slot HandTracker, sehingga setiap tangan punya state, mode
+    volume dan cooldown sendiri. `policy` menentukan slot mana yang boleh mengirim aksi;
+    engine milik tangan lain tidak dijalankan (tangan tersebut tetap dilacak).
+
+    Jika `classifier` (GestureClassifier) diberikan, pose semua tangan yang dijalankan
+    diklasifikasi dalam satu batch per frame.
+    """
+
+    def __init__(self, tracker, engine_factory, policy=POLICY_FIRST, classifier=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Kebijakan kontrol tidak dikenal: {policy} (pilihan: {', '.join(POLICIES)})")
+        self.tracker = tracker
+        self.engine_factory = engine_factory
+        self.policy = policy
+        self.classifier = classifier
+        self.engines = [engine_factory() for _ in range(tracker.max_hands)]
+        self.owner = -1     # ID track pemegang kontrol (kebijakan selain 'all')
+
+    def update(self, hands, now):
+        """Perbarui tracker dan engine pemegang kontrol. Mengembalikan teks status."""
+        tracker = self.tracker
+        tracker.update(hands, now)
+        for slot in tracker.new_tracks:
+            self.engines[slot] = self.engine_factory()  # State baru untuk tangan baru
+
+        slots = self._controlling_slots()
+        poses = {}
+        if self.classifier is not None:
+            visible = [slot for slot in slots if tracker.codes[slot] >= 0]
+            if visible:
+                predictions = self.classifier.predict([tracker.landmarks[slot] for slot in visible])
+                poses = {slot: name for slot, (name, _) in zip(visible, predictions)}
+
+        texts = []
+        for slot in slots:
+            code = int(tracker.codes[slot])
+            landmarks = tracker.landmarks[slot]
+            text = self.engines[slot].update(code if code >= 0 else None, landmarks, now, poses.get(slot))
+            if text:
+                texts.append(text if self.policy != POLICY_ALL else f"#{tracker.ids[slot]} {text}")
+        return " | ".join(texts)
+
+    def _controlling_slots(self):
+        tracker = self.tracker
+        active = tracker.active_slots()
+        if len(active) == 0:
+            self.owner = -1
+            return ()
+        if self.policy == POLICY_ALL:
+            return active
+
+        # Pemilik lama tetap memegang kontrol selama track-nya masih hidup
+        slots = np.flatnonzero(tracker.ids == self.owner) if self.owner >= 0 else ()
+        if len(slots) and self.policy == POLICY_FIRST:
+            return slots[:1]
+
+        visible = active[tracker.codes[active] >= 0]
+        if self.policy == POLICY_FIRST:
+            candidates = visible
+            pick = candidates[np.argmin(tracker.first_seen[candidates])] if len(candidates) else -1
+        elif self.policy == POLICY_LARGEST:
+            candidates = visible
+            pick = candidates[np.argmax(tracker.sizes[candidates])] if len(candidates) else -1
+        else:
+            wanted = HANDEDNESS_CODES['Right' if self.policy == POLICY_RIGHT else 'Left']
+            candidates = visible[tracker.handedness[visible] == wanted]
+            pick = candidates[np.argmin(tracker.first_seen[candidates])] if len(candidates) else -1
+
+        if pick < 0:
+            # Tidak ada kandidat terlihat: pemilik lama (jika masih dilacak) tetap menerima update kosong
+            return slots[:1] if len(slots) else ()
+        self.owner = int(tracker.ids[pick])
+        return (int(pick),)
+
+    def owner_engine(self):
+        slots = np.flatnonzero(self.tracker.ids == self.owner) if self.owner >= 0 else ()
+        return self.engines[slots[0]] if len(slots) else None
+
+    def stats(self):
+        tracker = self.tracker
+        return {
+            'tracks': int((tracker.ids >= 0).sum()),
+            'visible': int((tracker.codes >= 0).sum()),
+            'owner': self.owner,
+            'next_id': tracker._next_id,
+        }
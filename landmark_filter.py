@@ -0,0 +1,194 @@
+# File: landmark_filter.py
+
+import math
+import numpy as np
+
+from HandTrackingModule import NUM_LANDMARKS, FINGER_BITS
+
+
+# Nilai default filter. Bisa ditimpa lewat argumen LandmarkFilter(**config).
+FILTER_DEFAULTS = {
+    'min_cutoff': 1.5,    # Hz, cutoff saat tangan diam (makin kecil makin halus, makin lambat)
+    'beta': 8.0,          # kenaikan cutoff per satuan kecepatan (koordinat ternormalisasi/detik)
+    'd_cutoff': 1.0,      # Hz, cutoff untuk estimasi kecepatan
+    'vote_window': 5,     # M: jumlah frame terakhir yang dipakai voting status jari
+    'vote_threshold': 4,  # N: jumlah suara minimal untuk mengubah status jari (hysteresis)
+}
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    Filter One-Euro (Casiez dkk.) yang divektorisasi untuk array berukuran tetap.
+    Saat gerakan lambat cutoff rendah (jitter diredam), saat gerakan cepat cutoff naik
+    (lag kecil). Semua state dan buffer sementara dialokasikan sekali.
+    """
+
+    def __init__(self, shape, min_cutoff=1.5, beta=8.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._x = np.zeros(shape, dtype=np.float32)
+        self._dx = np.zeros(shape, dtype=np.float32)
+        self._tmp = np.zeros(shape, dtype=np.float32)
+        self._alpha = np.zeros(shape, dtype=np.float32)
+        self._last_time = None
+
+    def reset(self):
+        self._last_time = None
+
+    def apply(self, x, now):
+        """Filter `x` secara in-place. `now` adalah timestamp frame dalam detik."""
+        if self._last_time is None:
+            # Frame pertama: mulai dari nilai mentah
+            np.copyto(self._x, x)
+            self._dx.fill(0.0)
+            self._last_time = now
+            return x
+        dt = now - self._last_time
+        if dt <= 0:
+            # Timestamp tidak maju (frame duplikat): pakai estimasi terakhir
+            np.copyto(x, self._x)
+            return x
+        self._last_time = now
+
+        # Kecepatan yang dihaluskan: dx = lerp(dx, (x - x_prev) / dt, alpha_d)
+        tmp = self._tmp
+        np.subtract(x, self._x, out=tmp)
+        tmp *= 1.0 / dt
+        tmp -= self._dx
+        tmp *= _alpha(self.d_cutoff, dt)
+        self._dx += tmp
+
+        # alpha per koordinat dari cutoff = min_cutoff + beta * |dx|
+        a = self._alpha
+        np.abs(self._dx, out=a)
+        a *= self.beta
+        a += self.min_cutoff
+        # alpha = 1 / (1 + tau / dt), tau = 1 / (2 pi cutoff)  ->  alpha = 1 / (1 + 1 / (2 pi cutoff dt))
+        a *= 2.0 * math.pi * dt
+        np.reciprocal(a, out=a)
+        a += 1.0
+        np.reciprocal(a, out=a)
+
+        # x_hat = lerp(x_hat, x, alpha)
+        np.subtract(x, self._x, out=tmp)
+        tmp *= a
+        self._x += tmp
+        np.copyto(x, self._x)
+        return x
+
+
+class FingerVoter:
+    """
+    Voting N-dari-M dengan hysteresis untuk status 5 jari. Status jari hanya berubah
+    jika setidaknya `threshold` dari `window` frame terakhir setuju dengan status baru,
+    sehingga satu frame yang salah tidak bisa memicu aksi. Riwayat disimpan di ring
+    buffer uint8 (window, 5) dan jumlah suara diperbarui inkremental.
+    """
+
+    def __init__(self, window=5, threshold=4):
+        if not 0 < threshold <= window:
+            raise ValueError("threshold harus di antara 1 dan window")
+        self.window = window
+        self.threshold = threshold
+        self._history = np.zeros((window, 5), dtype=np.uint8)
+        self._votes = np.zeros(5, dtype=np.int16)   # jumlah frame 'naik' di dalam window
+        self._state = np.zeros(5, dtype=np.uint8)
+        self._bits = np.zeros(5, dtype=np.uint8)
+        self._shifts = np.arange(5, dtype=np.uint8)
+        self._up = np.zeros(5, dtype=bool)
+        self._down = np.zeros(5, dtype=bool)
+        self._idx = 0
+        self._filled = 0
+        self.code = None
+
+    def reset(self):
+        self._history.fill(0)
+        self._votes.fill(0)
+        self._idx = 0
+        self._filled = 0
+        self.code = None
+
+    def update(self, code):
+        """Tambahkan kode 5-bit mentah, kembalikan kode 5-bit yang sudah distabilkan."""
+        if code is None:
+            self.reset()
+            return None
+        bits = self._bits
+        np.right_shift(code, self._shifts, out=bits, casting='unsafe')
+        bits &= 1
+        slot = self._history[self._idx]
+        self._votes -= slot
+        slot[:] = bits
+        self._votes += bits
+        self._idx = (self._idx + 1) % self.window
+
+        if self._filled < self.window:
+            self._filled += 1
+            if self.code is None:
+                # Tangan baru muncul: pakai status mentah sebagai titik awal
+                np.copyto(self._state, bits)
+        if self.code is not None:
+            # Naik jika >= threshold suara 'naik', turun jika >= threshold suara 'turun'
+            np.greater_equal(self._votes, self.threshold, out=self._up)
+            np.less_equal(self._votes, self._filled - self.threshold, out=self._down)
+            np.copyto(self._state, 1, where=self._up)
+            np.copyto(self._state, 0, where=self._down)
+        self.code = int(self._state @ FINGER_BITS)
+        return self.code
+
+
+class LandmarkFilter:
+    """
+    Tahap penyaring antara findPosition() dan klasifikasi gestur:
+    landmark dihaluskan dengan One-Euro (in-place pada HandLandmarks), lalu kode jari
+    distabilkan dengan FingerVoter. State direset saat tangan hilang.
+
+    Pemakaian:
+        detector.findPosition(img, draw=False)
+        code = landmark_filter.apply(detector, timestamp)
+    """
+
+    def __init__(self, **config):
+        unknown = set(config) - set(FILTER_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Opsi filter tidak dikenal: {', '.join(sorted(unknown))}")
+        self.config = dict(FILTER_DEFAULTS, **config)
+        cfg = self.config
+        self.smoother = OneEuroFilter((NUM_LANDMARKS, 3), cfg['min_cutoff'], cfg['beta'], cfg['d_cutoff'])
+        self.voter = FingerVoter(cfg['vote_window'], cfg['vote_threshold'])
+        self.raw_code = None
+        self.frames = 0
+        self.flips_suppressed = 0
+
+    def reset(self):
+        self.smoother.reset()
+        self.voter.reset()
+        self.raw_code = None
+
+    def apply(self, detector, now, landmarks=None):
+        """
+        Haluskan detector.landmarks (atau `landmarks` jika diberikan, untuk tangan lain)
+        dan kembalikan kode jari stabil (None tanpa tangan).
+        """
+        landmarks = detector.landmarks if landmarks is None else landmarks
+        if not landmarks.valid:
+            self.reset()
+            return None
+        self.smoother.apply(landmarks.norm, now)
+        landmarks.syncPixels()
+        previous = self.voter.code
+        self.raw_code = detector.fingerState(landmarks=landmarks)
+        code = self.voter.update(self.raw_code)
+        self.frames += 1
+        if previous is not None and self.raw_code != previous and code == previous:
+            self.flips_suppressed += 1
+        return code
+
+    def stats(self):
+        return {'frames': self.frames, 'flips_suppressed': self.flips_suppressed}
@@ -0,0 +1,124 @@
+# File: landmark_trace.py
+
+import os
+import struct
+import numpy as np
+
+
+# Format file rekaman landmark (.lmtrace):
+#   header 16 byte : magic (8 byte) | versi (uint16) | ukuran header (uint16) | ukuran record (uint32)
+#   record         : RECORD_DTYPE berukuran tetap, ditulis berurutan (append-only)
+# Karena ukuran record tetap, file bisa langsung di-memory-map sebagai array NumPy.
+TRACE_MAGIC = b'LMTRACE\x00'
+TRACE_VERSION = 1
+HEADER_FORMAT = '<8sHHI'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+TRACE_EXTENSION = '.lmtrace'
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),             # detik (time.time()) saat frame diproses
+    ('frame', '<u4'),                 # nomor frame
+    ('hand', 'i1'),                   # indeks tangan dalam frame, -1 = tidak ada tangan
+    ('handedness', 'i1'),             # -1 tidak diketahui, 0 Left, 1 Right
+    ('label', '<i2'),                 # label gestur opsional (data latih), -1 = tanpa label
+    ('score', '<f4'),                 # skor kepercayaan handedness
+    ('landmarks', '<f4', (21, 3)),    # koordinat ternormalisasi x, y, z
+])
+
+HANDEDNESS_CODES = {'Left': 0, 'Right': 1}
+
+
+class TraceWriter:
+    """Menulis record landmark ke file .lmtrace secara append-only."""
+
+    def __init__(self, path, label=-1):
+        self.path = path
+        self.label = label
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            _read_header(path)  # Pastikan formatnya cocok sebelum menambah record
+        self._file = open(path, 'ab')
+        if not exists:
+            self._file.write(struct.pack(HEADER_FORMAT, TRACE_MAGIC, TRACE_VERSION, HEADER_SIZE, RECORD_DTYPE.itemsize))
+        # Satu record yang dipakai ulang, tidak ada alokasi per frame
+        self._record = np.zeros(1, dtype=RECORD_DTYPE)
+        self.records_written = 0
+
+    def write(self, timestamp, frame, norm=None, handedness=-1, score=0.0, hand=0):
+        """Tulis satu record. norm=None berarti frame tanpa tangan (hand diset -1)."""
+        rec = self._record[0]
+        rec['timestamp'] = timestamp
+        rec['frame'] = frame
+        rec['label'] = self.label
+        if norm is None:
+            rec['hand'] = -1
+            rec['handedness'] = -1
+            rec['score'] = 0.0
+            rec['landmarks'] = 0.0
+        else:
+            rec['hand'] = hand
+            rec['handedness'] = handedness
+            rec['score'] = score
+            rec['landmarks'] = norm
+        self._file.write(self._record.data)
+        self.records_written += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class TraceReader:
+    """
+    Membaca file .lmtrace lewat memory-map. `records` adalah array terstruktur
+    RECORD_DTYPE; kolom bisa diakses langsung, misalnya reader.records['landmarks'].
+    """
+
+    def __init__(self, path):
+        self.path = path
+        _read_header(path)
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        # Record terakhir yang terpotong (misalnya program mati saat menulis) diabaikan
+        if count > 0:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def arrays(self):
+        """Semua kolom sebagai dict array (view ke memmap, tanpa salinan)."""
+        return {name: self.records[name] for name in RECORD_DTYPE.names}
+
+    def iter_chunks(self, chunk_size=4096):
+        """Streaming record per blok agar rekaman berjam-jam tidak perlu dimuat sekaligus."""
+        for start in range(0, len(self.records), chunk_size):
+            yield self.records[start:start + chunk_size]
+
+    def frame_index(self):
+        """Indeks record pertama tiap frame (tangan pertama atau record tanpa tangan)."""
+        return np.flatnonzero(self.records['hand'] <= 0)
+
+    def close(self):
+        """
+        Lepaskan referensi reader ke memmap. View dari arrays()/iter_chunks() tetap valid;
+        file baru di-unmap setelah view terakhir tidak dipakai lagi.
+        """
+        self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+
+def _read_header(path):
+    with open(path, 'rb') as f:
+        data = f.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"{path}: bukan file rekaman landmark (header terlalu pendek)")
+    magic, version, header_size, record_size = struct.unpack(HEADER_FORMAT, data)
+    if magic != TRACE_MAGIC:
+        raise ValueError(f"{path}: bukan file rekaman landmark")
+    if version != TRACE_VERSION or header_size != HEADER_SIZE or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: versi rekaman tidak didukung (v{version}, record {record_size} byte)")
+    return version
@@ -0,0 +1,263 @@
+# File: mock_spotify_server.py
+#
+# Server tiruan Spotify Web API untuk uji beban dan latensi tanpa kredensial, OAuth
+# maupun internet. Hanya endpoint yang dipakai SpotifyController yang diimplementasikan.
+# Contoh:
+#   python mock_spotify_server.py --port 8900 --latency 80 --jitter 40 --error-rate 0.05 --rate-limit 5
+# lalu arahkan controller ke sana:
+#   SpotifyController(api_base='http://127.0.0.1:8900/v1/', access_token='mock')
+# atau di config.ini bagian [Spotify]: api_base = http://127.0.0.1:8900/v1/ dan access_token = mock
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+
+MOCK_DEFAULTS = {
+    'latency_ms': 0.0,      # latensi dasar per request
+    'jitter_ms': 0.0,       # tambahan latensi acak 0..jitter
+    'error_rate': 0.0,      # peluang request dijawab 500/502/503
+    'rate_limit': 0.0,      # request per detik (token bucket), 0 = tanpa batas
+    'burst': 5,             # kapasitas token bucket
+    'retry_after': 1,       # nilai header Retry-After untuk respon 429 (detik)
+    'token': '',            # jika diisi, header Authorization harus "Bearer <token>"
+    'device': True,         # False -> GET /me/player menjawab 204 (tidak ada perangkat aktif)
+}
+
+MOCK_TRACKS = [
+    {'id': f'mocktrack{i:02d}', 'name': f'Mock Song {i}', 'duration_ms': 180000 + 7000 * i}
+    for i in range(10)
+]
+
+
+class MockPlayer:
+    """State pemutar tiruan. Semua akses lewat lock karena server melayani request paralel."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.is_playing = False
+        self.volume = 50
+        self.shuffle = False
+        self.track = 0
+        self.progress_ms = 0
+        self.progress_at = time.monotonic()
+        self.saved = set()
+
+    def position(self, now):
+        position = self.progress_ms
+        if self.is_playing:
+            position += int((now - self.progress_at) * 1000)
+        return min(position, MOCK_TRACKS[self.track]['duration_ms'])
+
+    def _set_position(self, position, now):
+        self.progress_ms = position
+        self.progress_at = now
+
+    def playback(self):
+        now = time.monotonic()
+        item = MOCK_TRACKS[self.track]
+        return {
+            'device': {'id': 'mockdevice', 'name': 'Mock Device', 'type': 'Computer', 'volume_percent': self.volume},
+            'is_playing': self.is_playing,
+            'shuffle_state': self.shuffle,
+            'progress_ms': self.position(now),
+            'item': {'id': item['id'], 'name': item['name'], 'duration_ms': item['duration_ms'],
+                     'type': 'track'},
+            'currently_playing_type': 'track',
+        }
+
+    def play(self):
+        now = time.monotonic()
+        self._set_position(self.position(now), now)
+        self.is_playing = True
+
+    def pause(self):
+        now = time.monotonic()
+        self._set_position(self.position(now), now)
+        self.is_playing = False
+
+    def skip(self, step):
+        self.track = (self.track + step) % len(MOCK_TRACKS)
+        self._set_position(0, time.monotonic())
+
+
+class MockSpotifyServer:
+    """
+    Server HTTP tiruan yang berjalan di thread sendiri (untuk benchmark dan pengujian
+    in-process) atau sebagai proses terpisah lewat main(). `url` adalah api_base untuk
+    SpotifyController/SpotifyTransport. Opsi di MOCK_DEFAULTS bisa diubah saat berjalan
+    lewat configure().
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, **config):
+        self.config = {}
+        self.configure(**config)
+        self.player = MockPlayer()
+        self.counts = {}
+        self.rate_limited = 0
+        self.errors = 0
+        self._stats_lock = threading.Lock()
+        self._tokens = float(self.config['burst'])
+        self._token_time = time.monotonic()
+        self._bucket_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _MockHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread = None
+
+    def configure(self, **config):
+        unknown = set(config) - set(MOCK_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Opsi mock server tidak dikenal: {', '.join(sorted(unknown))}")
+        self.config = dict(MOCK_DEFAULTS, **dict(self.config, **config))
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self):
+        with self._stats_lock:
+            return {'requests': dict(self.counts), 'total': sum(self.counts.values()),
+                    'rate_limited': self.rate_limited, 'errors': self.errors}
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.counts.clear()
+            self.rate_limited = 0
+            self.errors = 0
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def _take_token(self):
+        """Token bucket: False jika request melewati rate limit."""
+        rate = self.config['rate_limit']
+        if rate <= 0:
+            return True
+        with self._bucket_lock:
+            now = time.monotonic()
+            self._tokens = min(self.config['burst'], self._tokens + (now - self._token_time) * rate)
+            self._token_time = now
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def handle(self, method, path, query, headers):
+        """Kembalikan (status, header tambahan, body dict atau None)."""
+        cfg = self.config
+        key = f"{method} {path}"
+        self._count(key)
+        delay = cfg['latency_ms'] + random.uniform(0.0, cfg['jitter_ms'])
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        if cfg['token'] and headers.get('Authorization') != f"Bearer {cfg['token']}":
+            return 401, {}, {'error': {'status': 401, 'message': 'Invalid access token'}}
+        if not self._take_token():
+            with self._stats_lock:
+                self.rate_limited += 1
+            return 429, {'Retry-After': str(cfg['retry_after'])}, {'error': {'status': 429, 'message': 'API rate limit exceeded'}}
+        if cfg['error_rate'] > 0 and random.random() < cfg['error_rate']:
+            with self._stats_lock:
+                self.errors += 1
+            status = random.choice((500, 502, 503))
+            return status, {}, {'error': {'status': status, 'message': 'Injected error'}}
+
+        player = self.player
+        with player.lock:
+            if key == 'GET /v1/me':
+                return 200, {}, {'id': 'mockuser', 'display_name': 'Mock User', 'product': 'premium'}
+            if key == 'GET /v1/me/player':
+                if not cfg['device']:
+                    return 204, {}, None
+                return 200, {}, player.playback()
+            if key == 'PUT /v1/me/player/play':
+                player.play()
+            elif key == 'PUT /v1/me/player/pause':
+                player.pause()
+            elif key == 'POST /v1/me/player/next':
+                player.skip(1)
+            elif key == 'POST /v1/me/player/previous':
+                player.skip(-1)
+            elif key == 'PUT /v1/me/player/volume':
+                player.volume = max(0, min(100, int(query.get('volume_percent', [player.volume])[0])))
+            elif key == 'PUT /v1/me/player/seek':
+                player._set_position(max(0, int(query.get('position_ms', [0])[0])), time.monotonic())
+            elif key == 'PUT /v1/me/player/shuffle':
+                player.shuffle = query.get('state', ['false'])[0] == 'true'
+            elif key == 'PUT /v1/me/tracks':
+                player.saved.update(query.get('ids', [''])[0].split(','))
+            else:
+                return 404, {}, {'error': {'status': 404, 'message': 'Service not found'}}
+        return 204, {}, None
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # keep-alive, seperti API aslinya
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self):
+        parts = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        status, headers, body = self.server.mock.handle(self.command, parts.path, parse_qs(parts.query), self.headers)
+        data = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if data:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_PUT = do_POST = _dispatch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server tiruan Spotify Web API untuk pengujian offline")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.0, help="Latensi dasar per request (ms)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Tambahan latensi acak maksimal (ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Peluang respon 5xx (0..1)")
+    parser.add_argument('--rate-limit', type=float, default=0.0, help="Request per detik sebelum 429, 0 = tanpa batas")
+    parser.add_argument('--retry-after', type=int, default=1, help="Header Retry-After untuk 429 (detik)")
+    parser.add_argument('--token', default='', help="Wajibkan access token ini")
+    parser.add_argument('--no-device', action='store_true', help="Simulasikan tidak ada perangkat aktif")
+    args = parser.parse_args()
+
+    server = MockSpotifyServer(args.host, args.port, latency_ms=args.latency, jitter_ms=args.jitter,
+                               error_rate=args.error_rate, rate_limit=args.rate_limit,
+                               retry_after=args.retry_after, token=args.token, device=not args.no_device)
+    print(f"Mock Spotify API berjalan di {server.url} (Ctrl+C untuk berhenti)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Statistik: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,8 @@ class ModeSelectorApp:
         # --- Variabel untuk menyimpan input ---
         self.client_id_var = tk.StringVar()
         self.client_secret_var = tk.StringVar()
+        # Opsi tambahan dari config.ini (api_base/access_token untuk mock server), tidak ada di GUI
+        self.spotify_options = {}
 
         # --- Buat Widget ---
         self._create_widgets()
@@ -84,14 +86,17 @@ class ModeSelectorApp:
             client_secret = config['Spotify'].get('client_secret', '')
             self.client_id_var.set(client_id)
             self.client_secret_var.set(client_secret)
+            self.spotify_options = {key: config['Spotify'][key] for key in ('api_base', 'access_token')
+                                    if config['Spotify'].get(key)}
 
     def _save_credentials(self):
-        """Menyimpan Client ID dan Secret ke file config.ini."""
+        """Menyimpan Client ID dan Secret ke file config.ini (bagian dan opsi lain tetap dipertahankan)."""
         config = configparser.ConfigParser()
-        config['Spotify'] = {
-            'client_id': self.client_id_var.get(),
-            'client_secret': self.client_secret_var.get()
-        }
+        config.read(self.config_file)
+        if 'Spotify' not in config:
+            config['Spotify'] = {}
+        config['Spotify']['client_id'] = self.client_id_var.get()
+        config['Spotify']['client_secret'] = self.client_secret_var.get()
         with open(self.config_file, 'w') as f:
             config.write(f)
         print(f"Kredensial disimpan ke {self.config_file}")
@@ -105,7 +110,7 @@ class ModeSelectorApp:
         client_id = self.client_id_var.get()
         client_secret = self.client_secret_var.get()
 
-        if not client_id or not client_secret:
+        if (not client_id or not client_secret) and not self.spotify_options.get('access_token'):
             from tkinter import messagebox
             messagebox.showerror("Error", "Client ID dan Client Secret tidak boleh kosong untuk mode Spotify.")
             return
@@ -113,7 +118,7 @@ class ModeSelectorApp:
         print(f"Meluncurkan aplikasi utama dengan mode: spotify")
         self.master.withdraw()
         main_app_window = tk.Toplevel(self.master)
-        SpotifyGestureApp(main_app_window, self.camera_index, client_id, client_secret)
+        SpotifyGestureApp(main_app_window, self.camera_index, client_id, client_secret, **self.spotify_options)
 
 
     def _start_spotify_mode(self):
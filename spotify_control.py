@@ -1,180 +1,96 @@
+import argparse
 import cv2
 import time
 import numpy as np
 import HandTrackingModule as htm
-import pyautogui
-import pygame
-import pycaw
+from frame_sources import open_source
+from landmark_filter import LandmarkFilter
+from gesture_engine import GestureEngine
+from action_backends import MediaKeyBackend, SoundFeedbackBackend
+from action_dispatcher import ActionDispatcher
+from gesture_classifier import GestureClassifier
+from hand_tracker import HandTracker, MultiHandController, POLICIES, POLICY_FIRST
+
+# --- Argumen: sumber frame bisa kamera, file video, direktori gambar, atau rekaman landmark ---
+parser = argparse.ArgumentParser(description="Kontrol musik dengan gestur tangan")
+parser.add_argument('--source', default='0', help="Indeks kamera, file video, direktori gambar, atau rekaman landmark")
+parser.add_argument('--fast', action='store_true', help="Putar file secepat mungkin (tanpa pacing realtime)")
+parser.add_argument('--finger-method', choices=('position', 'angle'), default='position',
+                    help="Cara menentukan status jari: posisi x/y (cepat) atau sudut sendi (tahan rotasi/tangan kiri)")
+parser.add_argument('--model', help="Model gestur terlatih (.npz dari gesture_classifier.py)")
+parser.add_argument('--hands', type=int, default=1, help="Jumlah tangan yang dilacak sekaligus")
+parser.add_argument('--policy', choices=POLICIES, default=POLICY_FIRST, help="Tangan mana yang memegang kontrol (jika --hands > 1)")
+args = parser.parse_args()
 
 # --- Inisialisasi (tetap sama) ---
 # ... (Semua kode inisialisasi tidak berubah)
 wCam, hCam = 640, 480
 pTime = 0
-cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-cap.set(3, wCam)
-cap.set(4, hCam)
-detector = htm.handDetector(detectionCon=0.75, maxHands=1)
+cap = open_source(args.source, wCam, hCam, realtime=not args.fast) # Kamera: capture di thread terpisah, selalu frame terbaru
+detector = htm.handDetector(detectionCon=0.75, maxHands=args.hands, fingerMethod=args.finger_method)
+landmark_filter = LandmarkFilter() # Penghalusan landmark + voting status jari
 
-pygame.mixer.init()
-try:
-    sound_volume = pygame.mixer.Sound("Sounds/sfx-1.wav")
-    sound_play_pause = pygame.mixer.Sound("Sounds/sfx-2.wav")
-    sound_next_prev = pygame.mixer.Sound("Sounds/sfx-3.wav")
-except pygame.error as e:
-    print(f"Error loading sound files: {e}")
-    class DummySound:
-        def play(self): pass
-    sound_volume = sound_play_pause = sound_next_prev = DummySound()
+# Aksi lewat tombol media + volume pycaw, dengan efek suara sebagai umpan balik.
+# Skrip ini sejak awal memakai kepalan tangan untuk PLAY.
+media = MediaKeyBackend()
+sounds = SoundFeedbackBackend()
+actions = ActionDispatcher([media, sounds]).start() # Aksi berjalan di thread sendiri, loop frame tidak ikut tertahan
+classifier = GestureClassifier(args.model) if args.model else None
 
-try:
-    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-    from ctypes import cast, POINTER
-    from comtypes import CLSCTX_ALL
-    devices = AudioUtilities.GetSpeakers()
-    interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-    volume = cast(interface, POINTER(IAudioEndpointVolume))
-    volRange = volume.GetVolumeRange()
-    minVol, maxVol = volRange[0], volRange[1]
-    volume_control_enabled = True
-except (ImportError, OSError) as e:
-    print(f"Could not initialize volume control: {e}")
-    volume_control_enabled = False
-# ... (akhir inisialisasi)
+def make_engine():
+    return GestureEngine(backends=[actions], play_pose='fist', classifier=classifier)
 
-
-# --- Variabel Status (tetap sama) ---
-last_action_time = 0
-ACTION_COOLDOWN = 1.5
-hand_center_x_history = []
-SWIPE_THRESHOLD = 80
-is_volume_mode = False
-volume_mode_timeout = 0
-VOLUME_MODE_DURATION = 4.0
-
-# --- Fungsi Bantuan Volume (tetap sama) ---
-def get_current_volume_percentage():
-    if not volume_control_enabled: return 0
-    current_level = volume.GetMasterVolumeLevel()
-    return np.interp(current_level, [minVol, maxVol], [0, 100])
-
-def set_volume_percentage(percentage):
-    if not volume_control_enabled: return
-    percentage = np.clip(percentage, 0, 100)
-    level = np.interp(percentage, [0, 100], [minVol, maxVol])
-    volume.SetMasterVolumeLevel(level, None)
-
-# --- FUNGSI DETEKSI JEMPOL BARU ---
-def is_thumbs_up(fingers, lmList):
-    # Kondisi: hanya jempol terangkat DAN ujung jempol (4) di atas pangkalnya (2)
-    return fingers == [1, 0, 0, 0, 0] and lmList[4][2] < lmList[2][2]
-
-def is_thumbs_down(fingers, lmList):
-    # Kondisi: hanya jempol terangkat DAN ujung jempol (4) di bawah pangkalnya (2)
-    return fingers == [1, 0, 0, 0, 0] and lmList[4][2] > lmList[2][2]
+engine = make_engine()
+# Multi-tangan: ID stabil per tangan, masing-masing dengan engine (state/cooldown) sendiri
+controller = None
+if args.hands > 1:
+    tracker = HandTracker(detector, args.hands, filter_factory=LandmarkFilter)
+    controller = MultiHandController(tracker, make_engine, args.policy, classifier)
 
 
 # --- Loop Utama ---
 while True:
     success, img = cap.read()
-    if not success: break
+    if not success:
+        if not cap.isOpened(): break
+        continue # Belum ada frame baru
     
-    img = cv2.flip(img, 1)
-    img = detector.findHands(img)
-    lmList = detector.findPosition(img, draw=False)
-
-    current_time = time.time()
-    action_text = ""
-
-    if is_volume_mode and current_time > volume_mode_timeout:
-        is_volume_mode = False
-        action_text = "Volume Mode OFF"
-
-    if lmList:
-        fingers = detector.fingersUp()
-        print(f"Fingers: {fingers}, Is Thumbs Up: {is_thumbs_up(fingers, lmList)}, Is Thumbs Down: {is_thumbs_down(fingers, lmList)}")
-        
-        if is_volume_mode:
-            action_text = "VOL MODE"
-            
-            # 1. NAIKKAN VOLUME (Thumbs Up)
-            if is_thumbs_up(fingers, lmList) and (current_time - last_action_time > ACTION_COOLDOWN):
-                current_vol = get_current_volume_percentage()
-                set_volume_percentage(current_vol + 10)
-                action_text = "Vol +10"
-                sound_volume.play()
-                last_action_time = current_time
-                volume_mode_timeout = current_time + VOLUME_MODE_DURATION
-
-            # 2. TURUNKAN VOLUME (Thumbs Down)
-            elif is_thumbs_down(fingers, lmList) and (current_time - last_action_time > ACTION_COOLDOWN):
-                current_vol = get_current_volume_percentage()
-                set_volume_percentage(current_vol - 10)
-                action_text = "Vol -10"
-                sound_volume.play()
-                last_action_time = current_time
-                volume_mode_timeout = current_time + VOLUME_MODE_DURATION
-        
-        else: # Jika tidak sedang dalam mode volume
-            # 1. AKTIVASI MODE VOLUME (Tiga Jari Tengah)
-            if fingers == [0, 1, 1, 1, 0] and (current_time - last_action_time > ACTION_COOLDOWN):
-                is_volume_mode = True
-                volume_mode_timeout = current_time + VOLUME_MODE_DURATION
-                action_text = "Volume Mode ON"
-                sound_volume.play()
-                last_action_time = current_time
-
-            # 2. GESTUR PLAY
-            elif fingers == [0, 0, 0, 0, 0] and (current_time - last_action_time > ACTION_COOLDOWN):
-                action_text = "PLAY"
-                pyautogui.press('playpause')
-                sound_play_pause.play()
-                last_action_time = current_time
-
-            # 3. GESTUR PAUSE (Kembali ke Thumbs Down yang andal)
-            elif is_thumbs_down(fingers, lmList) and (current_time - last_action_time > ACTION_COOLDOWN):
-                 action_text = "PAUSE"
-                 pyautogui.press('playpause')
-                 sound_play_pause.play()
-                 last_action_time = current_time
-
-            # 4. GESTUR SWIPE (Peace Sign)
-            elif fingers == [0, 1, 1, 0, 0] and (current_time - last_action_time > ACTION_COOLDOWN):
-                # ... (logika swipe tidak berubah)
-                hand_center_x = lmList[9][1]
-                hand_center_x_history.append(hand_center_x)
-                if len(hand_center_x_history) > 10: 
-                    start_x, end_x = hand_center_x_history[0], hand_center_x_history[-1]
-                    dx = end_x - start_x
-                    key = None
-                    if dx > SWIPE_THRESHOLD:
-                        action_text, key = "NEXT TRACK", 'nexttrack'
-                    elif dx < -SWIPE_THRESHOLD:
-                        action_text, key = "PREV TRACK", 'prevtrack'
-                    if key:
-                        pyautogui.press(key)
-                        sound_next_prev.play()
-                        last_action_time = current_time
-                        hand_center_x_history.clear()
-                if not action_text: action_text = "Ready to Swipe"
-                if len(hand_center_x_history) > 20: hand_center_x_history.pop(0)
-            
-            else:
-                 hand_center_x_history.clear()
+    if getattr(cap, 'provides_landmarks', False):
+        img = detector.findHandsFromTrace(img.copy(), cap.record) # Rekaman sudah dalam koordinat mirror
+    else:
+        img = cv2.flip(img, 1)
+        img = detector.findHands(img)
+    stamp = cap.record.timestamp if getattr(cap, 'provides_landmarks', False) else time.time()
+    if controller is not None:
+        count = detector.findAllPositions(img)
+        action_text = controller.update(detector.allLandmarks[:count], stamp)
+        engine = controller.owner_engine() or engine
+        for slot in tracker.visible_slots():
+            cx, cy = tracker.landmarks[slot].px[9, :2]
+            owner = tracker.ids[slot] == controller.owner
+            cv2.putText(img, f"#{tracker.ids[slot]}", (int(cx), int(cy)), cv2.FONT_HERSHEY_PLAIN, 2,
+                        (0, 255, 0) if owner else (0, 0, 255), 2)
+    else:
+        lmList = detector.findPosition(img, draw=False)
+        finger_code = landmark_filter.apply(detector, stamp)
+        action_text = engine.update(finger_code, detector.landmarks, stamp)
+        if lmList:
+            print(f"Fingers: {htm.codeToFingers(finger_code)}, Pose: {engine.pose}, State: {engine.state}")
 
     # --- VISUALISASI (Tidak ada perubahan) ---
     # ... (sisa kode visualisasi tetap sama)
-    if volume_control_enabled:
-        currentVolPer = get_current_volume_percentage()
+    if media.volume_control_enabled:
+        currentVolPer = media.level
         volBar = np.interp(currentVolPer, [0, 100], [400, 150])
         cv2.rectangle(img, (50, 150), (85, 400), (255, 0, 0), 3)
         cv2.rectangle(img, (50, int(volBar)), (85, 400), (0, 255, 0), cv2.FILLED)
         cv2.putText(img, f'{int(currentVolPer)} %', (40, 450), cv2.FONT_HERSHEY_COMPLEX, 1, (255, 255, 255), 2)
-    if is_volume_mode:
+    if engine.volume_mode:
         cv2.putText(img, "VOL MODE ACTIVE", (wCam - 350, 100), cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
     if action_text:
         cv2.putText(img, action_text, (50, 100), cv2.FONT_HERSHEY_PLAIN, 3, (255, 0, 0), 3)
     cTime = time.time()
-    fps = 1 / (cTime - pTime)
+    fps = 1 / max(cTime - pTime, 1e-6)
     pTime = cTime
     cv2.putText(img, f'FPS: {int(fps)}', (wCam - 150, 50), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 0), 2)
     cv2.imshow("Advanced Gesture Control", img)
@@ -183,4 +99,5 @@ while True:
 
 cap.release()
 cv2.destroyAllWindows()
-pygame.mixer.quit()
\ No newline at end of file
+actions.close()
+sounds.close()
\ No newline at end of file
@@ -1,15 +1,136 @@
-import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 import time
 import threading
-from queue import Queue
+from queue import Queue, Empty
+from spotify_transport import SpotifyTransport, TRANSPORT_DEFAULTS, SPOTIFY_API_BASE
+
+_STOP = object() # Penanda di antrian untuk membangunkan worker saat stop()
+
+CONTROLLER_DEFAULTS = {
+    'poll_fast': 0.5,       # detik antar update status sesaat setelah perintah (konfirmasi)
+    'poll_idle': 3.0,       # detik antar update status saat tidak ada perintah
+    'poll_max': 30.0,       # batas backoff update status saat API error
+    'fast_window': 3.0,     # detik setelah perintah terakhir dengan polling cepat
+    'grace': 1.0,           # detik perubahan lokal dipertahankan sebelum status API boleh menimpanya
+}
+
+# Field state yang diubah oleh setiap perintah
+COMMAND_FIELDS = {
+    "play_pause": 'is_playing',
+    "set_volume": 'volume',
+    "seek": 'progress_ms',
+    "shuffle": 'shuffle',
+    "next": 'progress_ms',
+    "previous": 'progress_ms',
+}
+
+
+class PlaybackState:
+    """
+    Model lokal status pemutaran. Perintah mengubahnya seketika (optimistis) dan
+    mencatat waktu perubahan per field; snapshot dari API hanya menimpa field yang
+    perubahan lokal terakhirnya lebih tua `grace` detik dari saat request status dikirim.
+    Dengan begitu respon API yang basi (diminta sebelum perintah diterapkan Spotify)
+    tidak membatalkan perubahan yang baru saja dibuat pengguna.
+    """
+    FIELDS = ('is_playing', 'volume', 'shuffle', 'progress_ms')
+
+    def __init__(self, volume=50):
+        self._lock = threading.Lock()
+        self.is_playing = False
+        self.volume = volume
+        self.shuffle = False
+        self.progress_ms = 0
+        self.progress_at = 0.0      # waktu monotonic saat progress_ms berlaku
+        self.track_id = None
+        self.track_name = ''
+        self.duration_ms = 0
+        self.changed_at = dict.fromkeys(self.FIELDS, 0.0)
+        self.synced_at = 0.0
+        self.conflicts = 0          # nilai API yang diabaikan karena perubahan lokal lebih baru
+
+    def set(self, field, value, now):
+        with self._lock:
+            setattr(self, field, value)
+            self.changed_at[field] = now
+            if field == 'progress_ms':
+                self.progress_at = now
+
+    def confirm(self, field, now):
+        """Perintah selesai dikirim: jendela grace dihitung dari saat ini."""
+        with self._lock:
+            self.changed_at[field] = max(self.changed_at[field], now)
+
+    def release(self, field):
+        """Perintah gagal: nilai dari API berikutnya langsung dipakai."""
+        with self._lock:
+            self.changed_at[field] = 0.0
+
+    def track_changed(self, now):
+        with self._lock:
+            self.track_id = None
+            self.progress_ms = 0
+            self.progress_at = now
+            self.changed_at['progress_ms'] = now
+
+    def position(self, now):
+        """Perkiraan posisi lagu (ms) dari progress terakhir dan waktu yang berlalu."""
+        with self._lock:
+            position = self.progress_ms
+            if self.is_playing:
+                position += (now - self.progress_at) * 1000.0
+            return int(min(position, self.duration_ms) if self.duration_ms else position)
+
+    def reconcile(self, playback, requested_at, grace):
+        """Terapkan snapshot current_playback() yang diminta pada `requested_at`."""
+        if not playback:
+            return
+        remote = {
+            'is_playing': playback.get('is_playing'),
+            'volume': (playback.get('device') or {}).get('volume_percent'),
+            'shuffle': playback.get('shuffle_state'),
+            'progress_ms': playback.get('progress_ms'),
+        }
+        with self._lock:
+            for field, value in remote.items():
+                if value is None:
+                    continue
+                if requested_at < self.changed_at[field] + grace:
+                    if getattr(self, field) != value:
+                        self.conflicts += 1
+                    continue
+                setattr(self, field, value)
+                if field == 'progress_ms':
+                    self.progress_at = requested_at
+            item = playback.get('item')
+            if item:
+                self.track_id = item.get('id')
+                self.track_name = item.get('name', '')
+                self.duration_ms = item.get('duration_ms', 0)
+            self.synced_at = requested_at
+
 
 class SpotifyController:
-    def __init__(self, client_id, client_secret):
+    """
+    Pengendali Spotify Web API dengan thread worker. Normalnya login lewat OAuth
+    (client_id/client_secret). Untuk pengujian offline, `api_base` bisa diarahkan ke
+    mock_spotify_server.py dan `access_token` diisi langsung sehingga OAuth dilewati.
+    """
+
+    def __init__(self, client_id=None, client_secret=None, api_base=SPOTIFY_API_BASE, access_token=None, **config):
+        unknown = set(config) - set(CONTROLLER_DEFAULTS) - set(TRANSPORT_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Opsi SpotifyController tidak dikenal: {', '.join(sorted(unknown))}")
+        # Opsi TRANSPORT_DEFAULTS (timeout, retry, circuit breaker) diteruskan ke SpotifyTransport
+        self.transport_config = {key: value for key, value in config.items() if key in TRANSPORT_DEFAULTS}
+        self.config = dict(CONTROLLER_DEFAULTS, **{key: value for key, value in config.items()
+                                                   if key in CONTROLLER_DEFAULTS})
         self.client_id = client_id
         self.client_secret = client_secret
+        self.api_base = api_base
+        self.access_token = access_token
         self.redirect_uri = 'http://127.0.0.1:8888/spotify-api/callback/'
-        self.scope = "user-read-playback-state,user-modify-playback-state"
+        self.scope = "user-read-playback-state,user-modify-playback-state,user-library-modify"
         self.sp = None
         self.is_authenticated = False
         self._authenticate()
@@ -18,11 +139,23 @@ class SpotifyController:
         self.worker_thread = None
         self.is_running = False
 
-        self.current_volume = 50
-        self.is_playing = False
+        # State lokal: diperbarui seketika oleh perintah, direkonsiliasi oleh worker
+        self.state = PlaybackState()
+        self.last_command_time = 0.0
+        self.poll_errors = 0
+        self.polls = 0
+
+        # Metrik worker: latensi antri->selesai, kedalaman antrian, perintah yang digabung
+        self.commands_received = 0
+        self.commands_executed = 0
+        self.commands_coalesced = 0
+        self.commands_rejected = 0
+        self.max_queue_depth = 0
+        self.latency_avg_ms = 0.0
+        self.latency_max_ms = 0.0
 
     def start(self):
-        if self._authenticate():
+        if self.is_authenticated or self._authenticate():
             self.is_running = True
             self.worker_thread = threading.Thread(target=self._run, daemon=True)
             self.worker_thread.start()
@@ -32,14 +165,21 @@ class SpotifyController:
     def _authenticate(self):
         """Melakukan otentikasi dengan Spotify."""
         try:
-            auth_manager = SpotifyOAuth(
-                client_id=self.client_id,
-                client_secret=self.client_secret,
-                redirect_uri=self.redirect_uri,
-                scope=self.scope,
-                open_browser=True # Otomatis buka browser untuk login pertama kali
-            )
-            self.sp = spotipy.Spotify(auth_manager=auth_manager)
+            if self.access_token:
+                token = self.access_token # Token tetap (mis. mock server), tanpa OAuth
+            else:
+                auth_manager = SpotifyOAuth(
+                    client_id=self.client_id,
+                    client_secret=self.client_secret,
+                    redirect_uri=self.redirect_uri,
+                    scope=self.scope,
+                    open_browser=True # Otomatis buka browser untuk login pertama kali
+                )
+                token = lambda: auth_manager.get_access_token(as_dict=False)
+            if self.sp is not None:
+                self.sp.close()
+            # Session keep-alive dengan timeout, retry dan circuit breaker; token di-refresh oleh SpotifyOAuth
+            self.sp = SpotifyTransport(token, self.api_base, **self.transport_config)
             self.sp.current_user()
             self.is_authenticated = True
             print("Otentikasi Spotify berhasil.")
@@ -53,29 +193,128 @@ class SpotifyController:
         """Menghentikan thread pekerja."""
         self.is_running = False
         if self.worker_thread:
+            self.command_queue.put(_STOP) # Bangunkan worker yang sedang menunggu antrian
             self.worker_thread.join()
+        if self.sp is not None:
+            self.sp.close()
 
     def _run(self):
-        """Loop utama yang berjalan di thread terpisah."""
-        status_update_interval = 1.0  # Detik, seberapa sering update status
-        last_status_update = 0
+        """
+        Loop utama yang berjalan di thread terpisah. Worker memblokir di antrian sampai
+        ada perintah atau jadwal update status tiba (tanpa sleep polling), lalu
+        mengambil SEMUA perintah yang menunggu dan menggabungkannya sebelum dieksekusi.
+        """
+        next_status_update = 0.0
 
         while self.is_running:
-            # 1. Proses perintah dari antrian
-            if not self.command_queue.empty():
-                command = self.command_queue.get()
-                if command == "play_pause": self._play_pause_action()
-                elif command == "next": self._next_track_action()
-                elif command == "previous": self._previous_track_action()
-                elif isinstance(command, tuple) and command[0] == "set_volume":
-                    self._set_volume_action(command[1])
-
-            # 2. Update status secara berkala
-            if time.time() - last_status_update > status_update_interval:
+            # 1. Tunggu perintah paling lama sampai jadwal update status berikutnya
+            timeout = max(0.0, next_status_update - time.monotonic())
+            try:
+                batch = [self.command_queue.get(timeout=timeout)]
+            except Empty:
+                batch = []
+            while True:
+                try:
+                    batch.append(self.command_queue.get_nowait())
+                except Empty:
+                    break
+            if _STOP in batch:
+                break
+            if batch:
+                self.max_queue_depth = max(self.max_queue_depth, len(batch))
+                for command, queued_at in self._coalesce(batch):
+                    if not self._execute(command):
+                        next_status_update = 0.0 # Gagal: ambil status sebenarnya secepatnya
+                    self._record_latency(queued_at)
+                # Konfirmasi hasil perintah lewat polling cepat
+                next_status_update = min(next_status_update, time.monotonic() + self.config['poll_fast'])
+
+            # 2. Update status dengan interval adaptif
+            if time.monotonic() >= next_status_update:
                 self._update_status()
-                last_status_update = time.time()
-            
-            time.sleep(0.05) # Beri jeda kecil agar tidak membebani CPU
+                next_status_update = time.monotonic() + self._poll_interval()
+
+    def _poll_interval(self):
+        """Cepat sesaat setelah perintah, lambat saat diam, backoff eksponensial saat error."""
+        cfg = self.config
+        if self.poll_errors:
+            return min(cfg['poll_max'], cfg['poll_idle'] * 2 ** (self.poll_errors - 1))
+        if time.monotonic() - self.last_command_time < cfg['fast_window']:
+            return cfg['poll_fast']
+        return cfg['poll_idle']
+
+    def _coalesce(self, batch):
+        """
+        Gabungkan perintah (command, waktu antri) yang menumpuk:
+        - set_volume berturut-turut -> hanya level terakhir
+        - play_pause/shuffle berpasangan saling membatalkan (toggle dua kali = tidak berubah)
+        - seek dijumlahkan, like cukup sekali
+        next/previous tetap dieksekusi satu per satu sesuai urutan dan menjadi batas
+        penggabungan: perintah sebelumnya dikirim dulu, sehingga seek/like/volume tetap
+        berlaku untuk lagu yang sedang dilihat pengguna saat itu. Waktu antri perintah
+        gabungan adalah yang paling lama, agar metrik latensi tidak terlihat lebih baik.
+        """
+        commands = []
+        merged = {}  # nama -> [nilai, waktu antri tertua, jumlah]
+        for command, queued_at in batch:
+            name = command[0] if isinstance(command, tuple) else command
+            if name in ("next", "previous"):
+                self._flush_merged(merged, commands)
+                commands.append((command, queued_at))
+                continue
+            value = command[1] if isinstance(command, tuple) else None
+            entry = merged.get(name)
+            if entry is None:
+                merged[name] = [value, queued_at, 1]
+                continue
+            if name == "seek":
+                entry[0] += value
+            elif name == "set_volume":
+                entry[0] = value
+            entry[2] += 1
+        self._flush_merged(merged, commands)
+        self.commands_coalesced += len(batch) - len(commands)
+        return commands
+
+    @staticmethod
+    def _flush_merged(merged, commands):
+        """Pindahkan perintah gabungan ke `commands` (urutan kemunculan pertama) lalu kosongkan."""
+        for name, (value, queued_at, count) in merged.items():
+            if name in ("play_pause", "shuffle") and count % 2 == 0:
+                continue
+            commands.append(((name, value) if value is not None else name, queued_at))
+        merged.clear()
+
+    def _execute(self, command):
+        """Jalankan satu perintah. Mengembalikan False jika request gagal."""
+        name = command[0] if isinstance(command, tuple) else command
+        field = COMMAND_FIELDS.get(name)
+        self.commands_executed += 1
+        try:
+            if command == "play_pause": self._play_pause_action()
+            elif command == "next": self._next_track_action()
+            elif command == "previous": self._previous_track_action()
+            elif command == "shuffle": self._toggle_shuffle_action()
+            elif command == "like": self._like_action()
+            elif name == "seek": self._seek_action(command[1])
+            elif name == "set_volume": self._set_volume_action(command[1])
+        except Exception as e:
+            # Worker harus tetap hidup walau satu request gagal; state lokal dikoreksi oleh API
+            print(f"Error pada perintah {name}: {e}")
+            if field:
+                self.state.release(field)
+            return False
+        if field:
+            self.state.confirm(field, time.monotonic())
+        return True
+
+    def _record_latency(self, queued_at):
+        ms = (time.monotonic() - queued_at) * 1000.0
+        if self.commands_executed == 1:
+            self.latency_avg_ms = ms
+        else:
+            self.latency_avg_ms += 0.1 * (ms - self.latency_avg_ms)
+        self.latency_max_ms = max(self.latency_max_ms, ms)
 
     def _is_active(self):
         """Mengecek apakah ada lagu yang sedang aktif/diputar."""
@@ -86,22 +325,17 @@ class SpotifyController:
             return None
 
     def _play_pause_action(self):
-        """Memainkan lagu jika sedang di-pause, atau sebaliknya. Dieksekusi oleh worker."""
+        """
+        Bawa Spotify ke status play/pause lokal. State lokal sudah dibalik saat perintah
+        dikirim, jadi tidak perlu request current_playback() dulu.
+        """
         if not self.sp: return
-        try:
-            # Kita tidak perlu menggunakan variabel self.is_playing di sini,
-            # lebih baik dapatkan status terbaru langsung sebelum bertindak.
-            playback = self._is_active()
-            if playback and playback['is_playing']:
-                self.sp.pause_playback()
-                print("Spotify: Paused")
-                self.is_playing = False
-            elif playback:
-                self.sp.start_playback()
-                print("Spotify: Playing")
-                self.is_playing = True
-        except Exception as e:
-            print(f"Error pada aksi play/pause: {e}")
+        if self.state.is_playing:
+            self.sp.start_playback()
+            print("Spotify: Playing")
+        else:
+            self.sp.pause_playback()
+            print("Spotify: Paused")
 
     def _next_track_action(self):
         if not self.sp: return
@@ -113,23 +347,117 @@ class SpotifyController:
         self.sp.previous_track()
         print("Spotify: Previous Track")
 
+    def _seek_action(self, delta_ms):
+        """Pindah ke posisi lokal (sudah digeser delta_ms saat perintah dikirim)."""
+        if not self.sp: return
+        self.sp.seek_track(self.state.position(time.monotonic()))
+        print(f"Spotify: Seek {delta_ms / 1000:+.0f}s")
+
+    def _toggle_shuffle_action(self):
+        if not self.sp: return
+        self.sp.shuffle(self.state.shuffle)
+        print(f"Spotify: Shuffle {'ON' if self.state.shuffle else 'OFF'}")
+
+    def _like_action(self):
+        """Simpan lagu yang sedang diputar ke Liked Songs."""
+        if not self.sp: return
+        track_id, name = self.state.track_id, self.state.track_name
+        if track_id is None:
+            # Lagu baru saja berganti dan belum diketahui: tanya API sekali
+            playback = self._is_active()
+            if not playback or not playback.get('item'):
+                return
+            track_id, name = playback['item']['id'], playback['item'].get('name', '')
+        self.sp.current_user_saved_tracks_add([track_id])
+        print(f"Spotify: Liked {name}")
+
     def _set_volume_action(self, level): self.sp.volume(int(max(0, min(100, level))))
 
     def _update_status(self):
-        """Memperbarui variabel state dari API Spotify."""
+        """Rekonsiliasi state lokal dengan API Spotify."""
+        requested_at = time.monotonic()
+        self.polls += 1
         try:
             playback = self.sp.current_playback()
-            if playback and playback.get('device'):
-                self.current_volume = playback['device'].get('volume_percent', self.current_volume)
-                self.is_playing = playback.get('is_playing', self.is_playing)
         except Exception as e:
+            self.poll_errors += 1
             print(f"Error updating Spotify status: {e}")
+            return
+        self.poll_errors = 0
+        self.state.reconcile(playback, requested_at, self.config['grace'])
 
     # --- Fungsi Publik (dipanggil oleh GUI untuk mengirim perintah) ---
-    def play_pause(self): self.command_queue.put("play_pause")
-    def next_track(self): self.command_queue.put("next")
-    def previous_track(self): self.command_queue.put("previous")
-    def set_volume(self, level): self.command_queue.put(("set_volume", level))
+    # State lokal diperbarui seketika, request HTTP dijalankan worker di belakang.
+    def _send(self, command):
+        """Antrikan perintah; None jika ditolak karena API sedang tidak tersedia (circuit terbuka)."""
+        now = time.monotonic()
+        self.commands_received += 1
+        if self.sp is not None and self.sp.breaker.is_open(now):
+            self.commands_rejected += 1
+            print(f"Spotify tidak tersedia, perintah {command} diabaikan")
+            return None
+        self.last_command_time = now
+        self.command_queue.put((command, now))
+        return now
+
+    def play_pause(self):
+        now = self._send("play_pause")
+        if now is not None:
+            self.state.set('is_playing', not self.state.is_playing, now)
+
+    def next_track(self):
+        now = self._send("next")
+        if now is not None:
+            self.state.track_changed(now)
+
+    def previous_track(self):
+        now = self._send("previous")
+        if now is not None:
+            self.state.track_changed(now)
+
+    def set_volume(self, level):
+        level = int(max(0, min(100, level)))
+        now = self._send(("set_volume", level))
+        if now is not None:
+            self.state.set('volume', level, now)
+
+    def seek(self, delta_ms):
+        now = self._send(("seek", delta_ms))
+        if now is not None:
+            self.state.set('progress_ms', max(0, self.state.position(now) + int(delta_ms)), now)
+
+    def toggle_shuffle(self):
+        now = self._send("shuffle")
+        if now is not None:
+            self.state.set('shuffle', not self.state.shuffle, now)
+
+    def like_current(self): self._send("like")
+
+    def stats(self):
+        """Metrik worker (dan transport HTTP) untuk log/benchmark."""
+        stats = {
+            'received': self.commands_received,
+            'executed': self.commands_executed,
+            'coalesced': self.commands_coalesced,
+            'queue_depth': self.command_queue.qsize(),
+            'max_queue_depth': self.max_queue_depth,
+            'latency_avg_ms': self.latency_avg_ms,
+            'latency_max_ms': self.latency_max_ms,
+            'polls': self.polls,
+            'poll_errors': self.poll_errors,
+            'poll_interval': self._poll_interval(),
+            'conflicts': self.state.conflicts,
+            'rejected': self.commands_rejected,
+        }
+        if hasattr(self.sp, 'stats'):
+            stats['transport'] = self.sp.stats()
+        return stats
     
-    # --- Fungsi Getter (mendapat data dari variabel, BUKAN API langsung) ---
-    def get_volume(self): return self.current_volume
\ No newline at end of file
+    # --- Fungsi Getter (mendapat data dari state lokal, BUKAN API langsung) ---
+    def get_volume(self): return self.state.volume
+
+    @property
+    def is_playing(self): return self.state.is_playing
+
+    @property
+    def current_volume(self): return self.state.volume
\ No newline at end of file
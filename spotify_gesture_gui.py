@@ -1,30 +1,35 @@
-# File: gesture_controller_gui.py
+# File: spotify_gesture_gui.py
 
 import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-import cv2
 from PIL import Image, ImageTk
 import time
-import numpy as np
 
 # Impor semua modul yang dibutuhkan
 import HandTrackingModule as htm
-import pygame
+from frame_sources import open_source
+from gesture_pipeline import GesturePipeline
+from frame_governor import FrameRateGovernor
+from landmark_filter import LandmarkFilter
+from gesture_engine import GestureEngine
+from action_backends import SpotifyBackend, SoundFeedbackBackend
+from action_dispatcher import ActionDispatcher
 from spotify_controller import SpotifyController
 
 # Impor jendela manual
 from gesture_manual import ManualWindow
 
 class SpotifyGestureApp:
-    def __init__(self, master, camera_index, client_id, client_secret):
+    def __init__(self, master, camera_index, client_id, client_secret, **spotify_options):
         self.master = master
         self.camera_index = camera_index
 
         self.master.title("Music Gesture Controller")
         self.master.geometry("1024x600")
 
-        self.spotify_client = SpotifyController(client_id, client_secret)
+        # spotify_options: api_base/access_token opsional (mis. mock_spotify_server.py untuk uji beban)
+        self.spotify_client = SpotifyController(client_id, client_secret, **spotify_options)
         
         # --- Inisialisasi Logika dari windows_control.py ---
         self._initialize_logic(client_id, client_secret)
@@ -46,36 +51,29 @@ class SpotifyGestureApp:
 
     def _initialize_logic(self, client_id, client_secret):
         """Inisialisasi semua variabel dan objek dari skrip logika."""
-        self.cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
-        self.cap.set(3, 640)
-        self.cap.set(4, 480)
+        # Capture berjalan di thread sendiri, GUI hanya mengambil frame terbaru.
+        # camera_index juga boleh berupa path video/direktori gambar/rekaman landmark.
+        self.cap = open_source(self.camera_index, 640, 480)
         
         self.detector = htm.handDetector(detectionCon=0.75, maxHands=1)
-
-
-        # Variabel Status
-        self.pTime = 0
-        self.last_action_time = 0
-        self.ACTION_COOLDOWN = 1.5
-        self.hand_center_x_history = []
-        self.SWIPE_THRESHOLD = 50
-        self.is_volume_mode = False
-        self.volume_mode_timeout = 0
-        self.VOLUME_MODE_DURATION = 4.0
-
-        # Inisialisasi Volume Control
-        self.volume_control_enabled = False
-
-        # Inisialisasi Suara
-        pygame.mixer.init()
-        try:
-            self.sound_volume = pygame.mixer.Sound("Sounds/sfx-1.wav")
-            self.sound_play_pause = pygame.mixer.Sound("Sounds/sfx-2.wav")
-            self.sound_next_prev = pygame.mixer.Sound("Sounds/sfx-3.wav")
-        except pygame.error:
-            class DummySound:
-                def play(self): pass
-            self.sound_volume = self.sound_play_pause = self.sound_next_prev = DummySound()
+        # Inferensi berjalan di thread worker, Tk hanya menerima hasil jadi.
+        # Governor menurunkan frekuensi inferensi saat tidak ada tangan di depan kamera.
+        self.governor = FrameRateGovernor()
+        # Landmark dihaluskan dan status jari di-voting sebelum sampai ke mesin gestur
+        self.landmark_filter = LandmarkFilter()
+        self.pipeline = GesturePipeline(self.cap, self.detector, governor=self.governor,
+                                        landmark_filter=self.landmark_filter).start()
+        self.STATS_REPORT_INTERVAL = 5.0
+        self.last_stats_report = 0
+        self.imgtk = None
+
+
+        # Logika gestur dan aksinya (Spotify Web API, efek suara).
+        # Ambang swipe lebih pendek (setara 50 px pada lebar 640) dipertahankan dari versi GUI Spotify sebelumnya.
+        self.spotify_backend = SpotifyBackend(self.spotify_client)
+        self.sounds = SoundFeedbackBackend()
+        self.actions = ActionDispatcher([self.spotify_backend, self.sounds]).start()
+        self.engine = GestureEngine(backends=[self.actions], swipe_distance=50 / 640)
 
     def _create_widgets(self):
         """Membuat semua widget GUI."""
@@ -122,125 +120,71 @@ class SpotifyGestureApp:
         self.camera_label.pack(fill=BOTH, expand=True)
 
     def _update_frame_and_gestures(self):
-        """Metode ini menggantikan 'while True' dari skrip asli."""
-        success, img = self.cap.read()
-        if not success:
-            self.master.after(15, self._update_frame_and_gestures)
+        """
+        Metode ini menggantikan 'while True' dari skrip asli.
+        Hanya mengambil hasil inferensi terbaru dari pipeline, sehingga Tk tidak pernah
+        menunggu kamera maupun MediaPipe.
+        """
+        result = self.pipeline.poll()
+        if result is None:
+            self.master.after(self.pipeline.ui_interval_ms(), self._update_frame_and_gestures)
             return
 
-        img = cv2.flip(img, 1)
-        img_for_detection = img.copy() # Gunakan copy untuk deteksi agar gambar asli tidak dimodifikasi
-        action_text = ""
-        
-        img_for_detection = self.detector.findHands(img_for_detection)
-        lmList = self.detector.findPosition(img_for_detection, draw=False)
-
-        # --- Logika Gestur (hampir sama seperti windows_control.py) ---
-        current_time = time.time()
-        
-
-        if self.is_volume_mode and current_time > self.volume_mode_timeout:
-            self.is_volume_mode = False
-            action_text = "Volume Mode OFF"
-
-        if lmList:
-            fingers = self.detector.fingersUp()
-
-            print(f"Fingers: {fingers}")
-            
-            if fingers == [0, 1, 1, 0, 0]: # Jika gestur 'V' terdeteksi
-                if not self.swipe_action_taken and not self.is_volume_mode: # Hanya proses jika kunci terbuka & bukan mode volume
-                    hand_center_x = lmList[9][1]
-                    self.hand_center_x_history.append(hand_center_x)
-
-                    if len(self.hand_center_x_history) > 10: 
-                        dx = self.hand_center_x_history[-1] - self.hand_center_x_history[0]
-                        command = None
-                        if dx > self.SWIPE_THRESHOLD:
-                            action_text, command = "NEXT TRACK", "next"
-                        elif dx < -self.SWIPE_THRESHOLD:
-                            action_text, command = "PREV TRACK", "previous"
-                        
-                        if command:
-                            if command == "next": self.spotify_client.next_track()
-                            elif command == "previous": self.spotify_client.previous_track()
-                            self.sound_next_prev.play()
-                            self.last_action_time = current_time
-                            self.hand_center_x_history.clear()
-                            self.swipe_action_taken = True # <--- KUNCI AKSI!
-                    
-                    if not action_text and not self.swipe_action_taken:
-                        action_text = "Ready to Swipe"
-                
-                elif self.swipe_action_taken:
-                    action_text = "Swipe Done"
-
-            else: # Jika gestur BUKAN 'V'
-                # --- BUKA KUNCI dan proses gestur lain ---
-                self.swipe_action_taken = False 
-                self.hand_center_x_history.clear()
-                
-                thumbs_up = fingers == [1, 0, 0, 0, 0] and lmList[4][2] < lmList[2][2]
-                thumbs_down = fingers == [1, 0, 0, 0, 0] and lmList[4][2] > lmList[2][2]
-            
-                if self.is_volume_mode:
-                    action_text = "VOL MODE"
-                    if thumbs_up and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                        self.spotify_client.set_volume(self.spotify_client.get_volume() + 10)
-                        action_text = "Vol +10"; self.sound_volume.play()
-                        self.last_action_time = current_time
-                        self.volume_mode_timeout = current_time + self.VOLUME_MODE_DURATION
-                    elif thumbs_down and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                        self.spotify_client.set_volume(self.spotify_client.get_volume() - 10)
-                        action_text = "Vol -10"; self.sound_volume.play()
-                        self.last_action_time = current_time
-                        self.volume_mode_timeout = current_time + self.VOLUME_MODE_DURATION
-                
-                else: # Jika tidak sedang dalam mode volume
-                    is_currently_playing = self.spotify_client.is_playing 
-                    print(is_currently_playing)
-                    if fingers == [0, 1, 1, 1, 0] and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                        self.is_volume_mode = True; self.volume_mode_timeout = current_time + self.VOLUME_MODE_DURATION
-                        action_text = "Volume Mode ON"; self.sound_volume.play()
-                        self.last_action_time = current_time
-
-                    # 1. GESTUR PLAY (5 Jari Terbuka)
-                    if fingers == [1, 1, 1, 1, 1] and not is_currently_playing and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                        action_text = "PLAY"
-                        self.spotify_client.play_pause() # Perintahnya tetap sama
-                        self.sound_play_pause.play()
-                        self.last_action_time = current_time
-                    
-                    # 2. GESTUR PAUSE (Thumbs Down)
-                    elif thumbs_down and is_currently_playing and (current_time - self.last_action_time > self.ACTION_COOLDOWN):
-                        action_text = "PAUSE"
-                        self.spotify_client.play_pause() # Perintahnya tetap sama
-                        self.sound_play_pause.play()
-                        self.last_action_time = current_time
-        
-        else: # Jika tidak ada tangan terdeteksi sama sekali
-            self.swipe_action_taken = False
-            self.hand_center_x_history.clear()
+        t_gesture = time.perf_counter()
+        action_text = self._process_gestures(result.lmList, result.finger_code, result.stamp)
+        self.pipeline.timer.add('gesture', time.perf_counter() - t_gesture)
 
         # --- Update GUI ---
+        t_render = time.perf_counter()
         if action_text:
             self.recognized_gesture_var.set(action_text)
 
         # Update Volume Bar
-        current_vol = self.spotify_client.get_volume()
-        self.volume_var.set(current_vol)
+        self.volume_var.set(self.spotify_backend.get_volume())
 
         # Update Camera Feed
-        cv2image = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img_pil = Image.fromarray(cv2image)
-        imgtk = ImageTk.PhotoImage(image=img_pil)
-
+        self._render_frame(result.image)
 
-        self.camera_label.imgtk = imgtk
-        self.camera_label.configure(image=imgtk)
+        self.pipeline.timer.add('render', time.perf_counter() - t_render)
+        self._report_pipeline_stats()
 
         # Jadwalkan frame berikutnya
-        self.master.after(15, self._update_frame_and_gestures)
+        self.master.after(self.pipeline.ui_interval_ms(), self._update_frame_and_gestures)
+
+    def _render_frame(self, rgb):
+        """
+        Tampilkan frame RGB dari pipeline. Image.frombuffer tidak menyalin piksel dan
+        PhotoImage yang sama dipakai ulang lewat paste(), jadi tidak ada buffer baru per frame.
+        """
+        h, w = rgb.shape[:2]
+        img_pil = Image.frombuffer("RGB", (w, h), rgb, "raw", "RGB", 0, 1)
+        if self.imgtk is None or (self.imgtk.width(), self.imgtk.height()) != (w, h):
+            self.imgtk = ImageTk.PhotoImage(image=img_pil)
+            self.pipeline.buffers.count_allocation()
+            self.camera_label.imgtk = self.imgtk
+            self.camera_label.configure(image=self.imgtk)
+        else:
+            self.imgtk.paste(img_pil)
+
+    def _process_gestures(self, lmList, finger_code, stamp):
+        """
+        Tahap gestur: menerjemahkan landmark dan status jari menjadi aksi. Mengembalikan teks aksi.
+        Engine memakai waktu capture frame (`stamp`), bukan waktu callback Tk yang tertunda antrian.
+        """
+        return self.engine.update(finger_code, lmList.landmarks, stamp)
+
+    def _report_pipeline_stats(self):
+        """Cetak timing per tahap pipeline secara berkala."""
+        now = time.time()
+        if now - self.last_stats_report < self.STATS_REPORT_INTERVAL:
+            return
+        self.last_stats_report = now
+        capture = self.cap.stats()
+        spotify = self.spotify_client.stats()
+        print(f"Pipeline: {self.pipeline.timer.report()} | dropped {capture['dropped']}/{capture['captured']}"
+              f" | alloc/frame {self.pipeline.alloc_meter.per_frame():.2f} | governor {self.governor.status()}"
+              f" | spotify {spotify['latency_avg_ms']:.0f}ms antri {spotify['queue_depth']}/{spotify['max_queue_depth']}"
+              f" | {self.actions.report()}")
 
     def _open_manual_window(self):
         """Membuka jendela manual."""
@@ -249,19 +193,9 @@ class SpotifyGestureApp:
     def _on_closing(self):
         """Aksi sebelum jendela ditutup."""
         print("Menutup aplikasi utama...")
+        self.pipeline.stop()
+        self.actions.close()
         self.spotify_client.stop()
         self.cap.release()
-        pygame.mixer.quit()
+        self.sounds.close()
         self.master.destroy()
-        
-    # --- Fungsi bantuan dari skrip asli ---
-    def get_current_volume_percentage(self):
-        if not self.volume_control_enabled: return 0
-        current_level = self.volume.GetMasterVolumeLevel()
-        return np.interp(current_level, [self.minVol, self.maxVol], [0, 100])
-
-    def set_volume_percentage(self, percentage):
-        if not self.volume_control_enabled: return
-        percentage = np.clip(percentage, 0, 100)
-        level = np.interp(percentage, [0, 100], [self.minVol, self.maxVol])
-        self.volume.SetMasterVolumeLevel(level, None)
\ No newline at end of file
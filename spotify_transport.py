@@ -0,0 +1,272 @@
+# File: spotify_transport.py
+
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+
+SPOTIFY_API_BASE = 'https://api.spotify.com/v1/'
+
+TRANSPORT_DEFAULTS = {
+    'connect_timeout': 3.05,    # detik untuk membuka koneksi
+    'read_timeout': 5.0,        # detik menunggu respon
+    'retries': 3,               # percobaan ulang setelah request pertama
+    'backoff': 0.25,            # basis backoff eksponensial (detik), dengan full jitter
+    'max_backoff': 4.0,
+    'max_retry_after': 10.0,    # Retry-After lebih lama dari ini tidak ditunggu; circuit dibuka
+    'pool_size': 4,             # koneksi keep-alive per host
+    'failure_threshold': 5,     # kegagalan beruntun sebelum circuit dibuka
+    'reset_timeout': 15.0,      # detik circuit terbuka sebelum satu request percobaan diizinkan
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _not_sent(error):
+    """
+    True jika request gagal sebelum terkirim (timeout connect, gagal membuka koneksi atau
+    DNS). ConnectionError lain, misalnya koneksi diputus server, bisa terjadi setelah
+    request diproses.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class SpotifyTransportError(Exception):
+    """Request ke Spotify gagal setelah semua percobaan ulang. `status` None untuk error jaringan."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpenError(SpotifyTransportError):
+    """Circuit breaker terbuka: request tidak dikirim sama sekali."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker tiga state. closed: semua request lewat. open: setelah
+    `failure_threshold` kegagalan beruntun (atau Retry-After yang terlalu panjang) semua
+    request ditolak sampai `reset_timeout` lewat. half_open: satu request percobaan
+    dikirim; berhasil -> closed, gagal -> open lagi.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=15.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self.opened = 0
+
+    def is_open(self, now=None):
+        """True selama request pasti ditolak (dipakai pemanggil untuk tidak mengantri perintah)."""
+        now = time.monotonic() if now is None else now
+        return self.state == self.OPEN and now < self.open_until
+
+    def allow(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and now >= self.open_until:
+                self.state = self.HALF_OPEN
+                return True
+            return False    # open, atau half_open yang percobaannya masih berjalan
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open(now + self.reset_timeout)
+
+    def open_for(self, seconds, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._open(now + seconds)
+
+    def _open(self, until):
+        if self.state != self.OPEN:
+            self.opened += 1
+        self.state = self.OPEN
+        self.open_until = max(self.open_until, until)
+
+
+class SpotifyTransport:
+    """
+    Klien Web API Spotify minimal dengan nama method yang sama seperti spotipy.Spotify
+    (hanya yang dipakai SpotifyController), di atas satu requests.Session keep-alive.
+
+    - Timeout connect/read per request.
+    - Retry dengan backoff eksponensial full-jitter untuk error jaringan dan status
+      429/5xx; 429 menunggu sesuai header Retry-After. POST (next/previous) hanya
+      diulang jika request pasti belum diproses (429, timeout connect, gagal membuka
+      koneksi atau DNS), agar lagu tidak terlewat dua kali.
+    - Circuit breaker: saat API mati request langsung gagal dengan CircuitOpenError.
+
+    `token` adalah callable yang mengembalikan access token (misalnya
+    SpotifyOAuth.get_access_token yang sudah menangani refresh) atau string tetap.
+    `api_base` bisa diarahkan ke server tiruan lokal untuk pengujian.
+    """
+
+    def __init__(self, token, api_base=SPOTIFY_API_BASE, session=None, sleep=time.sleep, **config):
+        unknown = set(config) - set(TRANSPORT_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Opsi transport tidak dikenal: {', '.join(sorted(unknown))}")
+        self.config = dict(TRANSPORT_DEFAULTS, **config)
+        cfg = self.config
+        self._token = token if callable(token) else (lambda: token)
+        self.api_base = api_base if api_base.endswith('/') else api_base + '/'
+        self.timeout = (cfg['connect_timeout'], cfg['read_timeout'])
+        self._sleep = sleep
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=cfg['pool_size'], max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.breaker = CircuitBreaker(cfg['failure_threshold'], cfg['reset_timeout'])
+
+        self.requests_sent = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self.latency_avg_ms = 0.0
+
+    def close(self):
+        self.session.close()
+
+    # --- Inti request ---
+    def request(self, method, path, params=None, payload=None):
+        """Kirim request dengan retry; kembalikan JSON respon (None untuk respon kosong)."""
+        # Token diambil sebelum allow(): refresh OAuth yang gagal tidak boleh meninggalkan
+        # breaker di half_open tanpa hasil sukses/gagal
+        headers = {'Authorization': f"Bearer {self._token()}"}
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Spotify API tidak tersedia (circuit terbuka), {method} {path} tidak dikirim")
+        cfg = self.config
+        url = self.api_base + path
+        idempotent = method != 'POST'
+        attempt = 0
+        while True:
+            wait = None
+            t0 = time.perf_counter()
+            try:
+                self.requests_sent += 1
+                response = self.session.request(method, url, params=params, json=payload, timeout=self.timeout,
+                                                headers=headers)
+            except requests.exceptions.RequestException as e:
+                # POST hanya diulang jika request pasti belum sampai ke server
+                error, status, retryable = e, None, idempotent or _not_sent(e)
+            except Exception as e:
+                # Error tak terduga tetap dicatat sebagai kegagalan agar breaker tidak macet di half_open
+                error, status, retryable = e, None, False
+            else:
+                self._record_latency(time.perf_counter() - t0)
+                status = response.status_code
+                if status < 400:
+                    self.breaker.record_success()
+                    return self._json(response)
+                error = f"HTTP {status}: {response.text[:200]}"
+                retryable = status in RETRY_STATUSES and (idempotent or status == 429)
+                if status == 429:
+                    self.rate_limited += 1
+                    wait = self._retry_after(response)
+                    if wait > cfg['max_retry_after']:
+                        # Tidak ditunggu di thread worker; request lain juga ditahan selama itu
+                        self.breaker.open_for(wait)
+                        self.failures += 1
+                        raise SpotifyTransportError(f"Rate limit Spotify, coba lagi {wait:.0f} detik lagi", status)
+
+            if not retryable or attempt >= cfg['retries']:
+                self.failures += 1
+                if status is None or status >= 500 or status == 429:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()   # 4xx: API hidup, request-nya yang salah
+                raise SpotifyTransportError(f"{method} {path} gagal: {error}", status)
+            if wait is None:
+                wait = random.uniform(0.0, min(cfg['max_backoff'], cfg['backoff'] * 2 ** attempt))
+            attempt += 1
+            self.retries += 1
+            self._sleep(wait)
+
+    @staticmethod
+    def _retry_after(response):
+        try:
+            return max(0.0, float(response.headers.get('Retry-After', 1)))
+        except ValueError:
+            return 1.0
+
+    @staticmethod
+    def _json(response):
+        if response.status_code == 204 or not response.content:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    def _record_latency(self, seconds):
+        ms = seconds * 1000.0
+        if self.latency_avg_ms == 0.0:
+            self.latency_avg_ms = ms
+        else:
+            self.latency_avg_ms += 0.1 * (ms - self.latency_avg_ms)
+
+    def stats(self):
+        return {
+            'requests': self.requests_sent,
+            'retries': self.retries,
+            'rate_limited': self.rate_limited,
+            'failures': self.failures,
+            'latency_avg_ms': self.latency_avg_ms,
+            'circuit': self.breaker.state,
+            'circuit_opened': self.breaker.opened,
+        }
+
+    # --- Endpoint yang dipakai SpotifyController (nama mengikuti spotipy) ---
+    def current_user(self):
+        return self.request('GET', 'me')
+
+    def current_playback(self):
+        return self.request('GET', 'me/player')
+
+    def start_playback(self):
+        return self.request('PUT', 'me/player/play')
+
+    def pause_playback(self):
+        return self.request('PUT', 'me/player/pause')
+
+    def next_track(self):
+        return self.request('POST', 'me/player/next')
+
+    def previous_track(self):
+        return self.request('POST', 'me/player/previous')
+
+    def volume(self, volume_percent):
+        return self.request('PUT', 'me/player/volume', params={'volume_percent': int(volume_percent)})
+
+    def seek_track(self, position_ms):
+        return self.request('PUT', 'me/player/seek', params={'position_ms': int(position_ms)})
+
+    def shuffle(self, state):
+        return self.request('PUT', 'me/player/shuffle', params={'state': 'true' if state else 'false'})
+
+    def current_user_saved_tracks_add(self, tracks):
+        return self.request('PUT', 'me/tracks', params={'ids': ','.join(tracks)})
@@ -0,0 +1,118 @@
+# File: swipe_detector.py
+
+import numpy as np
+
+
+LEFT = 'left'
+RIGHT = 'right'
+UP = 'up'
+DOWN = 'down'
+
+
+class Swipe:
+    """Hasil deteksi swipe. Kecepatan dan perpindahan dalam koordinat ternormalisasi (0..1)."""
+    __slots__ = ('direction', 'velocity', 'displacement', 'fast')
+
+    def __init__(self, direction, velocity, displacement, fast):
+        self.direction = direction
+        self.velocity = velocity          # satuan lebar/tinggi gambar per detik (arah utama)
+        self.displacement = displacement  # perpindahan hasil fit selama jendela waktu
+        self.fast = fast
+
+    @property
+    def horizontal(self):
+        return self.direction in (LEFT, RIGHT)
+
+    def __repr__(self):
+        return f"Swipe({self.direction!r}, v={self.velocity:.2f}, d={self.displacement:.3f}, fast={self.fast})"
+
+
+class SwipeDetector:
+    """
+    Deteksi swipe dari posisi tangan bertimestamp di ring buffer berkapasitas tetap.
+
+    Kecepatan dihitung dengan regresi least-squares posisi terhadap waktu atas semua
+    sampel di jendela `window` detik terakhir (bukan hanya titik pertama dan terakhir),
+    sehingga satu sampel yang meleset tidak memicu swipe dan hasilnya tidak bergantung
+    pada fps: 10 fps dan 60 fps menghasilkan kecepatan yang sama untuk gerakan yang sama.
+
+    Swipe terdeteksi jika perpindahan hasil fit >= `min_distance`, kecepatan >=
+    `min_velocity`, dan arah utama lebih dominan `dominance` kali dari arah lainnya.
+    Swipe dengan kecepatan >= `fast_velocity` ditandai fast (misalnya untuk skip cepat).
+    """
+
+    def __init__(self, window=0.4, min_distance=0.12, min_velocity=0.5, fast_velocity=2.0,
+                 dominance=1.5, min_samples=3, min_span=0.1, capacity=64):
+        self.window = window
+        self.min_distance = min_distance
+        self.min_velocity = min_velocity
+        self.fast_velocity = fast_velocity
+        self.dominance = dominance
+        self.min_samples = min_samples
+        self.min_span = min_span
+        self.capacity = capacity
+        self._t = np.zeros(capacity, dtype=np.float64)
+        self._xy = np.zeros((capacity, 2), dtype=np.float64)
+        self._valid = np.zeros(capacity, dtype=bool)
+        # Buffer kerja untuk fit, dialokasikan sekali
+        self._w = np.zeros(capacity, dtype=np.float64)
+        self._dt = np.zeros(capacity, dtype=np.float64)
+        self._dxy = np.zeros((capacity, 2), dtype=np.float64)
+        self._idx = 0
+        self.velocity = np.zeros(2, dtype=np.float64)  # (vx, vy) fit terakhir
+        self.samples = 0
+
+    def reset(self):
+        self._valid.fill(False)
+        self._idx = 0
+        self.velocity.fill(0.0)
+        self.samples = 0
+
+    def add(self, timestamp, x, y):
+        """Tambahkan satu posisi (koordinat ternormalisasi) lalu kembalikan Swipe atau None."""
+        i = self._idx
+        self._t[i] = timestamp
+        self._xy[i, 0] = x
+        self._xy[i, 1] = y
+        self._valid[i] = True
+        self._idx = (i + 1) % self.capacity
+        return self.detect(timestamp)
+
+    def detect(self, now):
+        # Bobot 1 untuk sampel di dalam jendela waktu, 0 untuk yang kedaluwarsa/kosong
+        w = self._w
+        np.greater_equal(self._t, now - self.window, out=self._valid, where=self._valid)
+        np.copyto(w, self._valid)
+        n = w.sum()
+        self.samples = int(n)
+        if n < self.min_samples:
+            self.velocity.fill(0.0)
+            return None
+        t_first = np.min(self._t, where=self._valid, initial=now)
+        span = now - t_first
+        if span < self.min_span:
+            return None
+
+        # Least-squares: v = sum(w (t - t_mean)(p - p_mean)) / sum(w (t - t_mean)^2)
+        dt = self._dt
+        np.subtract(self._t, (w @ self._t) / n, out=dt)
+        dt *= w
+        denom = dt @ dt
+        if denom <= 0:
+            return None
+        np.subtract(self._xy, (w @ self._xy) / n, out=self._dxy)
+        np.dot(dt, self._dxy, out=self.velocity)
+        self.velocity /= denom
+
+        vx, vy = self.velocity
+        ax, ay = abs(vx), abs(vy)
+        if ax >= ay:
+            speed, other = ax, ay
+            direction = RIGHT if vx > 0 else LEFT
+        else:
+            speed, other = ay, ax
+            direction = DOWN if vy > 0 else UP  # Y gambar bertambah ke bawah
+        displacement = speed * span
+        if speed < self.min_velocity or displacement < self.min_distance or speed < other * self.dominance:
+            return None
+        return Swipe(direction, float(speed), float(displacement), speed >= self.fast_velocity)
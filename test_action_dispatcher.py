@@ -0,0 +1,123 @@
+# File: test_action_dispatcher.py
+#
+# Aturan penggabungan/pembatalan/pembuangan ActionDispatcher, headless dengan RecordingBackend.
+# Jalankan: python -m unittest test_action_dispatcher   (atau python -m pytest)
+
+import time
+import unittest
+
+import gesture_engine as ge
+from gesture_engine import GestureEvent
+from action_backends import RecordingBackend
+from action_dispatcher import ActionDispatcher
+
+
+def _event(kind, value=None):
+    return GestureEvent(kind, value, time.time())
+
+
+def _wait_in_flight(dispatcher, timeout=2.0):
+    """Tunggu sampai worker mengambil event pertama dari antrian (sedang dijalankan backend)."""
+    deadline = time.perf_counter() + timeout
+    while dispatcher.stats()['queue_depth'] and time.perf_counter() < deadline:
+        time.sleep(0.005)
+
+
+class ActionDispatcherTest(unittest.TestCase):
+
+    def _drain(self, dispatcher, backend):
+        dispatcher.start()
+        dispatcher.close(timeout=5.0)
+        return [(event.kind, event.value) for event in backend.events]
+
+    def test_merges_pending_events_per_action(self):
+        backend = RecordingBackend()
+        dispatcher = ActionDispatcher([backend])   # Belum di-start: semua event menunggu di antrian
+        for _ in range(5):
+            dispatcher.handle(_event(ge.VOLUME_UP, 2))
+        dispatcher.handle(_event(ge.NEXT_TRACK, 1))
+        dispatcher.handle(_event(ge.NEXT_TRACK, 2))
+        dispatcher.handle(_event(ge.VOLUME_SET, 10))
+        dispatcher.handle(_event(ge.VOLUME_SET, 40))
+        dispatcher.handle(_event(ge.LIKE))
+        dispatcher.handle(_event(ge.LIKE))
+        self.assertEqual(self._drain(dispatcher, backend),
+                         [(ge.VOLUME_UP, 10), (ge.NEXT_TRACK, 3), (ge.VOLUME_SET, 40), (ge.LIKE, None)])
+        self.assertEqual(dispatcher.stats()['deduplicated'], 7)
+
+    def test_track_direction_change_is_a_merge_barrier(self):
+        backend = RecordingBackend()
+        dispatcher = ActionDispatcher([backend])
+        dispatcher.handle(_event(ge.NEXT_TRACK, 1))
+        dispatcher.handle(_event(ge.PREV_TRACK, 1))
+        dispatcher.handle(_event(ge.NEXT_TRACK, 1))
+        dispatcher.handle(_event(ge.NEXT_TRACK, 1))     # Digabung ke NEXT terakhir, bukan yang pertama
+        dispatcher.handle(_event(ge.PREV_TRACK, 2))
+        self.assertEqual(self._drain(dispatcher, backend),
+                         [(ge.NEXT_TRACK, 1), (ge.PREV_TRACK, 1), (ge.NEXT_TRACK, 2), (ge.PREV_TRACK, 2)])
+        self.assertEqual(dispatcher.stats()['deduplicated'], 1)
+
+    def test_opposite_play_state_cancels_pending(self):
+        backend = RecordingBackend()
+        dispatcher = ActionDispatcher([backend])
+        dispatcher.handle(_event(ge.PLAY))
+        self.assertTrue(dispatcher.is_playing())
+        dispatcher.handle(_event(ge.PAUSE))
+        self.assertFalse(dispatcher.is_playing())
+        dispatcher.handle(_event(ge.SHUFFLE))
+        dispatcher.handle(_event(ge.SHUFFLE))
+        self.assertEqual(self._drain(dispatcher, backend), [])
+        self.assertEqual(dispatcher.stats()['cancelled'], 4)
+
+    def test_play_pause_play_with_slow_backend(self):
+        backend = RecordingBackend(delay=0.3)
+        dispatcher = ActionDispatcher([backend]).start()
+        dispatcher.handle(_event(ge.PLAY))
+        _wait_in_flight(dispatcher)
+        dispatcher.handle(_event(ge.PAUSE))
+        dispatcher.handle(_event(ge.PLAY))
+        self.assertTrue(dispatcher.is_playing())
+        dispatcher.close(timeout=5.0)
+        self.assertEqual([event.kind for event in backend.events], [ge.PLAY])
+        self.assertTrue(backend.is_playing())
+        self.assertTrue(dispatcher.is_playing())
+
+    def test_repeated_play_state_is_deduplicated_against_latest(self):
+        backend = RecordingBackend(delay=0.3)
+        dispatcher = ActionDispatcher([backend]).start()
+        dispatcher.handle(_event(ge.PLAY))
+        _wait_in_flight(dispatcher)
+        dispatcher.handle(_event(ge.PAUSE))
+        dispatcher.handle(_event(ge.PAUSE))
+        self.assertFalse(dispatcher.is_playing())
+        dispatcher.close(timeout=5.0)
+        self.assertEqual([event.kind for event in backend.events], [ge.PLAY, ge.PAUSE])
+        self.assertFalse(dispatcher.is_playing())
+
+    def test_full_queue_drops_new_events(self):
+        backend = RecordingBackend()
+        dispatcher = ActionDispatcher([backend], max_queue=2)
+        dispatcher.handle(_event(ge.NEXT_TRACK, 1))
+        dispatcher.handle(_event(ge.VOLUME_SET, 30))
+        dispatcher.handle(_event(ge.LIKE))
+        dispatcher.handle(_event(ge.NEXT_TRACK, 1))    # Masih bisa digabung walau antrian penuh
+        self.assertEqual(self._drain(dispatcher, backend), [(ge.NEXT_TRACK, 2), (ge.VOLUME_SET, 30)])
+        self.assertEqual(dispatcher.stats()['dropped'], 1)
+
+    def test_failing_backend_does_not_stop_others(self):
+        class FailingBackend:
+            def handle(self, event):
+                raise RuntimeError("gagal")
+
+        backend = RecordingBackend()
+        dispatcher = ActionDispatcher([FailingBackend(), backend])
+        dispatcher.handle(_event(ge.PLAY))
+        dispatcher.handle(_event(ge.NEXT_TRACK, 1))
+        self.assertEqual(self._drain(dispatcher, backend), [(ge.PLAY, None), (ge.NEXT_TRACK, 1)])
+        stats = dispatcher.stats()
+        self.assertEqual(stats['errors'], 2)
+        self.assertIn('complete', stats['timing'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# File: test_frame_sources.py
+#
+# Replay rekaman .lmtrace lewat LandmarkTraceSource: frame dibaca dari memmap saat diputar
+# dan semua tangan dalam satu frame ikut diputar ulang (rekaman multi-tangan).
+# Jalankan: python -m unittest test_frame_sources   (atau python -m pytest)
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from HandTrackingModule import TraceResults
+from frame_sources import LandmarkTraceSource
+from landmark_trace import TraceWriter
+
+
+def _norm(x):
+    norm = np.zeros((21, 3), dtype=np.float32)
+    norm[:, 0] = x
+    return norm
+
+
+class LandmarkTraceSourceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'hands.lmtrace')
+        writer = TraceWriter(self.path)
+        writer.write(0.0, 0)                                  # Tanpa tangan
+        writer.write(0.1, 1, _norm(0.2), 0, 0.9, hand=0)      # Dua tangan
+        writer.write(0.1, 1, _norm(0.7), 1, 0.8, hand=1)
+        writer.write(0.2, 2, _norm(0.4), 1, 0.7, hand=0)      # Satu tangan
+        writer.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _replay(self):
+        source = LandmarkTraceSource(self.path, realtime=False)
+        records = []
+        while True:
+            success, _ = source.read()
+            if not success:
+                break
+            records.append(source.record)
+        return source, records
+
+    def test_replays_every_hand_per_frame(self):
+        source, records = self._replay()
+        self.assertEqual(len(source), 3)
+        self.assertEqual([record.timestamp for record in records], [0.0, 0.1, 0.2])
+        self.assertEqual([len(record.hands) for record in records], [0, 2, 1])
+
+        self.assertIsNone(TraceResults(records[0]).multi_hand_landmarks)
+        results = TraceResults(records[1])
+        self.assertEqual([hand.norm[0, 0] for hand in results.multi_hand_landmarks], [np.float32(0.2), np.float32(0.7)])
+        self.assertEqual([hand.classification[0].label for hand in results.multi_handedness], ['Left', 'Right'])
+        source.release()
+
+    def test_landmarks_are_read_from_the_memory_map(self):
+        source, records = self._replay()
+        self.assertTrue(np.shares_memory(records[2].norm, source.reader.records))
+        source.release()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# File: test_gesture_classifier.py
+#
+# Penolakan open-set GestureClassifier: dengan model dua kelas, pose bawaan (telapak, peace,
+# jempol) tetap ditentukan tabel pose GestureEngine, kelas terlatih tetap dikenali.
+# Jalankan: python -m unittest test_gesture_classifier   (atau python -m pytest)
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from HandTrackingModule import HandLandmarks, TraceHand, _TraceHandedness
+from gesture_classifier import (GestureClassifier, KNNModel, MLPModel, FEATURE_SCALE, NUM_FEATURES,
+                                landmark_features, save_model)
+from gesture_engine import GestureEngine, POSE_DEFINITIONS, fingers_to_mask
+
+
+def _hand_norm(states, rng=None, noise=0.004):
+    """Landmark ternormalisasi sederhana untuk status jari [jempol, telunjuk, ..., kelingking]."""
+    norm = np.zeros((21, 3), dtype=np.float32)
+    norm[0] = (0.5, 0.8, 0.0)
+    if states[0]:
+        norm[1:5] = [(0.44, 0.76, 0), (0.40, 0.72, 0), (0.36, 0.68, 0), (0.32, 0.64, 0)]
+    else:
+        norm[1:5] = [(0.44, 0.76, 0), (0.42, 0.72, 0), (0.45, 0.70, 0), (0.48, 0.70, 0)]
+    for finger, x in enumerate((0.44, 0.49, 0.54, 0.59), start=1):
+        base = 1 + 4 * finger
+        norm[base] = (x, 0.65, 0.0)
+        for joint in range(1, 4):
+            dy = -0.05 * joint if states[finger] else 0.015 * joint
+            norm[base + joint] = (x, 0.65 + dy, 0.0)
+    if rng is not None:
+        norm[:, :2] += rng.normal(0.0, noise, (21, 2)).astype(np.float32)
+    return norm
+
+
+def _landmarks(states):
+    hand = HandLandmarks()
+    hand.update(TraceHand(_hand_norm(states)), 640, 480, _TraceHandedness('Right', 0.9))
+    return hand
+
+
+ROCK = (0, 1, 0, 0, 1)
+CALL_ME = (1, 0, 0, 0, 1)
+
+
+class OpenSetRejectionTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        norms, labels = [], []
+        for label, states in enumerate((ROCK, CALL_ME)):
+            for _ in range(150):
+                norms.append(_hand_norm(states, rng))
+                labels.append(label)
+        px = np.stack(norms) * FEATURE_SCALE
+        features = landmark_features(px, np.zeros(len(px), dtype=bool), np.zeros((len(px), NUM_FEATURES), dtype=np.float32))
+        cls.labels = np.array(labels, dtype=np.int32)
+        cls.features = features
+        cls.tmp = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
+    def _engine(self, model):
+        path = os.path.join(self.tmp, f'{model.kind}.npz')
+        save_model(path, model)
+        return GestureEngine(classifier=GestureClassifier(path))
+
+    def _pose(self, engine, states):
+        engine.update(fingers_to_mask(states), _landmarks(states), now=0.0)
+        return engine.pose
+
+    def _check(self, model):
+        engine = self._engine(model)
+        self.assertEqual(self._pose(engine, ROCK), 'rock')
+        self.assertEqual(self._pose(engine, CALL_ME), 'call_me')
+        self.assertEqual(self._pose(engine, POSE_DEFINITIONS['open_palm']), 'open_palm')
+        self.assertEqual(self._pose(engine, POSE_DEFINITIONS['peace']), 'peace')
+        self.assertIn(self._pose(engine, POSE_DEFINITIONS['thumb']), ('thumb_up', 'thumb_down'))
+
+    def test_knn_rejects_builtin_poses(self):
+        self._check(KNNModel.train(self.features, self.labels, ['rock', 'call_me'], k=5))
+
+    def test_mlp_rejects_builtin_poses(self):
+        self._check(MLPModel.train(self.features, self.labels, ['rock', 'call_me']))
+
+    def test_default_threshold_above_majority_floor(self):
+        # k=5 dengan dua kelas: suara mayoritas paling sedikit 3/5
+        self.assertGreater(GestureClassifier('unused.npz').min_confidence, 3 / 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
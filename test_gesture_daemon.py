@@ -0,0 +1,74 @@
+# File: test_gesture_daemon.py
+#
+# Replay rekaman landmark lewat GestureDaemon dengan konfigurasi default (governor aktif) harus
+# deterministik: setiap frame diinferensi dan event sama seperti sesi aslinya.
+# Jalankan: python -m unittest test_gesture_daemon   (atau python -m pytest)
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from landmark_trace import TraceWriter
+from gesture_daemon import GestureDaemon, load_config
+
+
+def _hand(pose):
+    """Landmark ternormalisasi sederhana: telapak terbuka atau jempol ke bawah."""
+    norm = np.zeros((21, 3), dtype=np.float32)
+    norm[0] = (0.5, 0.8, 0.0)
+    up = pose == 'palm'
+    for finger, x in enumerate((0.40, 0.45, 0.50, 0.55, 0.60)):
+        base = 1 + 4 * finger
+        for joint in range(4):
+            norm[base + joint] = (x, 0.65 - 0.05 * joint if up else 0.65 + 0.01 * joint, 0.0)
+    if up:
+        norm[2], norm[3], norm[4] = (0.38, 0.70, 0.0), (0.35, 0.62, 0.0), (0.30, 0.60, 0.0)
+    else:
+        norm[2], norm[3], norm[4] = (0.38, 0.60, 0.0), (0.36, 0.65, 0.0), (0.33, 0.72, 0.0)
+    return norm
+
+
+class DaemonReplayTest(unittest.TestCase):
+
+    SEGMENTS = 8        # Bergantian telapak (PLAY) dan jempol ke bawah (PAUSE), 1 detik per segmen
+    FPS = 30
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'replay.lmtrace')
+        writer = TraceWriter(self.path)
+        frame = 0
+        for _ in range(2 * self.FPS):   # Diawali 2 detik tanpa tangan
+            writer.write(frame / self.FPS, frame)
+            frame += 1
+        for segment in range(self.SEGMENTS):
+            for _ in range(self.FPS):
+                writer.write(frame / self.FPS, frame, _hand('palm' if segment % 2 == 0 else 'down'), 1, 0.9)
+                frame += 1
+        writer.close()
+        self.frames = frame
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_fast_replay_with_default_config_is_lossless(self):
+        config = load_config(None, {'camera': self.path, 'mode': 'log', 'fast': True, 'stats_interval': 0.0})
+        self.assertTrue(config['governor'])
+        daemon = GestureDaemon(config, config_path=os.path.join(self.tmp, 'config.ini')).setup()
+        # Pada replay panjang governor pindah ke idle/throttled menurut jam dinding dan beban
+        # CPU. Di rekaman pendek ini: idle langsung tanpa tangan dan gerakan diabaikan
+        daemon.governor.config.update(idle_after=0.0, motion_threshold=2.0)
+        daemon.run()
+
+        self.assertEqual(daemon.frames, self.frames)
+        metrics = daemon.governor.metrics()
+        self.assertEqual(metrics['skipped'], 0)
+        self.assertEqual(daemon.pipeline.results_dropped, 0)
+        self.assertEqual(daemon.engine.events_emitted, self.SEGMENTS)
+
+
+if __name__ == "__main__":
+    unittest.main()